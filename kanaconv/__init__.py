@@ -6,5 +6,29 @@
 Kana conversion module.
 '''
 from .converter import KanaConv
+from .stats import KanaStats, stats, stats_many
+from .scripts import segments, classify, classify_many
+from .transform import (
+    to_katakana, to_katakana_many, to_hiragana, to_hiragana_many, normalize,
+    normalize_many
+)
+from .reverse import to_kana, kana_candidates
+from .keys import (
+    canonical_romaji, canonical_romaji_many, phonetic_key, phonetic_key_many,
+    sort_key, sort_key_many, same_romaji
+)
+from .mora import mora_distance, encode_mora, decode_mora, render_romaji
+from .validate import (
+    validate, validate_many, is_convertible, is_convertible_many
+)
 
-__all__ = ['KanaConv']
+__all__ = [
+    'KanaConv', 'KanaStats', 'stats', 'stats_many', 'segments',
+    'classify', 'classify_many',
+    'to_katakana', 'to_katakana_many', 'to_hiragana', 'to_hiragana_many',
+    'normalize', 'normalize_many', 'to_kana', 'kana_candidates',
+    'canonical_romaji', 'canonical_romaji_many', 'phonetic_key',
+    'phonetic_key_many', 'sort_key', 'sort_key_many', 'same_romaji',
+    'mora_distance', 'encode_mora', 'decode_mora', 'render_romaji',
+    'validate', 'validate_many', 'is_convertible', 'is_convertible_many'
+]
@@ -0,0 +1,84 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Token filter for search analyzers.
+
+Analyzers pass text around as lists of tokens: (text, start, end, position)
+tuples, where start and end are the offsets of the token in the original
+text. RomajiFilter replaces the kana tokens in such a list with their
+rōmaji, keeping the offsets and positions, so that highlighting still
+points at the original kana. Tokens that don't contain any kana are
+passed through as they are.
+
+The tokens of a batch are converted together, and every distinct token
+text is only converted once.
+'''
+import re
+from .converter import KanaConv
+from .scripts import kana_chars
+
+# Finds the first kana character in a string.
+kana_search = re.compile(u'[{}]'.format(kana_chars)).search
+
+
+class RomajiFilter(object):
+    '''
+    Token filter that transliterates kana tokens to rōmaji. After
+    initialization, call filter() (or the filter itself) with a list
+    of tokens.
+    '''
+    def __init__(self, keep_kana=False, conv=None):
+        '''
+        Initializes the filter. If keep_kana is set, every kana token is
+        kept, followed by its rōmaji token at the same position, for
+        searching in both scripts. A converter can be passed to use its
+        settings for the conversion.
+        '''
+        self.keep_kana = keep_kana
+        self.conv = conv if conv is not None else KanaConv()
+
+    def _convert_texts(self, tokens):
+        '''
+        Returns a dict with the rōmaji of every distinct kana token text.
+        '''
+        texts = []
+        seen = set()
+        for token in tokens:
+            text = token[0]
+            if text not in seen:
+                seen.add(text)
+                if kana_search(text) is not None:
+                    texts.append(text)
+
+        return dict(zip(texts, self.conv.to_romaji_many(texts)))
+
+    def filter(self, tokens):
+        '''
+        Returns a new list of tokens, in which the kana tokens are replaced
+        by their rōmaji. Any items after the text are copied from the
+        original token.
+        '''
+        tokens = list(tokens)
+        romaji = self._convert_texts(tokens)
+        keep_kana = self.keep_kana
+
+        output = []
+        for token in tokens:
+            text = token[0]
+            ro = romaji.get(text)
+            if ro is None or ro == text:
+                output.append(token)
+                continue
+            if keep_kana:
+                output.append(token)
+            output.append((ro,) + tuple(token[1:]))
+
+        return output
+
+    def __call__(self, tokens):
+        '''
+        Same as filter().
+        '''
+        return self.filter(tokens)
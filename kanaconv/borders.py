@@ -0,0 +1,235 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Word border dictionary for compound words.
+
+The converter can't know that こうま is こ|うま (子馬, 'kouma') rather than
+a single word with a long vowel ('kōma'). A BorderDictionary holds a list
+of such readings with their word borders, and finds the borders in an
+input so they can be passed to the converter as boundary offsets.
+
+The readings are compiled into an Aho–Corasick automaton: an ArrayTrie
+(see trie.py) with a failure link and a dictionary suffix link for every
+node. Finding the borders is a single scan over the input, whose cost
+doesn't depend on the size of the dictionary. Overlapping matches are
+resolved leftmost-longest, like a regex alternation sorted by length,
+during the same scan: the depth of the current node tells how far back
+a match that's still to come can start.
+
+Hiragana and katakana are equivalent. The automaton is stored in flat
+arrays, and can be saved to a file and loaded again without rebuilding.
+'''
+import sys
+from array import array
+from .converter import WORD_BORDER
+from .transform import to_hiragana
+from .trie import ArrayTrie, NO_VALUE, write_sections, read_sections
+from .utils import UINT32, array_from_bytes
+
+# Set the correct code point function based on whether we're on Python 2 or 3.
+if sys.version_info < (3, 0):
+    chr = unichr
+
+# Translation table from katakana to hiragana, for the katakana that
+# have a single character hiragana equivalent. This keeps the offsets
+# in the input intact.
+fold_table = {}
+for code in range(0x30A1, 0x30F7):
+    hiragana_char = to_hiragana(chr(code))
+    if len(hiragana_char) == 1:
+        fold_table[code] = hiragana_char
+
+
+class BorderDictionary(object):
+    '''
+    Dictionary of readings with word borders, e.g. こ|うま. After
+    initialization, use boundaries() to find the word borders in a string,
+    or pass the dictionary to KanaConv.set_border_dictionary().
+    '''
+    def __init__(self, entries=()):
+        '''
+        Builds the automaton from an iterable of readings, in which the
+        word borders are marked with a '|'. Readings without a border
+        can be used to stop a shorter reading from matching inside them.
+        '''
+        patterns = {}
+        for entry in entries:
+            parts = entry.translate(fold_table).split(WORD_BORDER)
+            offsets = []
+            for part in parts[:-1]:
+                offsets.append((offsets[-1] if offsets else 0) + len(part))
+            pattern = u''.join(parts)
+            if pattern:
+                patterns[pattern] = offsets
+
+        # The length and the word border offsets of every pattern.
+        self.lengths = array(UINT32)
+        self.border_index = array(UINT32, [0])
+        self.borders = array(UINT32)
+        items = []
+        for pattern_id, pattern in enumerate(sorted(patterns)):
+            items.append((pattern, pattern_id))
+            self.lengths.append(len(pattern))
+            self.borders.extend(patterns[pattern])
+            self.border_index.append(len(self.borders))
+
+        self.trie = ArrayTrie(items)
+        self.fail = array(UINT32)
+        self.output = array(UINT32)
+        self.depths = array(UINT32)
+        self._build_links()
+        self._first_char_search = self.trie.first_char_search()
+
+    def _build_links(self):
+        '''
+        Sets the failure link of every node (the node of its longest proper
+        suffix that's in the trie), its dictionary suffix link (the nearest
+        node on the failure path that ends a pattern) and its depth.
+        '''
+        trie = self.trie
+        size = len(trie)
+        fail = self.fail = array(UINT32, [0] * size)
+        output = self.output = array(UINT32, [NO_VALUE] * size)
+        depths = self.depths = array(UINT32, [0] * size)
+
+        # Nodes are in breadth-first order, so the failure links of all
+        # shallower nodes are known by the time a node is reached.
+        for node in range(size):
+            for child in range(trie.children[node], trie.children[node + 1]):
+                depths[child] = depths[node] + 1
+                if node != 0:
+                    char = chr(trie.labels[child])
+                    state = fail[node]
+                    while True:
+                        target = trie.child(state, char)
+                        if target != -1:
+                            fail[child] = target
+                            break
+                        if state == 0:
+                            break
+                        state = fail[state]
+
+                target = fail[child]
+                if trie.values[target] != NO_VALUE:
+                    output[child] = target
+                else:
+                    output[child] = output[target]
+
+    def boundaries(self, input):
+        '''
+        Returns a sorted list of the offsets in the input where a new word
+        starts, according to the dictionary. If readings overlap, the one
+        that starts first wins, and then the longest one.
+        '''
+        if self._first_char_search is None:
+            return []
+
+        trie = self.trie
+        values = trie.values
+        fail = self.fail
+        output = self.output
+        depths = self.depths
+        lengths = self.lengths
+        search = self._first_char_search
+
+        offsets = []
+        # The end of the last reading that was used, and the matches after
+        # it that may still be overtaken by one that starts further back.
+        end = 0
+        pending = []
+        node = 0
+        input = input.translate(fold_table)
+        position = 0
+        while position < len(input):
+            # Outside of a reading, skip ahead to where one could start.
+            if node == 0:
+                first = search(input, position)
+                if first is None:
+                    break
+                position = first.start()
+
+            char = input[position]
+            while True:
+                target = trie.child(node, char)
+                if target != -1:
+                    node = target
+                    break
+                if node == 0:
+                    break
+                node = fail[node]
+
+            # Every match that's still to come starts at or after the
+            # start of the longest suffix that's in the trie.
+            if pending:
+                end = self._resolve(
+                    pending, position + 1 - depths[node], end, offsets
+                )
+
+            match = node if values[node] != NO_VALUE else output[node]
+            while match != NO_VALUE:
+                pattern_id = values[match]
+                start = position + 1 - lengths[pattern_id]
+                if start >= end:
+                    pending.append((start, -lengths[pattern_id], pattern_id))
+                match = output[match]
+
+            position += 1
+
+        if pending:
+            self._resolve(pending, len(input), end, offsets)
+
+        return offsets
+
+    def _resolve(self, pending, limit, end, offsets):
+        '''
+        Uses the pending matches that start before the limit, leftmost-
+        longest, and adds their word borders to the offsets. Matches that
+        overlap a used one are dropped. Returns the new end of the last
+        used match.
+        '''
+        while pending:
+            start, length, pattern_id = min(pending)
+            if start >= limit:
+                break
+            end = start - length
+            offsets.extend(
+                start + offset for offset in self.borders[
+                    self.border_index[pattern_id]:
+                    self.border_index[pattern_id + 1]
+                ]
+            )
+            pending[:] = [match for match in pending if match[0] >= end]
+
+        return end
+
+    def save(self, path):
+        '''
+        Saves the dictionary to a file, which can be loaded with load().
+        '''
+        with open(path, 'wb') as file:
+            write_sections(file, b'KCBD', self.trie.sections() + [
+                self.fail, self.output, self.lengths, self.border_index,
+                self.borders, self.depths
+            ])
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Loads a dictionary from a file made by save(), without rebuilding it.
+        '''
+        with open(path, 'rb') as file:
+            sections = read_sections(file.read(), b'KCBD')
+
+        dictionary = cls()
+        dictionary.trie = ArrayTrie.from_sections(sections[:3])
+        dictionary.fail, dictionary.output, dictionary.lengths, \
+            dictionary.border_index, dictionary.borders, \
+            dictionary.depths = [
+                array_from_bytes(section) for section in sections[3:9]
+            ]
+        dictionary._first_char_search = \
+            dictionary.trie.first_char_search()
+
+        return dictionary
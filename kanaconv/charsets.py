@@ -13,8 +13,11 @@ characters mean and how they're meant to be used.
 
 Unicode ranges in this file are inclusive ranges.
 '''
-from .constants import KATAKANA, HIRAGANA, ROMAJI
-from .utils import switch_charset
+from .constants import (
+    KATAKANA, HIRAGANA, ROMAJI, HEPBURN, KUNREI, NIHON, PASSPORT,
+    CIRCUMFLEX_STYLE, MACRON_STYLE, OH_STYLE
+)
+from .utils import switch_charset, merge_dicts
 
 # For ease of processing, we've divided the kana characters into five sets.
 #
@@ -66,10 +69,13 @@ katakana = {
     ],
     # Geminate consonant marker（sukuon, 促音・そくおん）
     'geminate': u'ッ',
+    # Ligatures
+    'ligatures': {
+        # Special ligature for koto (コト), generally used in vertical writing
+        u'ヿ': u'コト'
+    },
     # String replacements
     'replacements': {
-        # Special ligature for koto (コト), generally used in vertical writing
-        u'ヿ': u'コト',
         # Double hyphen – used to separate multiple foreign names,
         # e.g. Russell–Einstein Manifesto (ラッセル゠アインシュタイン宣言)
         u'゠': u'-'
@@ -90,6 +96,22 @@ katakana = {
     # List of characters that can have a handakuten
     'handakutenize': {
         u'ハ': u'パ', u'ヒ': u'ピ', u'フ': u'プ', u'ヘ': u'ペ', u'ホ': u'ポ'
+    },
+    # Characters with a dakuten that have no hiragana equivalent;
+    # these are not combined with a separate dakuten by normalize()
+    'dakutenize_rare': {
+        u'ワ': u'ヷ', u'ヰ': u'ヸ', u'ヲ': u'ヺ'
+    },
+    # Characters with no hiragana equivalent, and the hiragana
+    # that are used in their place when switching scripts
+    'hiragana_substitutes': {
+        u'ヷ': u'ゔぁ', u'ヸ': u'ゔぃ', u'ヹ': u'ゔぇ', u'ヺ': u'ゔぉ'
+    },
+    # Small characters and their regular size versions
+    'small': {
+        u'ァ': u'ア', u'ィ': u'イ', u'ゥ': u'ウ', u'ェ': u'エ', u'ォ': u'オ',
+        u'ャ': u'ヤ', u'ュ': u'ユ', u'ョ': u'ヨ', u'ッ': u'ツ', u'ヮ': u'ワ',
+        u'ヵ': u'カ', u'ヶ': u'ケ'
     }
 }
 
@@ -112,11 +134,13 @@ hiragana = {
     'handakuten': u'\u309a',      # combining: ぱは (U+306F U+309A U+306F)
     'spacing_dakuten': u'゛',     # non-combining: か゛か (U+304B U+309B U+304B)
     'spacing_handakuten': u'゜',  # non-combining: は゜は (U+306B U+309C U+306F)
-    # String replacements
-    'replacements': {
+    # Ligatures
+    'ligatures': {
         # Special ligature for yori (より)
-        u'ゟ': u'より',
+        u'ゟ': u'より'
     },
+    # String replacements
+    'replacements': {},
     # Repeater characters（kurikaeshi, くりかえし）
     # Used only in historical texts; these repeat the preceding character,
     # with the latter adding a dakuten
@@ -124,7 +148,9 @@ hiragana = {
     'repeater_dakuten': u'ゞ',    # あひゞき = あひびき
     # Lists of characters that can have dakuten
     'dakutenize': switch_charset(katakana['dakutenize'], HIRAGANA),
-    'handakutenize': switch_charset(katakana['handakutenize'], HIRAGANA)
+    'handakutenize': switch_charset(katakana['handakutenize'], HIRAGANA),
+    # Small characters and their regular size versions
+    'small': switch_charset(katakana['small'], HIRAGANA)
 }
 
 # Rōmaji（ローマ字・ローマじ）
@@ -221,6 +247,53 @@ romaji = {
     ]
 }
 
+# Romanization systems
+# The rōmaji sets above are for Modified Hepburn. The other systems are
+# defined by the entries that differ from it, indexed by their katakana
+# (the hiragana are changed along with them). Every system can also set
+# the apostrophe character, the consonant that replaces an 'n' before
+# a b, m or p, and the default long vowel style.
+#
+# Kunrei-shiki and Nihon-shiki write e.g. シ as 'si' and シャ as 'sya'.
+# Their only difference is that Nihon-shiki keeps ヂ, ヅ and the
+# characters of the w-row apart. Passport Hepburn writes long vowels
+# without a macron ('oh' for a long o), and e.g. しんばし as 'shimbashi'.
+kunrei_cvs = {
+    u'シ': ('si', 's', 'sy', 'i', u'ī'), u'チ': ('ti', 't', 'ty', 'i', u'ī'),
+    u'ツ': ('tu', 't', 'ts', 'u', u'ū'), u'フ': ('hu', 'h', 'f', 'u', u'ū'),
+    u'ジ': ('zi', 'z', 'zy', 'i', u'ī'), u'ヂ': ('zi', 'z', 'zy', 'i', u'ī'),
+    u'ヲ': ('o', '', '', 'o', u'ō')
+}
+kunrei_digraphs_a = {
+    u'シ': ('sy',), u'チ': ('ty',), u'ジ': ('zy',), u'ヂ': ('zy',)
+}
+romaji_systems = {
+    HEPBURN: {
+        'vowel_style': MACRON_STYLE
+    },
+    KUNREI: {
+        'set_cvs': kunrei_cvs,
+        'set_digraphs_a': kunrei_digraphs_a,
+        'vowel_style': CIRCUMFLEX_STYLE
+    },
+    NIHON: {
+        'set_cvs': merge_dicts(kunrei_cvs, {
+            u'ヂ': ('di', 'd', 'd', 'i', u'ī'),
+            u'ヅ': ('du', 'd', 'd', 'u', u'ū'),
+            u'ヲ': ('wo', 'w', 'w', 'o', u'ō'),
+            u'ヰ': ('wi', 'w', 'w', 'i', u'ī'),
+            u'ヱ': ('we', 'w', 'w', 'e', u'ē')
+        }),
+        'set_digraphs_a': merge_dicts(kunrei_digraphs_a, {u'ヂ': ('dy',)}),
+        'vowel_style': CIRCUMFLEX_STYLE
+    },
+    PASSPORT: {
+        'apostrophe_char': '',
+        'labial_n': 'm',
+        'vowel_style': OH_STYLE
+    }
+}
+
 # Fullwidth characters (zenkaku, 全角・ぜんかく)
 # These characters are used in conjunction with kanji or kana to maintain
 # visual consistency.
@@ -335,6 +408,35 @@ preprocess_chars = u'[！？。．；：＂＇]'
 # Long vowel marker (chōuon, 長音・ちょうおん)
 lvmarker = u'ー'
 
-# Two long vowel styles: macrons (the default) and circumflexes.
+# Long vowel styles: macrons (the default) and circumflexes, plus two
+# ASCII-only styles: doubled vowels and wāpuro style, which writes
+# ō as 'ou' like it's typed on a Japanese keyboard (e.g. toukyou).
+# A long o that's written with an お is 'oo' in wāpuro style (e.g. ookii);
+# the converter takes care of that. Note that e.g. せんせい is always
+# 'sensei', since 'ei' is not converted to a long vowel.
 macron_vowels = u'āīūēō'
 circumflex_vowels = u'âîûêô'
+doubled_vowels = (u'aa', u'ii', u'uu', u'ee', u'oo')
+wapuro_vowels = (u'aa', u'ii', u'uu', u'ee', u'ou')
+
+# Passport style only marks a long o, with an 'h' (e.g. ohno).
+oh_vowels = (u'a', u'i', u'u', u'e', u'oh')
+
+# Long vowels written as short vowels, for plain ASCII and slugs.
+plain_vowels = (u'a', u'i', u'u', u'e', u'o')
+
+# Kanji (漢字・かんじ)
+# These are not transliterated, but they're needed to tell mixed script
+# text apart. Only the ranges in the Basic Multilingual Plane are listed,
+# since Python 2 narrow builds can't represent the others.
+kanji_ranges = [
+    # CJK Unified Ideographs Extension A
+    (0x3400, 0x4DBF),
+    # CJK Unified Ideographs
+    (0x4E00, 0x9FFF),
+    # CJK Compatibility Ideographs
+    (0xF900, 0xFAFF)
+]
+# The kanji repeater and other ideographic marks that behave like kanji
+# (々, 〆, 〇; U+3005 - U+3007).
+kanji_marks = u'々〆〇'
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Command-line tool to build an override dictionary file.
+'''
+import argparse
+from ..overrides import build_overrides
+from ..utils import read_tsv
+
+
+def main():
+    argparser = argparse.ArgumentParser(add_help=False)
+    argparser.description = '''\
+Builds an override dictionary file for KanaConv.set_overrides() from \
+a tab-separated file with a kana string and its rōmaji on every line.
+'''
+    argparser.add_argument(
+        '-h', '--help',
+        action='help',
+        help='Show this help message and exit.'
+    )
+    argparser.add_argument(
+        'source',
+        help='Tab-separated file to read.'
+    )
+    argparser.add_argument(
+        'target',
+        help='Override dictionary file to write.'
+    )
+    args = argparser.parse_args()
+
+    count = build_overrides(read_tsv(args.source), args.target)
+    print('{} entries written to {}'.format(count, args.target))
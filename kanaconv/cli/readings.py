@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Command-line tool to build a kanji reading dictionary file.
+'''
+import argparse
+from ..readings import ReadingDictionary
+
+
+def main():
+    argparser = argparse.ArgumentParser(add_help=False)
+    argparser.description = '''\
+Builds a reading dictionary file for KanaConv.set_reading_dictionary() \
+from a tab-separated file with a surface and its reading in kana on \
+every line.
+'''
+    argparser.add_argument(
+        '-h', '--help',
+        action='help',
+        help='Show this help message and exit.'
+    )
+    argparser.add_argument(
+        'source',
+        help='Tab-separated file to read.'
+    )
+    argparser.add_argument(
+        'target',
+        help='Reading dictionary file to write.'
+    )
+    args = argparser.parse_args()
+
+    dictionary = ReadingDictionary.from_tsv(args.source)
+    dictionary.save(args.target)
+    print('{} entries written to {}'.format(len(dictionary), args.target))
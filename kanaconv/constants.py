@@ -7,8 +7,13 @@ List of constants used in the library.
 '''
 __all__ = [
     'HIRAGANA', 'KATAKANA', 'ROMAJI', 'EMPTY_BUFFER', 'END_CHAR',
-    'CV', 'VOWEL', 'XVOWEL', 'UNKNOWN_DISCARD', 'UNKNOWN_RAISE',
-    'UNKNOWN_INCLUDE'
+    'BORDER_CHAR', 'CV', 'VOWEL', 'XVOWEL', 'UNKNOWN_DISCARD', 'UNKNOWN_RAISE',
+    'UNKNOWN_INCLUDE', 'MACRON_STYLE', 'CIRCUMFLEX_STYLE', 'DOUBLED_STYLE',
+    'WAPURO_STYLE', 'OH_STYLE', 'PLAIN_STYLE', 'SLUG_STYLE', 'HEPBURN',
+    'KUNREI', 'NIHON', 'PASSPORT', 'KANA', 'KANJI',
+    'PUNCTUATION', 'OTHER', 'SCRIPT_HIRAGANA', 'SCRIPT_KATAKANA',
+    'SCRIPT_KANA', 'SCRIPT_KANJI', 'SCRIPT_ROMAJI', 'FOLD_V', 'FOLD_DZ',
+    'FOLD_WI', 'FOLD_LONG_VOWELS', 'FOLD_GEMINATES', 'FOLD_ALL'
 ]
 
 HIRAGANA = 10
@@ -17,6 +22,7 @@ ROMAJI = 12
 
 # The machine's constants.
 END_CHAR = 14
+BORDER_CHAR = 29
 CV = 15
 VOWEL = 16
 XVOWEL = 17
@@ -29,3 +35,38 @@ UNKNOWN_INCLUDE = 20
 # Long vowel styles
 MACRON_STYLE = 21
 CIRCUMFLEX_STYLE = 22
+
+# Script classes for segmenting mixed script text.
+KANA = 23
+KANJI = 24
+PUNCTUATION = 25
+OTHER = 26
+
+# Bit flags for the scripts present in a string. These can be combined,
+# e.g. SCRIPT_KATAKANA | SCRIPT_KANJI.
+SCRIPT_HIRAGANA = 1
+SCRIPT_KATAKANA = 2
+SCRIPT_KANA = SCRIPT_HIRAGANA | SCRIPT_KATAKANA
+SCRIPT_KANJI = 4
+SCRIPT_ROMAJI = 8
+
+# Bit flags for the folding rules of phonetic keys.
+FOLD_V = 1             # ヴ = ブ, e.g. ヴァイオリン = バイオリン
+FOLD_DZ = 2            # ヂ = ジ and ヅ = ズ
+FOLD_WI = 4            # ゐ = い, ゑ = え and を = お
+FOLD_LONG_VOWELS = 8   # long vowels are shortened, e.g. ゆうこ = ユーコ = ゆこ
+FOLD_GEMINATES = 16    # geminate markers are ignored, e.g. きって = きて
+FOLD_ALL = FOLD_V | FOLD_DZ | FOLD_WI | FOLD_LONG_VOWELS | FOLD_GEMINATES
+
+# ASCII-only long vowel styles
+DOUBLED_STYLE = 27
+WAPURO_STYLE = 28
+OH_STYLE = 34
+PLAIN_STYLE = 35
+SLUG_STYLE = 36
+
+# Romanization systems
+HEPBURN = 30
+KUNREI = 31
+NIHON = 32
+PASSPORT = 33
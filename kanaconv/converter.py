@@ -30,19 +30,25 @@ with no plans to support them in the future:
 The theoretical combinations yi, ye and wu don't exist, nor does the
 repeater mark with handakuten.
 '''
+import io
+import json
 import sys
 import re
 from .utils import kana_romaji_lt, merge_dicts, fw_romaji_lt
+from .transform import normalize
 from .exceptions import (
     InvalidCharacterTypeError, UnexpectedCharacterError
 )
 from .charsets import (
     romaji, katakana, hiragana, lvmarker, fw_romaji, punctuation,
-    punct_spacing, preprocess_chars, macron_vowels, circumflex_vowels
+    punct_spacing, preprocess_chars, macron_vowels, circumflex_vowels,
+    doubled_vowels, wapuro_vowels, oh_vowels, plain_vowels, romaji_systems
 )
 from .constants import (
-    CV, XVOWEL, VOWEL, END_CHAR, UNKNOWN_DISCARD, UNKNOWN_RAISE,
-    UNKNOWN_INCLUDE, MACRON_STYLE, CIRCUMFLEX_STYLE
+    CV, XVOWEL, VOWEL, END_CHAR, BORDER_CHAR, UNKNOWN_DISCARD, UNKNOWN_RAISE,
+    UNKNOWN_INCLUDE, MACRON_STYLE, CIRCUMFLEX_STYLE, DOUBLED_STYLE,
+    WAPURO_STYLE, OH_STYLE, PLAIN_STYLE, SLUG_STYLE, HEPBURN, KUNREI, NIHON,
+    PASSPORT
 )
 
 # Lookup table for consonant-vowel (cv) kana and their rōmaji data.
@@ -83,6 +89,9 @@ repl = merge_dicts(
     fw_romaji_lt(list(fw_romaji['full']), list(fw_romaji['regular']))
 )
 
+# Translation table for the replacements, used in a single translate() pass.
+repl_table = {ord(char): value for char, value in repl.items()}
+
 # We use sets to be able to do quick lookups.
 cvs = set(cv_lt)
 vowels = set(vowel_lt)
@@ -91,20 +100,6 @@ di_a = set(di_a_lt)
 di_b = set(di_b_lt)
 geminates = {katakana['geminate'], hiragana['geminate']}
 
-# Repeater characters (with and without dakuten).
-rpts = {katakana['repeater'], hiragana['repeater']}
-drpts = {katakana['repeater_dakuten'], hiragana['repeater_dakuten']}
-
-# The lookup tables of characters that can have a (han)dakuten, and their sets.
-dkt_lt = merge_dicts(katakana['dakutenize'], hiragana['dakutenize'])
-dkt_cvs = set(dkt_lt)
-hdkt_lt = merge_dicts(katakana['handakutenize'], hiragana['handakutenize'])
-hdkt_cvs = set(hdkt_lt)
-
-# The singular dakuten characters.
-dkt = {hiragana['dakuten'], hiragana['spacing_dakuten']}
-hdkt = {hiragana['handakuten'], hiragana['spacing_handakuten']}
-
 # Character combinations that can become long vowels,
 # notwithstanding the usage of the long vowel marker.
 lv_combinations = {('a', 'a'), ('u', 'u'), ('e', 'e'), ('o', 'o'), ('o', 'u')}
@@ -115,12 +110,51 @@ n_apostrophe = {'a', 'i', 'u', 'e', 'o', 'y'}
 # Whether we're on Python 2--used for some legacy compatibility code.
 PYTHON_2 = sys.version_info < (3, 0)
 
-# Translation table for macron to circumflex style long vowels.
-if not PYTHON_2:
-    vowels_to_circumflexes = str.maketrans(macron_vowels, circumflex_vowels)
-else:
-    macron_vowels_ord = [ord(char) for char in macron_vowels]
-    vowels_to_circumflexes = dict(zip(macron_vowels_ord, circumflex_vowels))
+# The long vowels of every style other than macrons, indexed by the
+# macron vowel they replace. Slugs use plain vowels.
+vowel_style_vowels = {
+    style: dict(zip(macron_vowels, vowels))
+    for style, vowels in [
+        (CIRCUMFLEX_STYLE, circumflex_vowels),
+        (DOUBLED_STYLE, doubled_vowels),
+        (WAPURO_STYLE, wapuro_vowels),
+        (OH_STYLE, oh_vowels),
+        (PLAIN_STYLE, plain_vowels),
+        (SLUG_STYLE, plain_vowels)
+    ]
+}
+
+# The long o that's written with an お (e.g. おお, とお) in the styles that
+# spell it differently from the long o of おう; all other styles use the
+# same long vowel for both.
+oo_vowels = {WAPURO_STYLE: u'oo'}
+
+# Placeholder for the long o of an お in output that's made with macrons,
+# so that it can still be told apart from ō in the styles that spell it
+# differently. It's a private use character, which kana text doesn't
+# normally contain; input that does is converted once for every style.
+OO_MARK = u'\ue000'
+
+# Translation tables for macron to other style long vowels. They also
+# replace the placeholder for a long o that's written with an お, which
+# is why macrons have a table as well.
+vowel_style_tables = {
+    style: dict(
+        [(ord(macron), vowel) for macron, vowel in vowels.items()] +
+        [(ord(OO_MARK), oo_vowels.get(style, vowels[u'ō']))]
+    )
+    for style, vowels in vowel_style_vowels.items()
+}
+vowel_style_tables[MACRON_STYLE] = {ord(OO_MARK): u'ō'}
+
+# All long vowel styles, for use with to_romaji_variants().
+VOWEL_STYLES = (
+    MACRON_STYLE, CIRCUMFLEX_STYLE, DOUBLED_STYLE, WAPURO_STYLE, OH_STYLE,
+    PLAIN_STYLE
+)
+
+# Matches the characters that separate the words of a slug.
+slug_separators = re.compile(u'[^a-z0-9]+')
 
 # The replacement character for impossible geminate marker combinations.
 # E.g. っえ becomes -e. todo: implement
@@ -135,6 +169,171 @@ CHAR_TYPES = {CV, VOWEL, XVOWEL}
 WORD_BORDER = '|'         # word boundary, e.g. 子馬 = こ|うま = kouma, not kōma.
 PARTICLE_INDICATOR = '.'  # indicates a particle, e.g. わたし.は = watashi wa.
 
+# Consonants that change a preceding 'n' in systems that have a labial_n
+# (e.g. しんばし is 'shimbashi' in passport Hepburn).
+labials = {'b', 'm', 'p'}
+
+# The names of the romanization systems and long vowel styles,
+# for use in rule-set files.
+system_names = {
+    'hepburn': HEPBURN, 'kunrei': KUNREI, 'nihon': NIHON,
+    'passport': PASSPORT
+}
+vowel_style_names = {
+    'macron': MACRON_STYLE, 'circumflex': CIRCUMFLEX_STYLE,
+    'doubled': DOUBLED_STYLE, 'wapuro': WAPURO_STYLE, 'oh': OH_STYLE
+}
+
+
+def _override_lt(romaji_set, katakana_set, hiragana_set, overrides,
+                 lv_index=None, long_vowels=None):
+    '''
+    Generates a lookup table like kana_romaji_lt(), with the rōmaji
+    of some of the characters replaced. The overrides are indexed
+    by katakana.
+
+    If a dict of long vowels is given, the macron vowel at lv_index
+    in every item (the long vowel part) is replaced by its value.
+    '''
+    romaji_set = [
+        overrides.get(ka, ro) for ro, ka in zip(romaji_set, katakana_set)
+    ]
+    if long_vowels is not None:
+        romaji_set = [
+            ro[:lv_index] + (long_vowels.get(ro[lv_index], ro[lv_index]),) +
+            ro[lv_index + 1:]
+            for ro in romaji_set
+        ]
+
+    return kana_romaji_lt(romaji_set, katakana_set, hiragana_set)
+
+
+def compile_system(system, vowel_style=None):
+    '''
+    Returns the lookup tables for a romanization system. The system is
+    a dict with the entries that differ from Modified Hepburn; see
+    romaji_systems in charsets.py for the format.
+
+    The long vowels are written directly in the given style (by default,
+    the system's own style), so the output needs no further processing.
+    '''
+    if vowel_style is None:
+        vowel_style = system.get('vowel_style', MACRON_STYLE)
+    long_vowels = vowel_style_vowels.get(vowel_style)
+
+    # Slugs don't have apostrophes.
+    if vowel_style == SLUG_STYLE:
+        apostrophe_char = ''
+    else:
+        apostrophe_char = system.get('apostrophe_char', APOSTROPHE_CHAR)
+
+    return {
+        'kana_lt': merge_dicts(
+            _override_lt(
+                cvs_romaji, cvs_katakana, cvs_hiragana,
+                system.get('set_cvs', {}), 4, long_vowels
+            ),
+            _override_lt(
+                vowels_romaji, vowels_katakana, vowels_hiragana,
+                system.get('set_vowels', {}), 1, long_vowels
+            ),
+            _override_lt(
+                xvowels_romaji, xvowels_katakana, xvowels_hiragana,
+                system.get('set_xvowels', {}), 1, long_vowels
+            )
+        ),
+        'di_a_lt': _override_lt(
+            di_a_romaji, di_a_katakana, di_a_hiragana,
+            system.get('set_digraphs_a', {})
+        ),
+        'di_b_lt': _override_lt(
+            di_b_romaji, di_b_katakana, di_b_hiragana,
+            system.get('set_digraphs_b', {}), 1, long_vowels
+        ),
+        'apostrophe_char': apostrophe_char,
+        'labial_n': system.get('labial_n'),
+        'oo_vowel': oo_vowels.get(vowel_style),
+        'vowel_style': vowel_style
+    }
+
+
+# The compiled tables of the built-in systems, indexed by the system
+# and the long vowel style. They're compiled when they're first used.
+system_tables = {}
+
+
+def _get_system_tables(system, vowel_style=None):
+    '''
+    Returns the compiled tables of a built-in system. The tables of
+    a system loaded with load_system() are cached by the converter.
+    '''
+    if vowel_style is None:
+        vowel_style = romaji_systems[system].get('vowel_style', MACRON_STYLE)
+
+    key = (system, vowel_style)
+    if key not in system_tables:
+        system_tables[key] = compile_system(
+            romaji_systems[system], vowel_style
+        )
+
+    return system_tables[key]
+
+
+# The katakana that can be given different rōmaji in every set of a system.
+system_sets = {
+    'set_cvs': set(cvs_katakana),
+    'set_vowels': set(vowels_katakana),
+    'set_xvowels': set(xvowels_katakana),
+    'set_digraphs_a': set(di_a_katakana),
+    'set_digraphs_b': set(di_b_katakana)
+}
+
+
+def load_system(path):
+    '''
+    Loads a romanization system from a JSON rule-set file, and returns it
+    in the format of romaji_systems, for use with KanaConv.set_system().
+
+    The file contains an object with the same keys, plus an optional
+    'base' with the name of the system that it extends (Hepburn by
+    default). The long vowel style is given by name, e.g. 'circumflex'.
+    For example:
+
+        {"base": "kunrei", "vowel_style": "macron",
+         "set_cvs": {"フ": ["fu", "f", "f", "u", "ū"]}}
+
+    Raises ValueError for unknown keys, and for sets with kana that
+    aren't in them (the sets are indexed by katakana).
+    '''
+    with io.open(path, encoding='utf-8') as file:
+        rules = json.load(file)
+
+    base = rules.pop('base', 'hepburn')
+    if base not in system_names:
+        raise ValueError('Unknown romanization system: {}'.format(base))
+    system = dict(romaji_systems[system_names[base]])
+
+    for key, value in rules.items():
+        if key in system_sets:
+            unknown = sorted(set(value) - system_sets[key])
+            if unknown:
+                raise ValueError(u'Unknown kana in {}: {}'.format(
+                    key, u', '.join(unknown)
+                ))
+            system[key] = merge_dicts(system.get(key, {}), {
+                ka: tuple(ro) for ka, ro in value.items()
+            })
+        elif key == 'vowel_style':
+            if value not in vowel_style_names:
+                raise ValueError('Unknown long vowel style: {}'.format(value))
+            system[key] = vowel_style_names[value]
+        elif key in ('apostrophe_char', 'labial_n'):
+            system[key] = value
+        else:
+            raise ValueError('Unknown rule-set key: {}'.format(key))
+
+    return system
+
 
 class KanaConv(object):
     '''
@@ -152,12 +351,31 @@ class KanaConv(object):
         self.unknown_strategy = UNKNOWN_INCLUDE
         self.unknown_char = None
 
-        # Long vowel style, either with macron (ā) or with circumflex (â).
-        self.vowel_style = MACRON_STYLE
+        # The romanization system and its lookup tables. Setting the system
+        # also sets its default long vowel style, e.g. macrons (ā) for
+        # Hepburn. The long vowels are part of the lookup tables, which are
+        # cached for every style if the system was loaded from a file.
+        self.system = None
+        self.vowel_style = None
+        self.loaded_tables = {}
+        self.set_system(HEPBURN)
 
         # The case of the final output.
         self.uppercase = False
 
+        # The translation table for the simple string replacements,
+        # including the ones set by the user.
+        self.repl_table = repl_table
+
+        # The override dictionary for whole inputs and words, if any.
+        self.overrides = None
+
+        # The dictionary that finds word borders in the input, if any.
+        self.border_dictionary = None
+
+        # The dictionary that replaces kanji with their readings, if any.
+        self.reading_dictionary = None
+
         # The character stack, containing the characters of the rōmaji output.
         self.stack = []
 
@@ -168,6 +386,11 @@ class KanaConv(object):
         # presence of a ウ. Needed in case of the 'w' exception.
         self.has_u_lvm = False
 
+        # The positions of the long vowel markers that were added due to
+        # the presence of an オ, for styles that spell おお differently than
+        # おう (e.g. 'oo' and 'ou' in wāpuro style).
+        self.o_lvmarkers = []
+
         # Number of geminate markers in the state.
         self.geminate_count = 0
 
@@ -225,6 +448,7 @@ class KanaConv(object):
         self.has_xvowel = False
         self.has_digraph_b = False
         self.has_u_lvm = False
+        self.o_lvmarkers = []
         self.unknown_char = None
 
     def set_unknown_strategy(self, behavior):
@@ -235,9 +459,104 @@ class KanaConv(object):
 
     def set_vowel_style(self, style):
         '''
-        Sets the vowel style to either use macrons or circumflexes.
+        Sets the long vowel style: either macrons (MACRON_STYLE),
+        circumflexes (CIRCUMFLEX_STYLE), or one of the ASCII-only styles:
+        doubled vowels (DOUBLED_STYLE), wāpuro style (WAPURO_STYLE), 'oh'
+        for a long o (OH_STYLE), short vowels (PLAIN_STYLE), or lowercase
+        slugs with hyphens between the words (SLUG_STYLE).
+        '''
+        self._set_tables(self._get_tables(style))
+
+    def set_system(self, system):
+        '''
+        Sets the romanization system: either one of the built-in systems
+        (HEPBURN, KUNREI, NIHON or PASSPORT), or a system loaded with
+        load_system(). This also sets the system's long vowel style,
+        e.g. circumflexes for Kunrei-shiki.
         '''
-        self.vowel_style = style
+        self.system = system
+        self.loaded_tables = {}
+        self._set_tables(self._get_tables())
+
+    def _get_tables(self, vowel_style=None):
+        '''
+        Returns the compiled tables of the current system in the given long
+        vowel style. A system loaded with load_system() is compiled once for
+        every style, and kept for as long as it's set.
+        '''
+        if not isinstance(self.system, dict):
+            return _get_system_tables(self.system, vowel_style)
+
+        if vowel_style is None:
+            vowel_style = self.system.get('vowel_style', MACRON_STYLE)
+        if vowel_style not in self.loaded_tables:
+            self.loaded_tables[vowel_style] = compile_system(
+                self.system, vowel_style
+            )
+
+        return self.loaded_tables[vowel_style]
+
+    def _set_tables(self, tables):
+        '''
+        Sets the lookup tables made by compile_system().
+        '''
+        self.kana_lt = tables['kana_lt']
+        self.di_a_lt = tables['di_a_lt']
+        self.di_b_lt = tables['di_b_lt']
+        self.apostrophe_char = tables['apostrophe_char']
+        self.labial_n = tables['labial_n']
+        self.oo_vowel = tables['oo_vowel']
+        self.vowel_style = tables['vowel_style']
+        self.tables = tables
+
+    def set_replacements(self, replacements):
+        '''
+        Sets additional string replacements, which are performed along
+        with the built-in ones (fullwidth rōmaji, ligatures, punctuation)
+        before the kana are converted. The replacements are a dict of
+        single characters and the strings that replace them, e.g.
+        {u'㈱': u'(kabu)'}. The replacements can also be kana, which are
+        then converted as usual. They take precedence over the built-in
+        replacements. Pass an empty dict to remove them again.
+        '''
+        for char in replacements:
+            if len(char) != 1:
+                raise ValueError(
+                    'Replacements must be single characters: {!r}'
+                    .format(char)
+                )
+
+        self.repl_table = merge_dicts(repl_table, {
+            ord(char): value for char, value in replacements.items()
+        })
+
+    def set_overrides(self, overrides):
+        '''
+        Sets an override dictionary: a dict of kana strings and the rōmaji
+        to use for them instead of the conversion rules, or an OverrideDict
+        (see overrides.py) for large dictionaries. It's consulted for the
+        whole input, and for every word if the input has word borders.
+        Pass None to remove it.
+        '''
+        self.overrides = overrides
+
+    def set_border_dictionary(self, dictionary):
+        '''
+        Sets a BorderDictionary (see borders.py) that finds the word borders
+        in every input, e.g. so こうま is converted like こ|うま. Borders that
+        are marked with a '|' are still used. Pass None to remove it.
+        '''
+        self.border_dictionary = dictionary
+
+    def set_reading_dictionary(self, dictionary):
+        '''
+        Sets a ReadingDictionary (see readings.py) that replaces the kanji
+        in every input with their readings in kana, e.g. so 東京 becomes
+        'tōkyō'. Every reading is converted as a separate word. Kanji that
+        aren't in the dictionary are handled like any other unknown
+        character. Pass None to remove it.
+        '''
+        self.reading_dictionary = dictionary
 
     def set_uppercase(self, state=True):
         '''
@@ -278,6 +597,17 @@ class KanaConv(object):
 
             return
 
+        self._append_to_stack(self._char_romaji())
+
+        # Append the unknown character as well.
+        self._append_unknown_char()
+        self._clear_char()
+
+    def _char_romaji(self):
+        '''
+        Returns the rōmaji of the active character, along with its
+        geminate, small vowel and long vowel markers.
+        '''
         char_info = self.active_char_info
         char_type = self.active_char_type
         char_ro = char_info[0]
@@ -310,10 +640,7 @@ class KanaConv(object):
         # We'll also continue if the character is 'n', which has a special
         # case attached to it that we'll tackle down below.
         if xv is di_b is None and gem == lvm == 0 and char_ro != 'n':
-            self._append_to_stack(char_ro)
-            self._append_unknown_char()
-            self._clear_char()
-            return
+            return char_ro
 
         # At this point, we're considering two main factors: the currently
         # active character, and possibly a small vowel character if one is set.
@@ -325,6 +652,7 @@ class KanaConv(object):
         # long vowel markers, which repeats the vowel part. If there's
         # at least one long vowel marker, we also use a macron vowel
         # rather than the regular one, e.g. 'ī' instead of 'i'.
+        # See _long_vowels() for how the long vowel markers are spelled.
 
         if char_type == CV:
             # Deconstruct the info object for clarity.
@@ -336,26 +664,11 @@ class KanaConv(object):
             # a 'y' consonant, it must be followed by an apostrophe.
             char_apostrophe = ''
 
-            if char_ro == 'n' and self.next_char_info is not None:
-                first_char = None
-
-                if self.next_char_type == CV:
-                    first_char = self._char_ro_cons(
-                        self.next_char_info,
-                        CV
-                    )
-
-                if self.next_char_type == VOWEL or \
-                   self.next_char_type == XVOWEL:
-                    first_char = self._char_ro_vowel(
-                        self.next_char_info,
-                        VOWEL
-                    )
-
-                # If the following character is in the set of characters
-                # that should trigger an apostrophe, add it to the output.
-                if first_char in n_apostrophe:
-                    char_apostrophe = APOSTROPHE_CHAR
+            if char_ro == 'n' and self._needs_apostrophe():
+                char_apostrophe = self.apostrophe_char
+            elif char_ro == 'n' and self.labial_n is not None and \
+                    self._next_char_ro_first() in labials:
+                char_ro = self.labial_n
 
             # Check to see if we've got a full digraph.
             if self.active_dgr_a_info is not None and \
@@ -370,11 +683,11 @@ class KanaConv(object):
                 # Combine the consonant of the character with the small vowel.
                 # Use a macron vowel if there's a long vowel marker,
                 # else use the regular vowel.
-                vowel = xv[1] * lvm if lvm > 0 else xv[0]
+                vowel = self._long_vowels(xv[1]) if lvm > 0 else xv[0]
             elif di_b is not None:
                 # Put together the digraph. Here we produce the latter half
                 # of the digraph.
-                vowel = di_b[1] * lvm if lvm > 0 else di_b[0]
+                vowel = self._long_vowels(di_b[1]) if lvm > 0 else di_b[0]
             else:
                 # Neither a small vowel marker, nor a digraph.
                 vowel = ''
@@ -387,25 +700,64 @@ class KanaConv(object):
                 # If not, process the main character and add the long vowels
                 # if applicable.
                 if lvm > 0:
-                    char_main = char_cons + char_apostrophe + char_lv * lvm
+                    char_main = char_cons + char_apostrophe + \
+                        self._long_vowels(char_lv)
                 else:
                     char_main = char_ro + char_apostrophe
 
-            self._append_to_stack(gem_cons + char_main)
+            return gem_cons + char_main
 
-        if char_type == VOWEL or char_type == XVOWEL:
-            char_lv = char_info[1]  # the long vowel part
+        # The character is a vowel or a small vowel.
+        char_lv = char_info[1]  # the long vowel part
 
-            if xv is not None:
-                xv_ro = xv[1] * lvm if lvm > 0 else xv[0]
-                self._append_to_stack(char_ro + xv_ro)
-            else:
-                vowel_ro = char_lv * lvm if lvm > 0 else char_ro
-                self._append_to_stack(vowel_ro)
+        if xv is not None:
+            xv_ro = self._long_vowels(xv[1]) if lvm > 0 else xv[0]
+            return char_ro + xv_ro
 
-        # Append unknown the character as well.
-        self._append_unknown_char()
-        self._clear_char()
+        return self._long_vowels(char_lv) if lvm > 0 else char_ro
+
+    def _long_vowels(self, long_vowel):
+        '''
+        Returns the long vowel part of the active character: the long vowel
+        once for every long vowel marker. Some styles spell a long o after
+        the kana it's written with, e.g. 'oo' for とお but 'ou' for とう in
+        wāpuro style, so every marker that came from an オ gets that style's
+        spelling instead.
+        '''
+        if not self.o_lvmarkers or self.oo_vowel is None:
+            return long_vowel * self.lvmarker_count
+
+        return ''.join(
+            self.oo_vowel if n in self.o_lvmarkers else long_vowel
+            for n in range(self.lvmarker_count)
+        )
+
+    def _needs_apostrophe(self):
+        '''
+        Returns whether the character that directly follows the flushed
+        character triggers an apostrophe after a lone 'n'.
+        '''
+        # If the following character is in the set of characters
+        # that should trigger an apostrophe, add it to the output.
+        return self._next_char_ro_first() in n_apostrophe
+
+    def _next_char_ro_first(self):
+        '''
+        Returns the first rōmaji character of the character that directly
+        follows the flushed character, or None if there is none.
+        '''
+        if self.next_char_info is None:
+            return None
+
+        first_char = None
+
+        if self.next_char_type == CV:
+            first_char = self._char_ro_cons(self.next_char_info, CV)
+
+        if self.next_char_type == VOWEL or self.next_char_type == XVOWEL:
+            first_char = self._char_ro_vowel(self.next_char_info, VOWEL)
+
+        return first_char
 
     def _append_to_stack(self, string):
         '''
@@ -450,7 +802,7 @@ class KanaConv(object):
         the first part of a digraph.
         '''
         self._set_char(char, CV)
-        self.active_dgr_a_info = di_a_lt[char]
+        self.active_dgr_a_info = self.di_a_lt[char]
 
     def _set_digraph_b(self, char):
         '''
@@ -459,14 +811,14 @@ class KanaConv(object):
         self.has_digraph_b = True
         # Change the active vowel to the one provided by the second part
         # of the digraph.
-        self.active_vowel_ro = di_b_lt[char][0]
-        self.active_dgr_b_info = di_b_lt[char]
+        self.active_vowel_ro = self.di_b_lt[char][0]
+        self.active_dgr_b_info = self.di_b_lt[char]
 
     def _char_lookup(self, char):
         '''
         Retrieves a character's info from the lookup table.
         '''
-        return kana_lt[char]
+        return self.kana_lt[char]
 
     def _char_ro_cons(self, char_info, type):
         '''
@@ -532,7 +884,7 @@ class KanaConv(object):
         what comes after the ウ, so there's some backtracking
         if that's the case.
         '''
-        vowel_info = kana_lt[vowel]
+        vowel_info = self.kana_lt[vowel]
         vowel_ro = self.active_vowel_ro
 
         if self._is_long_vowel(vowel_ro, vowel_info[0]):
@@ -542,6 +894,10 @@ class KanaConv(object):
             if vowel_ro == 'u':
                 self.has_u_lvm = True
 
+            # The long o is written with an オ rather than a ウ.
+            if vowel_info[0] == 'o' and self.active_char is not None:
+                self.o_lvmarkers.append(self.lvmarker_count)
+
             self._inc_lvmarker()
         else:
             # Not the same, so flush the active character and continue.
@@ -567,7 +923,7 @@ class KanaConv(object):
         small vowel, a long vowel marker is added instead.
         E.g. テェ becomes 'tē'.
         '''
-        xvowel_info = kana_lt[xvowel]
+        xvowel_info = self.kana_lt[xvowel]
         vowel_info = self.active_vowel_info
         dgr_b_info = None
 
@@ -601,6 +957,8 @@ class KanaConv(object):
 
         if self.active_vowel_ro == xvowel_info[0]:
             # We have an active character whose vowel is the same.
+            if xvowel_info[0] == 'o' and self.active_char is not None:
+                self.o_lvmarkers.append(self.lvmarker_count)
             self._inc_lvmarker()
         elif self.has_xvowel is True:
             # We have an active small vowel already. Flush the current
@@ -662,20 +1020,38 @@ class KanaConv(object):
             return
 
         self.lvmarker_count -= 1
+        if self.lvmarker_count in self.o_lvmarkers:
+            self.o_lvmarkers.remove(self.lvmarker_count)
 
-    def _postprocess_output(self, output):
+    def _postprocess_output(self, output, vowel_style=None):
         '''
         Performs the last modifications before the output is returned.
+
+        The long vowels are already in the style that's currently set.
+        If a different vowel style is given, the output must have been
+        made with macrons, which are then replaced.
         '''
-        # Replace long vowels with circumflex characters.
-        if self.vowel_style == CIRCUMFLEX_STYLE:
+        if vowel_style is None:
+            vowel_style = self.vowel_style
+        elif vowel_style in vowel_style_tables:
             try:
-                output = output.translate(vowels_to_circumflexes)
+                output = output.translate(vowel_style_tables[vowel_style])
             except TypeError:
                 # Python 2 will error out here if there are no
                 # macron characters in the string to begin with.
                 pass
 
+            # Slugs don't have apostrophes, but the macron output does.
+            if vowel_style == SLUG_STYLE:
+                apostrophe_char = \
+                    self._get_tables(MACRON_STYLE)['apostrophe_char']
+                if apostrophe_char:
+                    output = output.replace(apostrophe_char, u'')
+
+        # Slugs are always lowercase, with hyphens between the words.
+        if vowel_style == SLUG_STYLE:
+            return slug_separators.sub(u'-', output.lower()).strip(u'-')
+
         # Output the desired case.
         if self.uppercase:
             output = output.upper()
@@ -707,15 +1083,15 @@ class KanaConv(object):
 
         return input
 
-    def _preprocess_chars(self, chars):
+    def _preprocess_chars(self, input):
         '''
         Performs string preprocessing before the main conversion algorithm
-        is used. Simple string replacements (for example, fullwidth rōmaji
-        to regular rōmaji) are performed at this point.
+        is used and splits the input into a list. The kana are normalized
+        (see transform.normalize()), and simple string replacements
+        (for example, fullwidth rōmaji to regular rōmaji) are performed.
         '''
-        chars = self._normalize_dakuten(chars)
-        chars = self._process_repeaters(chars)
-        chars = self._perform_replacements(chars)
+        input = normalize(input)
+        chars = self._perform_replacements(list(input))
 
         return chars
 
@@ -733,84 +1109,75 @@ class KanaConv(object):
         '''
         Performs simple key/value string replacements that require no logic.
         This is used to convert the fullwidth rōmaji, several ligatures,
-        and the punctuation characters.
+        the punctuation characters and the user's own replacements.
+        All of them are done in a single translate() call.
         '''
-        for n in range(len(chars)):
-            char = chars[n]
-            if char in repl:
-                chars[n] = repl[char]
-
         # Some replacements might result in multi-character strings
         # being inserted into the list. Ensure we still have a list
         # of single characters for iteration.
-        return list(''.join(chars))
+        return list(u''.join(chars).translate(self.repl_table))
 
-    def _normalize_dakuten(self, chars):
+    def _handle_unknown_char(self, char):
         '''
-        Replaces the dakuten and handakuten modifier character combinations
-        with single characters. For example, か\u3099か becomes がけ,
-        or は゜は becomes ぱは.
+        Deals with a character the machine can't process, according to
+        the currently set unknown character strategy.
         '''
-        prev = None
-        prev_n = None
-
-        # Set all repeater characters to 0 initially,
-        # then go through the list and remove them all.
-        for n in range(len(chars)):
-            char = chars[n]
-
-            if char in dkt:
-                chars[n] = 0
-                if prev in dkt_cvs:
-                    chars[prev_n] = dkt_lt[prev]
-
-            if char in hdkt:
-                chars[n] = 0
-                if prev in hdkt_cvs:
-                    chars[prev_n] = hdkt_lt[prev]
+        if self.unknown_strategy == UNKNOWN_DISCARD:
+            return
 
-            prev = char
-            prev_n = n
+        if self.unknown_strategy == UNKNOWN_RAISE:
+            raise UnexpectedCharacterError(char)
 
-        # Remove all 0 values. There should not be any other than the ones we
-        # just added. (This could use (0).__ne__, but that's Python 3 only.)
-        return list(filter(lambda x: x is not 0, chars))
+        if self.unknown_strategy == UNKNOWN_INCLUDE:
+            # The default strategy.
+            self._add_unknown_char(char)
 
-    def _process_repeaters(self, chars):
+    def _split_at_boundaries(self, input, boundaries):
         '''
-        Replace all repeater characters (e.g. turn サヾエ into サザエ).
+        Preprocesses the input in separate parts, split at the given offsets,
+        and returns a list of characters with a BORDER_CHAR between the parts.
         '''
-        prev = None
-        for n in range(len(chars)):
-            char = chars[n]
-            if char in rpts:
-                # The character is a repeater.
-                chars[n] = prev
-
-            if char in drpts:
-                # The character is a repeater with dakuten.
-                # If the previous character can have a dakuten, add that
-                # to the stack; if not, just add whatever we had previously.
-                if prev in dkt_cvs:
-                    chars[n] = dkt_lt[prev]
-                else:
-                    chars[n] = prev
+        chars = []
+        start = 0
+        for offset in sorted(set(boundaries)):
+            if offset <= start or offset >= len(input):
+                continue
+            part = self._preprocess_input(input[start:offset])
+            chars.extend(self._preprocess_chars(part))
+            chars.append(BORDER_CHAR)
+            start = offset
 
-            prev = char
+        part = self._preprocess_input(input[start:])
+        chars.extend(self._preprocess_chars(part))
 
         return chars
 
-    def to_romaji(self, input):
+    def _input_chars(self, input, boundaries=None):
         '''
-        Converts kana input to rōmaji and returns the result.
+        Returns the preprocessed list of input characters, ending with an
+        END_CHAR, and the character that indicates a word border.
+
+        If a list of word boundary offsets is given, the input is split
+        at those offsets rather than at the WORD_BORDER character.
         '''
-        input = self._preprocess_input(input)
+        if boundaries is None:
+            input = self._preprocess_input(input)
 
-        # Preprocess the input, making string replacements where needed.
-        chars = list(input)
-        chars = self._preprocess_chars(chars)
+            # Preprocess the input, making string replacements where needed.
+            chars = self._preprocess_chars(input)
+            border = WORD_BORDER
+        else:
+            chars = self._split_at_boundaries(input, boundaries)
+            border = BORDER_CHAR
 
         chars.append(END_CHAR)
+
+        return chars, border
+
+    def _process_chars(self, chars, border=WORD_BORDER):
+        '''
+        Runs a list of preprocessed characters through the state machine.
+        '''
         for char in chars:
             if char in di_a:
                 self._set_digraph_a(char)
@@ -840,7 +1207,7 @@ class KanaConv(object):
                 self._inc_lvmarker()
                 continue
 
-            if char == WORD_BORDER:
+            if char == border:
                 # When stumbling upon a word border, e.g. in ぬれ|えん,
                 # the current word has finished, meaning the character
                 # should be flushed.
@@ -854,14 +1221,203 @@ class KanaConv(object):
 
             # If we're still here, that means we've stumbled upon a character
             # the machine can't deal with.
-            if self.unknown_strategy == UNKNOWN_DISCARD:
+            self._handle_unknown_char(char)
+
+    def _process_input(self, input, boundaries=None):
+        '''
+        Runs the input through the state machine. The rōmaji output
+        is left on the stack; see _flush_stack() to retrieve it.
+        '''
+        if self.reading_dictionary is not None or \
+           self.border_dictionary is not None:
+            input, boundaries = self._dictionary_boundaries(input, boundaries)
+
+        if self.overrides is not None and \
+           self._process_overrides(input, boundaries):
+            return
+
+        chars, border = self._input_chars(input, boundaries)
+        self._process_chars(chars, border)
+
+    def _dictionary_boundaries(self, input, boundaries=None):
+        '''
+        Applies the reading and border dictionaries to the input. Returns
+        the new input, and a list of boundary offsets: the given ones, or
+        the positions of the WORD_BORDER characters (which are removed),
+        plus the word borders found by the border dictionary. The start
+        and end of every reading are boundaries as well.
+        '''
+        split_input = boundaries is None
+        original = input
+        if split_input:
+            boundaries = []
+            if WORD_BORDER in input:
+                parts = input.split(WORD_BORDER)
+                for part in parts[:-1]:
+                    boundaries.append(
+                        (boundaries[-1] if boundaries else 0) + len(part)
+                    )
+                input = u''.join(parts)
+
+        found = False
+        if self.reading_dictionary is not None:
+            replaced, boundaries = self.reading_dictionary.replace(
+                input, boundaries
+            )
+            found = replaced is not input
+            input = replaced
+        if self.border_dictionary is not None:
+            borders = self.border_dictionary.boundaries(input)
+            if borders:
+                boundaries = list(boundaries) + borders
+                found = True
+
+        # If the dictionaries found nothing, the original input can be
+        # processed as usual, with its WORD_BORDER characters.
+        if split_input and not found:
+            return original, None
+
+        return input, boundaries
+
+    def _process_overrides(self, input, boundaries=None):
+        '''
+        Looks up the input and its words in the override dictionary. If any
+        of them are found, the input is run through the state machine word
+        by word, the rōmaji of the found words is added as-is, and True is
+        returned. Otherwise, nothing is done and False is returned.
+        '''
+        overrides = self.overrides
+        value = overrides.get(input)
+        if value is not None:
+            self._append_to_stack(value)
+            return True
+
+        if boundaries is None:
+            words = input.split(WORD_BORDER)
+            border = WORD_BORDER
+        else:
+            offsets = [0] + [
+                offset for offset in sorted(set(boundaries))
+                if 0 < offset < len(input)
+            ] + [len(input)]
+            words = [
+                input[start:end] for start, end in zip(offsets, offsets[1:])
+            ]
+            border = BORDER_CHAR
+
+        if len(words) < 2:
+            return False
+        values = [overrides.get(word) for word in words]
+        if all(value is None for value in values):
+            return False
+
+        for word, value in zip(words, values):
+            # Finish the previous word, like a word border does.
+            self._flush_char()
+            if value is not None:
+                self._clear_char()
+                self._append_to_stack(value)
                 continue
+            chars = self._preprocess_chars(self._preprocess_input(word))
+            self._process_chars(chars, border)
+
+        self._process_chars([END_CHAR], border)
+
+        return True
+
+    def _iter_fragments(self, input):
+        '''
+        Runs the input through the state machine, and yields the pieces of
+        rōmaji that are added to the stack along the way. The pieces are
+        unaffected by the case setting.
+
+        The input is processed in chunks that double in size, so that
+        a caller that stops early has only processed a small part of it.
+        The machine is reset at the start, so a previous run that was
+        abandoned halfway doesn't affect the result.
+        '''
+        self._clear_char()
+        self._empty_stack()
+        chars, border = self._input_chars(input)
+        stack = self.stack
+        flushed = 0
+        start = 0
+        size = 2
+        while start < len(chars):
+            self._process_chars(chars[start:start + size], border)
+            start += size
+            size *= 2
+            while flushed < len(stack):
+                yield stack[flushed]
+                flushed += 1
 
-            if self.unknown_strategy == UNKNOWN_RAISE:
-                raise UnexpectedCharacterError
+        self._clear_char()
+        self._empty_stack()
 
-            if self.unknown_strategy == UNKNOWN_INCLUDE:
-                # The default strategy.
-                self._add_unknown_char(char)
+    def to_romaji(self, input, boundaries=None):
+        '''
+        Converts kana input to rōmaji and returns the result.
+
+        Word borders can be indicated with a WORD_BORDER character ('|'),
+        or by passing a list of offsets in the input where words begin.
+        In the latter case, a '|' in the input is a regular character.
+        '''
+        self._process_input(input, boundaries)
 
         return self._flush_stack()
+
+    def to_romaji_many(self, inputs):
+        '''
+        Yields the rōmaji for every kana string in an iterable.
+        '''
+        for input in inputs:
+            self._process_input(input)
+            yield self._flush_stack()
+
+    def to_romaji_variants(self, input, styles=VOWEL_STYLES):
+        '''
+        Converts kana input to rōmaji once, and returns a list of the output
+        in each of the given long vowel styles. Styles that result in the
+        same output are only included once, e.g. if there are no long vowels
+        the list contains a single item.
+        '''
+        tables = self.tables
+
+        # The tables are restored even if the conversion raises an error
+        # (e.g. with UNKNOWN_RAISE), along with the machine's state.
+        try:
+            if OO_MARK in input:
+                # The placeholder can't be used, so the input is converted
+                # separately in every style.
+                outputs = []
+                for style in styles:
+                    self.set_vowel_style(style)
+                    outputs.append(self.to_romaji(input))
+            else:
+                # Convert the input with macrons, which are then replaced by
+                # the long vowels of every style. A long o that's written
+                # with an お gets a placeholder, since some styles spell it
+                # as 'oo'.
+                self._set_tables(dict(
+                    self._get_tables(MACRON_STYLE),
+                    oo_vowel=OO_MARK
+                ))
+                self._process_input(input)
+                output = ''.join(self.stack)
+                outputs = [
+                    self._postprocess_output(output, style)
+                    for style in styles
+                ]
+        finally:
+            self._clear_char()
+            self._empty_stack()
+            self._set_tables(tables)
+
+        variants = []
+        for variant in outputs:
+            if PYTHON_2:
+                variant = unicode(variant)
+            if variant not in variants:
+                variants.append(variant)
+
+        return variants
@@ -0,0 +1,379 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+In-memory n-gram index for searching kana by (partial) rōmaji.
+
+Every kana entry is converted to rōmaji and reduced to a search key with
+canonical_romaji(), so that e.g. 'tokyo', 'toukyou' and 'tōkyō' all find
+とうきょう. The key is split into character n-grams, and every n-gram has
+a posting list: an array of the ids of the entries that contain it.
+
+An index can be saved to a file and loaded again without rebuilding it.
+The loaded file is memory-mapped, and n-grams and posting lists are only
+read from it when they're needed: the n-grams are stored in sorted order,
+so they're looked up with a binary search. Entries can still be added
+after loading.
+'''
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from .converter import KanaConv
+from .keys import canonical_romaji
+from .utils import UINT32, array_to_bytes, array_from_bytes, encode_strings
+
+# The file format identifier and version.
+INDEX_MAGIC = b'KCNG'
+INDEX_VERSION = 1
+
+# The file header: magic, version, n, and the number of entries, n-grams
+# and postings. All numbers are stored as unsigned little-endian integers.
+INDEX_HEADER = struct.Struct('<4sBBxxIII')
+
+
+def _ngrams(key, n):
+    '''
+    Returns the set of n-grams in a search key. Keys that are shorter
+    than n are used as a single n-gram.
+    '''
+    if len(key) <= n:
+        return {key} if key else set()
+
+    return {key[i:i + n] for i in range(len(key) - n + 1)}
+
+
+class _GramTable(object):
+    '''
+    The sorted n-grams of a loaded index file, as a read-only sequence of
+    UTF-8 encoded n-grams that can be searched with bisect. An n-gram is
+    only read from the file when it's accessed.
+    '''
+    def __init__(self, data, gram_offsets, gram_start, posting_offsets,
+                 posting_start):
+        self.data = data
+        self.gram_offsets = gram_offsets
+        self.gram_start = gram_start
+        self.posting_offsets = posting_offsets
+        self.posting_start = posting_start
+
+    def __len__(self):
+        return len(self.gram_offsets) - 1
+
+    def __getitem__(self, n):
+        start = self.gram_start + self.gram_offsets[n]
+        end = self.gram_start + self.gram_offsets[n + 1]
+        return self.data[start:end]
+
+    def postings(self, n):
+        '''
+        Returns the posting list of the n-gram at the given position.
+        '''
+        size = self.posting_offsets.itemsize
+        start = self.posting_start + self.posting_offsets[n] * size
+        end = self.posting_start + self.posting_offsets[n + 1] * size
+        return array_from_bytes(self.data[start:end])
+
+    def find(self, gram):
+        '''
+        Returns the position of an encoded n-gram, or None if it's not
+        in the table.
+        '''
+        n = bisect_left(self, gram)
+        if n < len(self) and self[n] == gram:
+            return n
+
+        return None
+
+    def prefix_range(self, prefix):
+        '''
+        Yields the positions of the encoded n-grams that start with
+        a prefix, which are next to each other in the table.
+        '''
+        for n in range(bisect_left(self, prefix), len(self)):
+            if not self[n].startswith(prefix):
+                break
+            yield n
+
+
+class NgramIndex(object):
+    '''
+    Inverted index of rōmaji n-grams over a kana vocabulary. After
+    initialization, use add() or add_many() to add entries, and search()
+    to find the entries that best match a rōmaji query.
+    '''
+    def __init__(self, n=3, conv=None):
+        '''
+        Initializes an empty index with n-grams of length n. A converter
+        can be passed to use its settings for the conversion.
+        '''
+        self.n = n
+        self.conv = conv if conv is not None else KanaConv()
+
+        # The entries and posting lists added since initialization (or
+        # since loading), the posting list of every n-gram, and the
+        # n-grams in sorted order.
+        self.entries = []
+        self.postings = {}
+        self.sorted_grams = []
+
+        # The memory-mapped data of a loaded index, and its path.
+        self._path = None
+        self._file = None
+        self._mmap = None
+        self._base_count = 0
+        self._base_entries = None
+        self._base_grams = None
+
+    def __len__(self):
+        '''
+        Returns the number of entries in the index.
+        '''
+        return self._base_count + len(self.entries)
+
+    def _add_key(self, entry, key):
+        '''
+        Adds an entry with a precomputed search key, and returns its id.
+        '''
+        entry_id = len(self)
+        self.entries.append(entry)
+        for gram in _ngrams(key, self.n):
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = array(UINT32)
+                self.sorted_grams.insert(
+                    bisect_left(self.sorted_grams, gram), gram
+                )
+            postings.append(entry_id)
+
+        return entry_id
+
+    def add(self, entry):
+        '''
+        Adds a kana entry to the index, and returns its id.
+        '''
+        return self._add_key(
+            entry, canonical_romaji(self.conv.to_romaji(entry))
+        )
+
+    def add_many(self, entries):
+        '''
+        Adds all kana entries in an iterable to the index.
+        '''
+        entries = list(entries)
+        for entry, ro in zip(entries, self.conv.to_romaji_many(entries)):
+            self._add_key(entry, canonical_romaji(ro))
+
+    def get(self, entry_id):
+        '''
+        Returns the entry with the given id.
+        '''
+        if entry_id < self._base_count:
+            offsets = self._base_entries[0]
+            start = self._base_entries[1] + offsets[entry_id]
+            end = self._base_entries[1] + offsets[entry_id + 1]
+            return self._mmap[start:end].decode('utf-8')
+
+        return self.entries[entry_id - self._base_count]
+
+    def _gram_postings(self, gram):
+        '''
+        Yields the posting lists of an n-gram, from the loaded file
+        and from the entries that were added afterwards.
+        '''
+        if self._base_grams is not None:
+            n = self._base_grams.find(gram.encode('utf-8'))
+            if n is not None:
+                yield self._base_grams.postings(n)
+
+        postings = self.postings.get(gram)
+        if postings is not None:
+            yield postings
+
+    def _prefix_postings(self, prefix):
+        '''
+        Yields the posting lists of every n-gram that starts with a prefix,
+        from the loaded file and from the entries that were added afterwards.
+        '''
+        if self._base_grams is not None:
+            for n in self._base_grams.prefix_range(prefix.encode('utf-8')):
+                yield self._base_grams.postings(n)
+
+        grams = self.sorted_grams
+        for n in range(bisect_left(grams, prefix), len(grams)):
+            if not grams[n].startswith(prefix):
+                break
+            yield self.postings[grams[n]]
+
+    def _grams(self):
+        '''
+        Returns the set of all n-grams in the index.
+        '''
+        grams = set(self.postings)
+        if self._base_grams is not None:
+            grams.update(gram.decode('utf-8') for gram in self._base_grams)
+
+        return grams
+
+    def search(self, query, limit=10):
+        '''
+        Returns a list of (entry, score) tuples for the entries that match
+        a rōmaji query best, at most 'limit' of them. The score is the
+        fraction of the query's n-grams that the entry contains, so 1.0
+        means every n-gram was found.
+
+        Queries shorter than n match every n-gram they're a prefix of.
+        '''
+        key = canonical_romaji(query)
+        grams = _ngrams(key, self.n)
+        if not grams:
+            return []
+
+        counts = {}
+        if len(key) < self.n:
+            for postings in self._prefix_postings(key):
+                for entry_id in postings:
+                    counts[entry_id] = 1
+        else:
+            for gram in grams:
+                for postings in self._gram_postings(gram):
+                    for entry_id in postings:
+                        counts[entry_id] = counts.get(entry_id, 0) + 1
+
+        best = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        total = float(len(grams))
+
+        return [
+            (self.get(entry_id), count / total)
+            for entry_id, count in best[:limit]
+        ]
+
+    def save(self, path):
+        '''
+        Saves the index to a file, which can be loaded with load().
+        A loaded index can't be saved to the file it was loaded from.
+        '''
+        if self._mmap is not None and os.path.exists(path) and \
+           os.path.samefile(path, self._path):
+            raise ValueError(
+                'Can\'t save an index to the file it was loaded from: '
+                '{}'.format(path)
+            )
+
+        entry_offsets, entry_data = encode_strings(
+            self.get(n) for n in range(len(self))
+        )
+        grams = sorted(self._grams())
+        gram_offsets, gram_data = encode_strings(grams)
+
+        postings = array(UINT32)
+        posting_offsets = array(UINT32, [0])
+        for gram in grams:
+            for gram_postings in self._gram_postings(gram):
+                postings.extend(gram_postings)
+            posting_offsets.append(len(postings))
+
+        with open(path, 'wb') as file:
+            file.write(INDEX_HEADER.pack(
+                INDEX_MAGIC, INDEX_VERSION, self.n, len(self), len(grams),
+                len(postings)
+            ))
+            file.write(array_to_bytes(entry_offsets))
+            file.write(entry_data)
+            file.write(array_to_bytes(gram_offsets))
+            file.write(gram_data)
+            file.write(array_to_bytes(posting_offsets))
+            file.write(array_to_bytes(postings))
+
+    @classmethod
+    def load(cls, path, conv=None):
+        '''
+        Loads an index from a file made by save(). The file is
+        memory-mapped, and remains open until close() is called.
+        Raises ValueError if the file isn't a complete index.
+        '''
+        file = open(path, 'rb')
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be memory-mapped.
+            file.close()
+            raise ValueError('Not a kanaconv n-gram index: {}'.format(path))
+
+        try:
+            index = cls._from_data(data, path, conv)
+        except ValueError:
+            data.close()
+            file.close()
+            raise
+
+        index._path = path
+        index._file = file
+
+        return index
+
+    @classmethod
+    def _from_data(cls, data, path, conv=None):
+        '''
+        Returns an index for the memory-mapped data of an index file.
+        Only the offsets are read; the n-grams, entries and posting lists
+        are read when they're needed.
+        '''
+        if len(data) < INDEX_HEADER.size:
+            raise ValueError('Not a kanaconv n-gram index: {}'.format(path))
+        magic, version, n, entry_count, gram_count, posting_count = \
+            INDEX_HEADER.unpack(data[:INDEX_HEADER.size])
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError('Not a kanaconv n-gram index: {}'.format(path))
+
+        size = array(UINT32).itemsize
+
+        def read_offsets(start, count):
+            end = start + count * size
+            if end > len(data):
+                raise ValueError(
+                    'Truncated kanaconv n-gram index: {}'.format(path)
+                )
+            return array_from_bytes(data[start:end])
+
+        position = INDEX_HEADER.size
+        entry_offsets = read_offsets(position, entry_count + 1)
+        position += (entry_count + 1) * size
+        entry_start = position
+        position += entry_offsets[-1]
+
+        gram_offsets = read_offsets(position, gram_count + 1)
+        position += (gram_count + 1) * size
+        gram_start = position
+        position += gram_offsets[-1]
+
+        posting_offsets = read_offsets(position, gram_count + 1)
+        position += (gram_count + 1) * size
+        if posting_offsets[-1] != posting_count or \
+           position + posting_count * size != len(data):
+            raise ValueError(
+                'Truncated kanaconv n-gram index: {}'.format(path)
+            )
+
+        index = cls(n, conv)
+        index._mmap = data
+        index._base_count = entry_count
+        index._base_entries = (entry_offsets, entry_start)
+        index._base_grams = _GramTable(
+            data, gram_offsets, gram_start, posting_offsets, position
+        )
+
+        return index
+
+    def close(self):
+        '''
+        Closes the file of a loaded index. Its entries can't be used anymore
+        afterwards.
+        '''
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+            self._file = None
@@ -0,0 +1,479 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Keys for searching and deduplicating transliterated text.
+
+canonical_romaji() turns the many ways of writing the same rōmaji into a
+single search key. For example, 'toukyou', 'tokyo', 'tōkyō', 'tôkyô' and
+'tohkyoh' all become 'tokyo'. The rules are derived from the converter's
+own long vowel combinations, so keys made from to_romaji() output always
+agree with keys made from user input.
+
+phonetic_key() makes a lossy key directly from kana, for deduplicating
+strings that sound the same but are spelled differently (e.g. ヴァイオリン
+and バイオリン, or ゆうこ and ユーコ). The folding rules are configurable.
+
+same_romaji() checks whether two kana strings have exactly the same
+rōmaji, without converting both strings in full when they differ early.
+'''
+import re
+import sys
+from .charsets import (
+    romaji, katakana, hiragana, lvmarker, macron_vowels, circumflex_vowels
+)
+from .constants import (
+    FOLD_V, FOLD_DZ, FOLD_WI, FOLD_LONG_VOWELS, FOLD_GEMINATES, FOLD_ALL
+)
+from .converter import (
+    KanaConv, lv_combinations, n_apostrophe, kana_lt, di_b, geminates,
+    vowels_romaji
+)
+from .transform import normalize, to_katakana
+from .utils import merge_dicts
+
+# Set the correct code point function based on whether we're on Python 2 or 3.
+if sys.version_info < (3, 0):
+    chr = unichr
+
+
+def _long_vowel_regex():
+    '''
+    Returns a regex that matches a vowel followed by any number of vowels
+    it forms a long vowel with (e.g. 'oou'), a passport style 'oh' before
+    a consonant, or an apostrophe after an 'n'.
+    '''
+    followers = {}
+    for first, second in sorted(lv_combinations):
+        followers.setdefault(first, []).append(second)
+
+    alternatives = [
+        u'{}[{}]+'.format(first, u''.join(chars))
+        for first, chars in sorted(followers.items())
+    ]
+    # 'oh' is only a long vowel if it's not followed by a vowel (e.g. ohashi).
+    alternatives.append(u'oh(?![aiueoy])')
+    alternatives.append(u'n[{}](?=[{}])'.format(
+        re.escape(romaji['apostrophe_char'] + u'’'),
+        u''.join(sorted(n_apostrophe))
+    ))
+
+    return re.compile(u'|'.join(alternatives))
+
+
+# Translation table that writes long vowels as two vowels, so they're
+# handled by the same rules as e.g. 'ou'. The ī becomes 'ii', which is not
+# a long vowel combination; this matches to_romaji(), which writes いい as 'ii'.
+doubled_vowels = {}
+for style_vowels in (macron_vowels, circumflex_vowels):
+    for long_vowel, vowel in zip(style_vowels, u'aiueo'):
+        doubled_vowels[ord(long_vowel)] = vowel * 2
+
+# Regex that matches all long vowel and apostrophe variants. In every case,
+# the match is replaced with its first character.
+long_vowel_variants = _long_vowel_regex()
+
+
+def _first_char(match):
+    '''
+    Returns the first character of a regex match.
+    '''
+    return match.group()[0]
+
+
+def canonical_romaji(input):
+    '''
+    Returns a canonical search key for a rōmaji string. The key is
+    lowercase, long vowels are shortened regardless of how they're written
+    (ō, ô, oo, ou, oh) and the apostrophe after an 'n' is removed.
+    '''
+    input = input.lower().translate(doubled_vowels)
+
+    return long_vowel_variants.sub(_first_char, input)
+
+
+def canonical_romaji_many(inputs):
+    '''
+    Yields the result of canonical_romaji() for every string in an iterable.
+    '''
+    for input in inputs:
+        yield canonical_romaji(input)
+
+
+# The kana that are considered the same for every folding rule, along with
+# a letter that's put in front of the key of the kana it's folded into if
+# the rule isn't used (e.g. ヂ is 'Dji', to keep it apart from ジ). Like the
+# moraic nasal and geminate marker below, the letters are uppercase, so they
+# can't be confused with a mora (e.g. ヲ is 'Wo' and ウォ is 'wo').
+fold_rules = [
+    (FOLD_V, u'V', {
+        u'ヴ': u'ブ', u'ヷ': u'バ', u'ヸ': u'ビ', u'ヹ': u'ベ', u'ヺ': u'ボ',
+        u'ゔ': u'ぶ'
+    }),
+    (FOLD_DZ, u'D', {
+        u'ヂ': u'ジ', u'ヅ': u'ズ', u'ぢ': u'じ', u'づ': u'ず'
+    }),
+    (FOLD_WI, u'W', {
+        u'ヰ': u'イ', u'ヱ': u'エ', u'ヲ': u'オ', u'ゐ': u'い', u'ゑ': u'え',
+        u'を': u'お'
+    })
+]
+
+# The keys of the moraic nasal and the geminate marker. These are the
+# usual phonological symbols, and they're uppercase so that e.g. きんえん
+# (kiNeN) is different from きねん (kineN).
+MORAIC_NASAL = u'N'
+GEMINATE = u'Q'
+moraic_nasals = {u'ン', u'ん'}
+
+
+def _phonetic_units():
+    '''
+    Returns the kana that are given a phonetic key: a list of all
+    single characters, and a list of the combinations of two characters
+    that are pronounced as one mora (e.g. キャ and ティ).
+    '''
+    singles = list(kana_lt) + list(di_b)
+    combinations = []
+    for charset in (katakana, hiragana):
+        for char_a in charset['set_digraphs_a']:
+            for char_b in charset['set_digraphs_b']:
+                combinations.append(char_a + char_b)
+        for char_a in charset['set_cvs'] + charset['set_vowels']:
+            for char_b in charset['set_xvowels']:
+                combinations.append(char_a + char_b)
+
+    return singles, combinations
+
+
+def _phonetic_lookup(folds):
+    '''
+    Returns a dict of the phonetic key for every unit of kana, using
+    the given folding rules. The keys are made by the converter itself,
+    so they follow the same transliteration rules as to_romaji().
+    '''
+    conv = KanaConv()
+    singles, combinations = _phonetic_units()
+    small = merge_dicts(katakana['small'], hiragana['small'])
+
+    def romanize(kana):
+        return conv.to_romaji(small.get(kana, kana)).translate(doubled_vowels)
+
+    lookup = {}
+    for kana in singles + combinations:
+        if kana[0] in moraic_nasals:
+            continue
+        key = romanize(kana)
+        for flag, letter, fold_table in fold_rules:
+            folded = u''.join(fold_table.get(char, char) for char in kana)
+            if folded == kana:
+                continue
+            key = romanize(folded)
+            if not folds & flag:
+                key = letter + key
+        lookup[kana] = key
+
+    # Combinations are only needed if they're not pronounced the same
+    # as their two characters separately (e.g. カァ is the same as カア).
+    for kana in combinations:
+        if kana not in lookup:
+            continue
+        if lookup[kana] == lookup[kana[0]] + lookup[kana[1]]:
+            del lookup[kana]
+
+    for char in moraic_nasals:
+        lookup[char] = MORAIC_NASAL
+    for char in geminates:
+        lookup[char] = u'' if folds & FOLD_GEMINATES else GEMINATE
+    lookup[lvmarker] = u'' if folds & FOLD_LONG_VOWELS else u'-'
+
+    return lookup
+
+
+def _long_vowel_tail_regex():
+    '''
+    Returns a regex that matches the vowels that extend the preceding
+    vowel (e.g. the 'u' in 'kou'), so they can be removed. Aside from
+    the converter's long vowel combinations, 'ii' is matched too.
+    '''
+    followers = {}
+    for first, second in sorted(lv_combinations | {('i', 'i')}):
+        followers.setdefault(first, []).append(second)
+
+    # Vowels that are only extended by themselves can share one alternative.
+    repeated = [
+        first for first, chars in followers.items() if chars == [first]
+    ]
+    alternatives = [u'(?<=([{}]))\\1+'.format(u''.join(sorted(repeated)))]
+    alternatives.extend(
+        u'(?<={})[{}]+'.format(first, u''.join(chars))
+        for first, chars in sorted(followers.items())
+        if first not in repeated
+    )
+
+    return re.compile(u'|'.join(alternatives))
+
+
+def _phonetic_tables(folds):
+    '''
+    Returns the regex that matches the kana combinations, the lookup table
+    of their keys, the translation table for the single characters, the
+    regex that shortens long vowels (or None if they're not folded), and
+    the regex that matches a run of kana.
+    '''
+    lookup = _phonetic_lookup(folds)
+    combinations = [kana for kana in lookup if len(kana) > 1]
+    single_table = {
+        ord(kana): key for kana, key in lookup.items() if len(kana) == 1
+    }
+
+    # The first characters of the combinations are regular size kana,
+    # and the second ones are small kana, so the matches can't overlap.
+    # Combinations that aren't in the lookup table are left as they are.
+    combination_regex = re.compile(u'[{}][{}]'.format(
+        u''.join(sorted({kana[0] for kana in combinations})),
+        u''.join(sorted({kana[1] for kana in combinations}))
+    ))
+
+    long_vowel_regex = None
+    if folds & FOLD_LONG_VOWELS:
+        long_vowel_regex = _long_vowel_tail_regex()
+
+    # Long vowels are only shortened in the keys of the kana, so e.g.
+    # rōmaji in the input is kept as it is.
+    kana_regex = re.compile(u'[{}]+'.format(
+        u''.join(re.escape(kana) for kana in sorted(set(u''.join(lookup))))
+    ))
+
+    return (
+        combination_regex, lookup, single_table, long_vowel_regex, kana_regex
+    )
+
+
+# Cache of the tables for every combination of folding rules.
+_phonetic_cache = {}
+
+
+def _get_phonetic_tables(folds):
+    '''
+    Returns the (cached) tables for a combination of folding rules.
+    '''
+    tables = _phonetic_cache.get(folds)
+    if tables is None:
+        tables = _phonetic_cache[folds] = _phonetic_tables(folds)
+
+    return tables
+
+
+def _phonetic_key(input, tables):
+    '''
+    Returns the phonetic key for a string using the given tables.
+    '''
+    combination_regex, lookup, single_table, long_vowel_regex, kana_regex = \
+        tables
+
+    def kana_key(kana):
+        return combination_regex.sub(
+            lambda match: lookup.get(match.group(), match.group()), kana
+        ).translate(single_table)
+
+    if long_vowel_regex is None:
+        return kana_key(normalize(input))
+
+    return kana_regex.sub(
+        lambda match: long_vowel_regex.sub(u'', kana_key(match.group())),
+        normalize(input)
+    )
+
+
+def phonetic_key(input, folds=FOLD_ALL):
+    '''
+    Returns a lossy phonetic key for a kana string, for deduplicating
+    strings that are pronounced (nearly) the same. Hiragana and katakana
+    are always equivalent, and the folds argument is a bitmask of the
+    other rules: FOLD_V, FOLD_DZ, FOLD_WI, FOLD_LONG_VOWELS and
+    FOLD_GEMINATES (see constants.py). By default, all rules are used.
+
+    The kana become ASCII, e.g. ヴァイオリン becomes 'baioriN'. Characters
+    that aren't kana are kept as-is.
+    '''
+    return _phonetic_key(input, _get_phonetic_tables(folds))
+
+
+def phonetic_key_many(inputs, folds=FOLD_ALL):
+    '''
+    Yields the result of phonetic_key() for every string in an iterable.
+    '''
+    tables = _get_phonetic_tables(folds)
+    for input in inputs:
+        yield _phonetic_key(input, tables)
+
+
+# Two converters for comparing the output of two strings side by side.
+_lockstep_convs = (KanaConv(), KanaConv())
+
+
+def same_romaji(a, b):
+    '''
+    Returns whether two kana strings have the same rōmaji, e.g. True for
+    ヂ and ジ, or for おう and オー. This gives the same result as comparing
+    the output of to_romaji() (with the default settings), but both strings
+    are converted side by side, and the comparison stops at the first
+    difference in the output.
+    '''
+    if a == b:
+        return True
+
+    fragments = (
+        _lockstep_convs[0]._iter_fragments(a),
+        _lockstep_convs[1]._iter_fragments(b)
+    )
+
+    # The output of one side that the other side hasn't caught up with.
+    pending = u''
+    ahead = 0
+    while True:
+        # Continue with the side that's behind.
+        behind = 1 - ahead if pending else 0
+        fragment = next(fragments[behind], None)
+        if fragment is None:
+            # One side is done; the other must have no output left.
+            if pending:
+                return False
+            return not any(fragments[1 - behind])
+
+        size = min(len(fragment), len(pending))
+        if fragment[:size] != pending[:size]:
+            return False
+        if len(fragment) > len(pending):
+            pending = fragment[size:]
+            ahead = behind
+        else:
+            pending = pending[size:]
+
+
+# The kana in dictionary (gojūon) order, which determines the primary weight.
+# Kana with a (han)dakuten and small kana have the weight of their plain
+# regular size version.
+gojuon = (
+    u'アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホ'
+    u'マミムメモヤユヨラリルレロワヰヱヲン'
+)
+
+# The secondary weights: plain kana come before kana with a dakuten,
+# which come before kana with a handakuten.
+PLAIN_WEIGHT = chr(1)
+DAKUTEN_WEIGHT = chr(2)
+HANDAKUTEN_WEIGHT = chr(3)
+
+# The tertiary weights: regular size kana come before small kana, which
+# come before the long vowel marker.
+LARGE_WEIGHT = chr(1)
+SMALL_WEIGHT = chr(2)
+LVMARKER_WEIGHT = chr(3)
+
+# Separator between the levels of a sort key.
+LEVEL_SEPARATOR = chr(0)
+
+# The first primary weight. Since all kana are translated, the hiragana
+# block itself is free to be used for the weights. Other characters keep
+# their code point, so e.g. rōmaji sorts before kana, and kanji after it.
+PRIMARY_WEIGHT_START = 0x3041
+
+
+def _sort_tables():
+    '''
+    Returns the translation tables for the three levels of the sort key,
+    and a dict of the primary weight of the vowel every kana ends in
+    (or the weight of the kana itself for ン), which is used to resolve
+    the long vowel marker.
+    '''
+    conv = KanaConv()
+    primary_weights = {
+        kana: chr(PRIMARY_WEIGHT_START + n) for n, kana in enumerate(gojuon)
+    }
+    vowel_weights = dict(zip(
+        [info[0] for info in vowels_romaji],
+        [primary_weights[kana] for kana in katakana['set_vowels']]
+    ))
+
+    # The inverse of the (han)dakuten and small kana tables.
+    dakuten = {}
+    for table in ('dakutenize', 'dakutenize_rare'):
+        dakuten.update({b: a for a, b in katakana[table].items()})
+    handakuten = {b: a for a, b in katakana['handakutenize'].items()}
+    small = katakana['small']
+
+    primary = {}
+    secondary = {}
+    tertiary = {}
+    vowel_of = {}
+    for char in list(kana_lt) + list(di_b) + list(geminates):
+        kana = to_katakana(char)
+        tertiary[ord(char)] = SMALL_WEIGHT if kana in small else LARGE_WEIGHT
+        kana = small.get(kana, kana)
+        if kana in dakuten:
+            secondary[ord(char)] = DAKUTEN_WEIGHT
+            kana = dakuten[kana]
+        elif kana in handakuten:
+            secondary[ord(char)] = HANDAKUTEN_WEIGHT
+            kana = handakuten[kana]
+        else:
+            secondary[ord(char)] = PLAIN_WEIGHT
+
+        weight = primary[ord(char)] = primary_weights[kana]
+        vowel_of[weight] = vowel_weights.get(conv.to_romaji(kana)[-1], weight)
+
+    secondary[ord(lvmarker)] = PLAIN_WEIGHT
+    tertiary[ord(lvmarker)] = LVMARKER_WEIGHT
+
+    return primary, secondary, tertiary, vowel_of
+
+
+primary_table, secondary_table, tertiary_table, vowel_weight = _sort_tables()
+
+
+def _resolve_lvmarkers(primary):
+    '''
+    Replaces every long vowel marker in a primary key with the weight
+    of the vowel it extends. Markers that don't follow a kana are kept.
+    '''
+    primary = list(primary)
+    for n in range(1, len(primary)):
+        if primary[n] == lvmarker:
+            primary[n] = vowel_weight.get(primary[n - 1], lvmarker)
+
+    return u''.join(primary)
+
+
+def sort_key(input):
+    '''
+    Returns a bytes key that sorts kana strings in dictionary (gojūon)
+    order, e.g. for use with sorted(). The kana are compared by their
+    base character first; for equal base characters, plain kana come
+    before kana with a dakuten and handakuten (は, ば, ぱ), then regular
+    size kana before small kana and the long vowel marker (や, ゃ).
+    The long vowel marker counts as the vowel it extends, and hiragana
+    and katakana are equivalent.
+
+    Characters that aren't kana are compared by their code point.
+    '''
+    input = normalize(input)
+    primary = input.translate(primary_table)
+    if lvmarker in primary:
+        primary = _resolve_lvmarkers(primary)
+
+    return LEVEL_SEPARATOR.join([
+        primary,
+        input.translate(secondary_table),
+        input.translate(tertiary_table)
+    ]).encode('utf-8')
+
+
+def sort_key_many(inputs):
+    '''
+    Yields the result of sort_key() for every string in an iterable.
+    '''
+    for input in inputs:
+        yield sort_key(input)
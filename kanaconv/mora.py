@@ -0,0 +1,260 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Mora-level tools for kana strings.
+
+Kana strings are compared by mora rather than by character: キャ, ティ
+and ゔぁ are each a single mora, even though they're written with two
+characters. The mora inventory is generated from the same tables as the
+converter, and a combination of two kana is only counted as one mora if
+the converter transliterates it as one syllable (e.g. ティ is 'ti', but
+カァ is 'kā', which is two morae like カア).
+
+Every mora has a numeric code. Internally, a string of morae is kept as a
+string of code characters from the Private Use Area, so that tokenizing
+is a regex substitution and a translate() call, and comparing morae is
+comparing characters. Hiragana and katakana have the same codes.
+
+encode_mora() stores these codes in an array of 16-bit integers, which
+takes a fraction of the memory of a string. Characters that aren't kana
+keep their code point (characters outside the BMP take two items), so
+the input must not contain characters from the Private Use Area.
+The codes can be turned back into kana with decode_mora(), or into
+rōmaji with render_romaji(), which runs the decoded kana through the
+converter so that the result is always the same as to_romaji().
+'''
+import re
+import sys
+from array import array
+from .charsets import katakana, lvmarker
+from .constants import HIRAGANA, KATAKANA
+from .converter import KanaConv, PYTHON_2
+from .transform import normalize, to_hiragana, to_katakana
+
+# Set the correct code point function based on whether we're on Python 2 or 3.
+if sys.version_info < (3, 0):
+    chr = unichr
+
+# The code of the first mora. Codes are assigned in the order of the
+# mora inventory, starting at the beginning of the Private Use Area.
+MORA_CODE_START = 0xE000
+
+# Matches rōmaji that consists of a single syllable with a short vowel.
+syllable = re.compile(u'[^aiueo]+[aiueo]$')
+
+# The encoding that matches the memory layout of an array of 16-bit codes.
+UTF16 = 'utf-16-le' if sys.byteorder == 'little' else 'utf-16-be'
+
+
+def _mora_inventory():
+    '''
+    Returns a list of all morae, in hiragana. The list starts with the
+    single characters, followed by the combinations of two characters
+    that the converter transliterates as a single syllable that's
+    different from the first character alone (e.g. キャ and デュ).
+    '''
+    conv = KanaConv()
+    small = katakana['small']
+
+    singles = []
+    for char in (
+        katakana['set_vowels'] + katakana['set_cvs'] +
+        katakana['set_xvowels'] + katakana['set_digraphs_b'] +
+        [katakana['geminate'], lvmarker]
+    ):
+        unit = to_hiragana(char)
+        if unit not in singles:
+            singles.append(unit)
+
+    candidates = []
+    for char_a in katakana['set_cvs'] + katakana['set_vowels']:
+        if char_a == u'ン' or char_a in small or \
+           len(to_hiragana(char_a)) > 1:
+            continue
+        for char_b in katakana['set_digraphs_b'] + katakana['set_xvowels']:
+            candidates.append(char_a + char_b)
+
+    # The rare characters that have no hiragana equivalent are written
+    # with two hiragana (e.g. ヷ becomes ゔぁ), so they're combinations too.
+    combinations = [unit for unit in singles if len(unit) > 1]
+    singles = [unit for unit in singles if len(unit) == 1]
+    for candidate in candidates:
+        unit = to_hiragana(candidate)
+        if unit in combinations:
+            continue
+        ro = conv.to_romaji(unit)
+        if syllable.match(ro) is None or ro == conv.to_romaji(unit[0]):
+            continue
+        combinations.append(unit)
+
+    return singles + combinations
+
+
+# All morae and their code characters.
+morae = _mora_inventory()
+mora_chars = {
+    unit: chr(MORA_CODE_START + n) for n, unit in enumerate(morae)
+}
+
+# Translation table for the single character morae.
+mora_table = {
+    ord(unit): code for unit, code in mora_chars.items() if len(unit) == 1
+}
+
+# Regex that matches the two character morae. The first characters are
+# regular size kana and the second ones are small kana, so the matches
+# can't overlap; pairs that aren't a mora are left as they are.
+mora_combinations = re.compile(u'[{}][{}]'.format(
+    u''.join(sorted({unit[0] for unit in morae if len(unit) > 1})),
+    u''.join(sorted({unit[1] for unit in morae if len(unit) > 1}))
+))
+
+
+def _mora_code(match):
+    '''
+    Returns the code character for a two character regex match,
+    or the match itself if it isn't a mora.
+    '''
+    unit = match.group()
+    return mora_chars.get(unit, unit)
+
+
+def _mora_string(input):
+    '''
+    Returns a string of mora code characters for a kana string.
+    Characters that aren't part of a mora are kept as-is.
+    '''
+    input = to_hiragana(normalize(input))
+
+    return mora_combinations.sub(_mora_code, input).translate(mora_table)
+
+
+def _edit_distance(a, b, max_distance):
+    '''
+    Returns the Levenshtein distance between two sequences. Only the cells
+    within max_distance of the diagonal are calculated, and max_distance + 1
+    is returned as soon as it's certain that the distance is greater.
+    '''
+    if len(a) > len(b):
+        a, b = b, a
+    len_a = len(a)
+    len_b = len(b)
+    if len_b - len_a > max_distance:
+        return max_distance + 1
+
+    # The rows are indexed by the position in b; cells outside the band
+    # are treated as being over the maximum.
+    over = max_distance + 1
+    previous = [n if n <= max_distance else over for n in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        char_a = a[i - 1]
+        start = max(1, i - max_distance)
+        end = min(len_b, i + max_distance)
+        current = [over] * (len_b + 1)
+        current[0] = i if i <= max_distance else over
+        lowest = current[0] if start == 1 else over
+        for j in range(start, end + 1):
+            cost = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if cost > over:
+                cost = over
+            current[j] = cost
+            if cost < lowest:
+                lowest = cost
+        if lowest > max_distance:
+            return over
+        previous = current
+
+    return previous[len_b]
+
+
+def mora_distance(a, b, max_distance=None):
+    '''
+    Returns the edit distance between two kana strings, counted in morae,
+    e.g. 1 for きゃく and きょく. Hiragana and katakana are equivalent.
+
+    If max_distance is set, the calculation stops as soon as the distance
+    is known to be greater, and max_distance + 1 is returned instead.
+    Arrays made by encode_mora() can be passed instead of strings.
+    '''
+    a = _codes_to_string(a) if isinstance(a, array) else _mora_string(a)
+    b = _codes_to_string(b) if isinstance(b, array) else _mora_string(b)
+    if max_distance is None:
+        max_distance = max(len(a), len(b))
+
+    return _edit_distance(a, b, max_distance)
+
+
+# Translation table from the code characters back to the morae.
+mora_decode_table = {ord(code): unit for unit, code in mora_chars.items()}
+
+# Shared converter for render_romaji().
+_conv = KanaConv()
+
+
+def _codes_to_string(codes):
+    '''
+    Returns the string of code characters stored in an array of codes.
+    '''
+    if not isinstance(codes, array):
+        codes = array('H', codes)
+
+    if PYTHON_2:
+        return codes.tostring().decode(UTF16)
+
+    return codes.tobytes().decode(UTF16)
+
+
+def encode_mora(input):
+    '''
+    Returns an array of 16-bit mora codes for a kana string. Hiragana and
+    katakana have the same codes. Other characters keep their code point.
+    '''
+    codes = array('H')
+    data = _mora_string(input).encode(UTF16)
+    if PYTHON_2:
+        codes.fromstring(data)
+    else:
+        codes.frombytes(data)
+
+    return codes
+
+
+def decode_mora(codes, script=HIRAGANA):
+    '''
+    Returns the kana for an array (or other iterable) of mora codes, in the
+    given script (HIRAGANA or KATAKANA). The result is normalized: e.g.
+    repeaters are expanded, and ヷ becomes ゔぁ.
+    '''
+    output = _codes_to_string(codes).translate(mora_decode_table)
+    if script == KATAKANA:
+        return to_katakana(output)
+
+    return output
+
+
+def render_romaji(codes, vowel_style=None, conv=None):
+    '''
+    Returns the rōmaji for an array (or other iterable) of mora codes.
+    The codes are decoded and converted with to_romaji(), so the result
+    is the same as that of converting the original kana. A converter can
+    be passed to use its settings (e.g. its system, or uppercase output);
+    the vowel style, if given, is only used for this conversion.
+    '''
+    if conv is None:
+        conv = _conv
+    kana = decode_mora(codes)
+    if vowel_style is None or vowel_style == conv.vowel_style:
+        return conv.to_romaji(kana)
+
+    tables = conv.tables
+    conv.set_vowel_style(vowel_style)
+    try:
+        return conv.to_romaji(kana)
+    finally:
+        conv._set_tables(tables)
@@ -0,0 +1,192 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Exact-match override dictionary for the converter.
+
+Some strings shouldn't be transliterated by the rules, e.g. loanwords
+(パーティー as 'party') and proper nouns with capitals. An override
+dictionary maps kana strings to their preferred rōmaji, and is used by
+KanaConv.set_overrides() for whole inputs and whole words.
+
+A large dictionary is built once into a file with build_overrides(), and
+OverrideDict reads it through a memory map. Nothing is loaded into memory
+up front, so opening it is instant, and processes that use the same file
+share its pages.
+
+The file is a hash table with open addressing (linear probing) over
+CRC-32 hashes of the UTF-8 keys. Every slot holds the full hash and the
+offset of its entry; an entry is the length of the key and the value,
+followed by both strings in UTF-8. All numbers are unsigned little-endian
+integers.
+'''
+import io
+import mmap
+import struct
+from zlib import crc32
+
+# The file format identifier and version.
+OVERRIDES_MAGIC = b'KCOV'
+OVERRIDES_VERSION = 1
+
+# The file header: magic, version, the number of slots and of entries.
+OVERRIDES_HEADER = struct.Struct('<4sBxxxII')
+
+# A slot: the hash of the key, and the offset of the entry plus one
+# (zero marks an empty slot). An entry starts with the key and value sizes.
+SLOT = struct.Struct('<II')
+ENTRY = struct.Struct('<II')
+
+
+def _hash(key):
+    '''
+    Returns the hash of a UTF-8 encoded key.
+    '''
+    return crc32(key) & 0xFFFFFFFF
+
+
+def _slot_count(entry_count):
+    '''
+    Returns the number of slots for a table: a power of two that keeps
+    the table at most half full.
+    '''
+    count = 1
+    while count < entry_count * 2:
+        count *= 2
+
+    return count
+
+
+def build_overrides(entries, path):
+    '''
+    Builds an override dictionary file from an iterable of (kana, rōmaji)
+    tuples. If a kana string occurs more than once, the last one is used.
+    Returns the number of entries.
+    '''
+    items = {}
+    for key, value in entries:
+        items[key.encode('utf-8')] = value.encode('utf-8')
+
+    slot_count = _slot_count(len(items))
+    mask = slot_count - 1
+    slots = [(0, 0)] * slot_count
+    data = []
+    offset = OVERRIDES_HEADER.size + slot_count * SLOT.size
+    for key in sorted(items):
+        value = items[key]
+        key_hash = _hash(key)
+        n = key_hash & mask
+        while slots[n][1] != 0:
+            n = (n + 1) & mask
+        slots[n] = (key_hash, offset + 1)
+
+        entry = ENTRY.pack(len(key), len(value)) + key + value
+        data.append(entry)
+        offset += len(entry)
+
+    with io.open(path, 'wb') as file:
+        file.write(OVERRIDES_HEADER.pack(
+            OVERRIDES_MAGIC, OVERRIDES_VERSION, slot_count, len(items)
+        ))
+        file.write(b''.join(SLOT.pack(*slot) for slot in slots))
+        file.write(b''.join(data))
+
+    return len(items)
+
+
+class OverrideDict(object):
+    '''
+    Read-only override dictionary backed by a memory-mapped file made by
+    build_overrides(). It can be passed to KanaConv.set_overrides(), and
+    used like a dict for lookups.
+    '''
+    def __init__(self, path):
+        '''
+        Opens the file. It remains open until close() is called.
+        Raises ValueError if the file isn't an override dictionary.
+        '''
+        self._file = io.open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except ValueError:
+            # Empty files can't be memory-mapped.
+            self._file.close()
+            raise ValueError(
+                'Not a kanaconv override dictionary: {}'.format(path)
+            )
+
+        # The slot count is a power of two, and the file must be large
+        # enough for all of its slots.
+        size = len(self._mmap)
+        valid = size >= OVERRIDES_HEADER.size
+        if valid:
+            magic, version, self._slot_count, self._entry_count = \
+                OVERRIDES_HEADER.unpack_from(self._mmap, 0)
+            valid = magic == OVERRIDES_MAGIC and \
+                version == OVERRIDES_VERSION and self._slot_count > 0 and \
+                self._slot_count & (self._slot_count - 1) == 0 and \
+                size >= OVERRIDES_HEADER.size + self._slot_count * SLOT.size
+        if not valid:
+            self.close()
+            raise ValueError(
+                'Not a kanaconv override dictionary: {}'.format(path)
+            )
+        self._mask = self._slot_count - 1
+
+    def __len__(self):
+        '''
+        Returns the number of entries.
+        '''
+        return self._entry_count
+
+    def get(self, key, default=None):
+        '''
+        Returns the rōmaji of a kana string, or the default if it's not
+        in the dictionary.
+        '''
+        data = self._mmap
+        key = key.encode('utf-8')
+        key_hash = _hash(key)
+        n = key_hash & self._mask
+        while True:
+            slot_hash, offset = SLOT.unpack_from(
+                data, OVERRIDES_HEADER.size + n * SLOT.size
+            )
+            if offset == 0:
+                return default
+            if slot_hash == key_hash:
+                key_size, value_size = ENTRY.unpack_from(data, offset - 1)
+                start = offset - 1 + ENTRY.size
+                if data[start:start + key_size] == key:
+                    start += key_size
+                    return data[start:start + value_size].decode('utf-8')
+            n = (n + 1) & self._mask
+
+    def __getitem__(self, key):
+        '''
+        Returns the rōmaji of a kana string, or raises a KeyError.
+        '''
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+
+        return value
+
+    def __contains__(self, key):
+        '''
+        Returns whether a kana string is in the dictionary.
+        '''
+        return self.get(key) is not None
+
+    def close(self):
+        '''
+        Closes the file. The dictionary can't be used anymore afterwards.
+        '''
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+            self._file = None
@@ -0,0 +1,179 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Kanji reading dictionary for converting mixed kanji and kana text.
+
+The converter can't read kanji. A ReadingDictionary maps surface strings
+(e.g. 東京 or 行う) to their readings in kana, and replaces the surfaces
+in an input with their readings before it's converted. Surfaces are
+matched longest first, so 東京駅 is preferred over 東京 if both are in
+the dictionary. Kanji that aren't in the dictionary are left as they
+are, and are treated according to the converter's unknown character
+strategy.
+
+Every replaced surface is a separate word, so e.g. with an entry that
+reads 食 as く, 食う becomes 'kuu' rather than 'kū'. A reading can contain
+word borders of its own, e.g. こ|うま for 子馬, and a surface never matches
+across a word border in the input.
+
+The surfaces are stored in an ArrayTrie (see trie.py), and the dictionary
+can be compiled once from a tab-separated file and saved to a file that
+loads without rebuilding.
+'''
+from bisect import bisect_left, bisect_right
+from .converter import WORD_BORDER
+from .trie import ArrayTrie, write_sections, read_sections
+from .utils import array_from_bytes, encode_strings, read_tsv
+
+
+class ReadingDictionary(object):
+    '''
+    Dictionary of surface strings and their kana readings. After
+    initialization, use replace() to replace the surfaces in a string,
+    or pass the dictionary to KanaConv.set_reading_dictionary().
+    '''
+    def __init__(self, entries=()):
+        '''
+        Builds the dictionary from an iterable of (surface, reading)
+        tuples. If a surface occurs more than once, the last one is used.
+        '''
+        readings = {}
+        for surface, reading in entries:
+            if surface:
+                readings[surface] = reading
+
+        surfaces = sorted(readings)
+        self.trie = ArrayTrie(
+            (surface, n) for n, surface in enumerate(surfaces)
+        )
+        self.reading_offsets, self.reading_data = encode_strings(
+            [readings[surface] for surface in surfaces]
+        )
+        self._first_char_search = self.trie.first_char_search()
+
+    @classmethod
+    def from_tsv(cls, path):
+        '''
+        Builds the dictionary from a tab-separated file with a surface
+        and its reading on every line.
+        '''
+        return cls(read_tsv(path))
+
+    def __len__(self):
+        '''
+        Returns the number of surfaces in the dictionary.
+        '''
+        return len(self.reading_offsets) - 1
+
+    def _reading(self, reading_id):
+        '''
+        Returns the reading with the given id.
+        '''
+        return self.reading_data[
+            self.reading_offsets[reading_id]:
+            self.reading_offsets[reading_id + 1]
+        ].decode('utf-8')
+
+    def get(self, surface, default=None):
+        '''
+        Returns the reading of a surface, or the default if it's not
+        in the dictionary.
+        '''
+        reading_id = self.trie.get(surface)
+        if reading_id is None:
+            return default
+
+        return self._reading(reading_id)
+
+    def replace(self, input, boundaries=()):
+        '''
+        Replaces the surfaces in a string with their readings. Returns the
+        new string, and a sorted list of word boundary offsets in it: the
+        start and end of every reading and the borders marked in it, plus
+        the given boundary offsets, moved along with the text around them.
+        A surface never matches across a given boundary.
+        '''
+        boundaries = sorted(set(boundaries))
+        if self._first_char_search is None:
+            return input, boundaries
+
+        output = []
+        offsets = []
+        # The start of every replaced surface in the input, and the
+        # change in length after it.
+        starts = []
+        shifts = []
+
+        copied = 0
+        shift = 0
+        position = 0
+        search = self._first_char_search
+        longest_match = self.trie.longest_match
+        while True:
+            match = search(input, position)
+            if match is None:
+                break
+            start = match.start()
+            n = bisect_right(boundaries, start)
+            found = longest_match(
+                input, start, boundaries[n] if n < len(boundaries) else None
+            )
+            if found is None:
+                position = start + 1
+                continue
+
+            end, reading_id = found
+            reading = self._reading(reading_id)
+            output.append(input[copied:start])
+            offsets.append(start + shift)
+            if WORD_BORDER in reading:
+                parts = reading.split(WORD_BORDER)
+                for part in parts[:-1]:
+                    offsets.append(offsets[-1] + len(part))
+                reading = u''.join(parts)
+            output.append(reading)
+            shift += len(reading) - (end - start)
+            offsets.append(end + shift)
+            starts.append(start)
+            shifts.append(shift)
+            copied = position = end
+
+        if not output:
+            return input, boundaries
+        output.append(input[copied:])
+
+        # Surfaces don't contain boundaries, so every boundary moves by
+        # the change in length of the surfaces before it.
+        for offset in boundaries:
+            n = bisect_left(starts, offset)
+            offsets.append(offset + shifts[n - 1] if n else offset)
+
+        return u''.join(output), sorted(set(offsets))
+
+    def save(self, path):
+        '''
+        Saves the dictionary to a file, which can be loaded with load().
+        '''
+        with open(path, 'wb') as file:
+            write_sections(file, b'KCRD', self.trie.sections() + [
+                self.reading_offsets, self.reading_data
+            ])
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Loads a dictionary from a file made by save(), without rebuilding it.
+        '''
+        with open(path, 'rb') as file:
+            sections = read_sections(file.read(), b'KCRD')
+
+        dictionary = cls()
+        dictionary.trie = ArrayTrie.from_sections(sections[:3])
+        dictionary.reading_offsets = array_from_bytes(sections[3])
+        dictionary.reading_data = sections[4]
+        dictionary._first_char_search = \
+            dictionary.trie.first_char_search()
+
+        return dictionary
@@ -0,0 +1,392 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Converts rōmaji back to kana.
+
+The reverse lookup table is generated from the same rōmaji tables that
+are used by the converter: every kana character, digraph and combination
+with a small vowel is transliterated, and the result becomes a key in
+the reverse table. Only combinations that transliterate back to the same
+rōmaji are kept, so the reverse conversion agrees with to_romaji(); the
+only exceptions are a few spellings that are preferred by convention
+(e.g. 'ye' becomes イェ).
+
+Where multiple kana map to the same rōmaji (e.g. じ and ぢ are both 'ji'),
+to_kana() uses the most common one. kana_candidates() enumerates all of
+them, along with the different ways to write long vowels, which is useful
+for expanding search queries.
+'''
+from itertools import product
+from .charsets import (
+    hiragana, romaji, lvmarker, macron_vowels, circumflex_vowels
+)
+from .constants import HIRAGANA, KATAKANA
+from .converter import KanaConv, lv_combinations
+from .transform import to_hiragana, to_katakana
+
+# The characters that can be used as an apostrophe after an 'n'.
+apostrophes = {romaji['apostrophe_char'], u'’'}
+
+# The plain vowels, in the same order as the long vowel characters.
+plain_vowels = u'aiueo'
+
+# Spellings that to_kana() prefers for rōmaji the converter doesn't
+# produce. イェ is the usual spelling of 'ye' (イェス), even though the
+# converter turns it into 'ie'.
+preferred_spellings = {u'ye': u'いぇ'}
+
+
+def _kana_candidates():
+    '''
+    Returns two lists of (rōmaji, kana) tuples, ordered by preference:
+    the regular kana characters and digraphs, and the combinations with
+    a small vowel that are used for sounds the regular kana can't
+    express (e.g. ティ).
+    '''
+    vowels = list(zip(hiragana['set_vowels'], romaji['set_vowels']))
+    cvs = [
+        (to_hiragana(kana), ro)
+        for kana, ro in zip(hiragana['set_cvs'], romaji['set_cvs'])
+        if kana not in hiragana['small']
+    ]
+    xvowels = list(zip(hiragana['set_xvowels'], romaji['set_xvowels']))
+    di_a = zip(hiragana['set_digraphs_a'], romaji['set_digraphs_a'])
+    di_b = list(zip(hiragana['set_digraphs_b'], romaji['set_digraphs_b']))
+
+    regular = []
+
+    # The regular vowels and consonant-vowel pairs.
+    for kana, ro in vowels + cvs:
+        regular.append((ro[0], kana))
+
+    # Digraphs, e.g. きゃ.
+    for kana_a, ro_a in di_a:
+        for kana_b, ro_b in di_b:
+            regular.append((ro_a[0] + ro_b[0], kana_a + kana_b))
+
+    # Consonant-vowel pairs combined with a small vowel, e.g. ティ.
+    # When the same combination can be made with several characters,
+    # the u-row (ファ, ツァ) is preferred, then the i-row and e-row (シェ,
+    # ティ); the small 'u' is combined with the o-row (トゥ).
+    combinations = []
+    for kana, ro in cvs:
+        if ro[0] == 'n':
+            continue
+        for xv_kana, xv_ro in xvowels:
+            if ro[3] == xv_ro[0]:
+                continue
+            preference = 'ouiea' if xv_ro[0] == 'u' else 'uieoa'
+            combinations.append((
+                preference.index(ro[3]),
+                ro[2] + xv_ro[0],
+                kana + xv_kana
+            ))
+
+    # Vowels that become a consonant before a small vowel (ウィ).
+    for kana, ro in vowels:
+        if len(ro) < 3:
+            continue
+        for xv_kana, xv_ro in xvowels:
+            cons = ro[2]['xv'].get(xv_ro[0])
+            if cons is not None:
+                preference = 'ouiea' if xv_ro[0] == 'u' else 'uieoa'
+                combinations.append((
+                    preference.index(ro[0]),
+                    cons + xv_ro[0],
+                    kana + xv_kana
+                ))
+
+    combinations.sort(key=lambda item: item[0])
+
+    return regular, [(ro, kana) for _, ro, kana in combinations]
+
+
+def _reverse_lt():
+    '''
+    Returns the reverse lookup table: a dict of rōmaji strings, each with
+    a list of the kana that produce it, the preferred one first.
+
+    Combinations with a small vowel are only used for rōmaji that can't
+    be made with the regular kana, and only the preferred one is kept.
+    The preferred spellings are put first, whether or not they convert
+    back to the same rōmaji.
+    '''
+    conv = KanaConv()
+    regular, combinations = _kana_candidates()
+    lt = {}
+    for ro, kana in regular:
+        if conv.to_romaji(kana) != ro:
+            continue
+        spellings = lt.setdefault(ro, [])
+        if kana not in spellings:
+            spellings.append(kana)
+
+    for ro, kana in combinations:
+        if ro not in lt and conv.to_romaji(kana) == ro:
+            lt[ro] = [kana]
+
+    for ro, kana in preferred_spellings.items():
+        spellings = lt.setdefault(ro, [])
+        if kana in spellings:
+            spellings.remove(kana)
+        spellings.insert(0, kana)
+
+    return lt
+
+
+def _build_trie(lt):
+    '''
+    Builds a character trie from the reverse lookup table. Every node is
+    a dict of characters; the preferred kana of a complete rōmaji string
+    is stored under the empty string key.
+    '''
+    trie = {}
+    for ro, spellings in lt.items():
+        node = trie
+        for char in ro:
+            node = node.setdefault(char, {})
+        node[u''] = spellings[0]
+
+    return trie
+
+
+# Reverse lookup table and trie for all rōmaji syllables.
+reverse_lt = _reverse_lt()
+reverse_trie = _build_trie(reverse_lt)
+
+# Consonants that can be doubled to indicate a geminate marker, e.g. kk.
+gem_consonants = {
+    ro[0] for ro in reverse_lt if ro[0] not in plain_vowels and ro[0] != 'n'
+}
+
+# Translation tables for the long vowels. In hiragana they're written
+# with an extra vowel (ō becomes おう), in katakana with a long vowel marker.
+# Since ii is not a long vowel, ī is written with a long vowel marker in
+# hiragana as well.
+long_vowels = {
+    HIRAGANA: [u'aa', u'iー', u'uu', u'ee', u'ou'],
+    KATAKANA: [vowel + lvmarker for vowel in plain_vowels]
+}
+long_vowel_tables = {}
+for script, replacements in long_vowels.items():
+    table = {}
+    for style_vowels in (macron_vowels, circumflex_vowels):
+        for long_vowel, replacement in zip(style_vowels, replacements):
+            table[ord(long_vowel)] = replacement
+    long_vowel_tables[script] = table
+
+
+# The ways a long vowel can be written after a syllable ending in each vowel,
+# the most common one first. E.g. kō can be こう or こお, and kē can be けい.
+long_vowel_spellings = {
+    HIRAGANA: {
+        u'a': [u'あ'], u'i': [u'い'], u'u': [u'う'], u'e': [u'え', u'い'],
+        u'o': [u'う', u'お']
+    },
+    KATAKANA: {vowel: [lvmarker] for vowel in plain_vowels}
+}
+
+# Characters that are used to indicate a long vowel in rōmaji input.
+long_vowel_markers = {u'-', lvmarker}
+
+# Translation table that writes long vowels with a marker, e.g. ō becomes o-.
+long_vowel_marker_table = {}
+for style_vowels in (macron_vowels, circumflex_vowels):
+    for long_vowel, vowel in zip(style_vowels, plain_vowels):
+        long_vowel_marker_table[ord(long_vowel)] = vowel + u'-'
+
+
+def _longest_match(input, start):
+    '''
+    Returns the kana and end offset of the longest rōmaji syllable
+    at the start offset, or None if there is no match.
+    '''
+    node = reverse_trie
+    match = None
+    for n in range(start, len(input)):
+        node = node.get(input[n])
+        if node is None:
+            break
+        kana = node.get(u'')
+        if kana is not None:
+            match = (kana, n + 1)
+
+    return match
+
+
+def to_kana(input, script=HIRAGANA):
+    '''
+    Converts rōmaji to kana in the given script (HIRAGANA or KATAKANA).
+
+    Doubled consonants become a geminate marker (kk, tch), and 'n' or 'n\''
+    becomes ん. Long vowels (ō, ô) are written with an extra vowel in
+    hiragana (except ī, which becomes いー) and with a long vowel marker
+    in katakana. A hyphen after a vowel (ko-ri) becomes a long vowel
+    marker in either script. Characters that are not part of a rōmaji
+    syllable are passed through in lowercase.
+    '''
+    input = input.lower().translate(long_vowel_tables[script])
+    geminate = hiragana['geminate']
+    output = []
+    length = len(input)
+    after_vowel = False
+    n = 0
+
+    while n < length:
+        char = input[n]
+
+        # Skip the apostrophe that separates an 'n' from the next syllable.
+        if char in apostrophes and output and output[-1] == u'ん':
+            n += 1
+            continue
+
+        # A hyphen after a vowel is a long vowel marker, e.g. 'ko-ri'.
+        if char in long_vowel_markers and after_vowel:
+            output.append(lvmarker)
+            n += 1
+            continue
+        after_vowel = False
+
+        # A doubled consonant indicates a geminate marker,
+        # as does the 't' in 'tch'.
+        if n + 1 < length and char in gem_consonants and \
+           (input[n + 1] == char or input.startswith(u'tch', n)):
+            output.append(geminate)
+            n += 1
+            continue
+
+        match = _longest_match(input, n)
+        if match is None:
+            output.append(char)
+            n += 1
+            continue
+
+        output.append(match[0])
+        after_vowel = input[match[1] - 1] in plain_vowels
+        n = match[1]
+
+    output = u''.join(output)
+
+    if script == KATAKANA:
+        return to_katakana(output)
+
+    return output
+
+
+def _candidate_tokens(input):
+    '''
+    Splits rōmaji into tokens for kana_candidates(). Every token is a tuple
+    of the possible kana spellings, the vowel of the syllable (if it can
+    be extended) and whether it was followed by a long vowel in the input.
+    '''
+    input = input.lower().translate(long_vowel_marker_table)
+    geminate = hiragana['geminate']
+    tokens = []
+    length = len(input)
+    n = 0
+
+    while n < length:
+        char = input[n]
+
+        if char in apostrophes and tokens and tokens[-1][0] == [u'ん']:
+            n += 1
+            continue
+
+        if n + 1 < length and char in gem_consonants and \
+           (input[n + 1] == char or input.startswith(u'tch', n)):
+            tokens.append(([geminate], None, False))
+            n += 1
+            continue
+
+        match = _longest_match(input, n)
+        if match is None:
+            tokens.append(([char], None, False))
+            n += 1
+            continue
+
+        ro = input[n:match[1]]
+        vowel = ro[-1] if ro[-1] in plain_vowels else None
+        n = match[1]
+
+        # Check whether the syllable is followed by a long vowel, written
+        # either with a marker (ō, o-) or as a vowel combination (ou, oh).
+        long = False
+        while vowel is not None and n < length:
+            if input[n] in long_vowel_markers or \
+               (vowel, input[n]) in lv_combinations:
+                long = True
+                n += 1
+            elif vowel == u'o' and input[n] == u'h' and \
+                    (n + 1 == length or input[n + 1] not in plain_vowels):
+                long = True
+                n += 1
+            else:
+                break
+
+        tokens.append((reverse_lt[ro], vowel, long))
+
+    return tokens
+
+
+def _script_candidates(tokens, script):
+    '''
+    Yields all kana spellings for a list of tokens in a single script.
+    A vowel that isn't written as long in the input may still be long
+    in the kana, so both options are tried, the short one first.
+    '''
+    spellings = long_vowel_spellings[script]
+    options = []
+    for kana, vowel, long in tokens:
+        if script == KATAKANA:
+            kana = [to_katakana(item) for item in kana]
+        if vowel is None:
+            options.append(kana)
+            continue
+        extensions = spellings[vowel] if long else [u''] + spellings[vowel]
+        options.append([
+            item + extension for item in kana for extension in extensions
+        ])
+
+    for parts in product(*options):
+        yield u''.join(parts)
+
+
+def kana_candidates(input, script=None, limit=100):
+    '''
+    Lazily yields the kana spellings that could correspond to a rōmaji
+    string, e.g. 'kori' yields こり, こおり, こうり, コーリ, etc. The most
+    likely spellings are yielded first.
+
+    The script can be HIRAGANA or KATAKANA; if it's None, hiragana and
+    katakana spellings are alternated. At most 'limit' spellings are
+    yielded, unless it's None.
+    '''
+    tokens = _candidate_tokens(input)
+
+    if script is None:
+        generators = [
+            _script_candidates(tokens, HIRAGANA),
+            _script_candidates(tokens, KATAKANA)
+        ]
+    else:
+        generators = [_script_candidates(tokens, script)]
+
+    seen = set()
+    while generators:
+        for generator in list(generators):
+            try:
+                candidate = next(generator)
+            except StopIteration:
+                generators.remove(generator)
+                continue
+
+            if candidate in seen:
+                continue
+
+            seen.add(candidate)
+            yield candidate
+
+            if limit is not None and len(seen) >= limit:
+                return
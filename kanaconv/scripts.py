@@ -0,0 +1,165 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Tools for dealing with mixed script text.
+
+Japanese text usually contains a mix of kana, kanji, rōmaji and
+punctuation. Only the kana can be transliterated, so the other runs
+need to be routed elsewhere. segments() splits a string into runs
+of the same script in a single scan, and classify() returns a bitmask
+of the scripts that are present in a string.
+'''
+import re
+import sys
+from .charsets import (
+    katakana, hiragana, fw_romaji, punctuation, lvmarker, kanji_ranges,
+    kanji_marks, macron_vowels, circumflex_vowels
+)
+from .converter import KanaConv, kana_lt, di_b, geminates
+from .transform import rpts, drpts, dkt, hdkt
+from .utils import offsets
+from .constants import (
+    KANA, KANJI, ROMAJI, PUNCTUATION, OTHER, HIRAGANA, KATAKANA,
+    SCRIPT_HIRAGANA, SCRIPT_KATAKANA, SCRIPT_KANJI, SCRIPT_ROMAJI
+)
+
+# Set the correct code point function based on whether we're on Python 2 or 3.
+if sys.version_info < (3, 0):
+    chr = unichr
+
+
+def _char_class(chars):
+    '''
+    Returns the contents of a regex character class that matches
+    any of the given characters.
+    '''
+    return u''.join(re.escape(char) for char in sorted(set(chars)))
+
+
+def _range_class(ranges):
+    '''
+    Returns the contents of a regex character class that matches
+    any of the given (inclusive) code point ranges.
+    '''
+    return u''.join(
+        u'{}-{}'.format(chr(start), chr(end)) for start, end in ranges
+    )
+
+
+# All characters that are handled by the converter's kana processing,
+# including the ligatures, repeaters and (han)dakuten.
+kana_chars = _char_class(
+    list(kana_lt) + list(di_b) + list(geminates) + list(rpts) +
+    list(drpts) + list(dkt) + list(hdkt) + [lvmarker] +
+    list(katakana['replacements']) + list(katakana['ligatures']) +
+    list(hiragana['ligatures'])
+)
+
+# Kanji and the marks that behave like kanji.
+kanji_chars = _range_class(kanji_ranges) + _char_class(kanji_marks)
+
+# Regular and fullwidth rōmaji, including long vowels.
+romaji_chars = u'A-Za-z0-9' + _char_class(
+    fw_romaji['full'] + macron_vowels + circumflex_vowels +
+    macron_vowels.upper() + circumflex_vowels.upper()
+)
+
+# Japanese punctuation and brackets.
+punct_chars = _char_class(punctuation)
+
+# The script class for every named group in the segmenting regex.
+script_groups = {
+    'kana': KANA,
+    'kanji': KANJI,
+    'romaji': ROMAJI,
+    'punct': PUNCTUATION,
+    'other': OTHER
+}
+
+# Matches one run of characters of the same script.
+script_runs = re.compile(
+    u'(?P<kana>[{kana}]+)|(?P<kanji>[{kanji}]+)|(?P<romaji>[{romaji}]+)|'
+    u'(?P<punct>[{punct}]+)|(?P<other>[^{kana}{kanji}{romaji}{punct}]+)'
+    .format(
+        kana=kana_chars,
+        kanji=kanji_chars,
+        romaji=romaji_chars,
+        punct=punct_chars
+    )
+)
+
+# Characters that are unique to either hiragana or katakana. The long vowel
+# marker and the (han)dakuten are used in both, so they're not included.
+hiragana_chars = _range_class([offsets[HIRAGANA]['range']]) + _char_class(
+    list(hiragana['ligatures']) +
+    [hiragana['repeater'], hiragana['repeater_dakuten']]
+)
+katakana_chars = _range_class([offsets[KATAKANA]['range']]) + _char_class(
+    list(katakana['replacements']) + list(katakana['ligatures']) +
+    [katakana['repeater'], katakana['repeater_dakuten']]
+)
+
+# Regexes that search for the presence of each script, and the bit flag
+# that is set if they match.
+script_flags = [
+    (re.compile(u'[{}]'.format(hiragana_chars)).search, SCRIPT_HIRAGANA),
+    (re.compile(u'[{}]'.format(katakana_chars)).search, SCRIPT_KATAKANA),
+    (re.compile(u'[{}]'.format(kanji_chars)).search, SCRIPT_KANJI),
+    (re.compile(u'[{}]'.format(romaji_chars)).search, SCRIPT_ROMAJI)
+]
+
+# Shared converter for the module level functions.
+_conv = KanaConv()
+
+
+def segments(input, with_romaji=False, conv=None):
+    '''
+    Splits a string into runs of the same script, yielding a
+    (script, start, end) tuple for every run. The script is one of
+    KANA, KANJI, ROMAJI, PUNCTUATION or OTHER.
+
+    If with_romaji is set, a fourth item is added containing the rōmaji
+    of the kana runs (and None for the others). A converter can be passed
+    to use its settings for the conversion.
+    '''
+    if with_romaji and conv is None:
+        conv = _conv
+
+    for match in script_runs.finditer(input):
+        script = script_groups[match.lastgroup]
+        start, end = match.span()
+
+        if not with_romaji:
+            yield (script, start, end)
+            continue
+
+        if script == KANA:
+            yield (script, start, end, conv.to_romaji(match.group()))
+        else:
+            yield (script, start, end, None)
+
+
+def classify(input):
+    '''
+    Returns a bitmask of the scripts that are present in a string,
+    made up of the SCRIPT_HIRAGANA, SCRIPT_KATAKANA, SCRIPT_KANJI and
+    SCRIPT_ROMAJI flags. For example, 0 means there's no text in
+    any of these scripts, and SCRIPT_HIRAGANA means it's pure hiragana
+    (aside from punctuation and other characters).
+    '''
+    mask = 0
+    for search, flag in script_flags:
+        if search(input) is not None:
+            mask |= flag
+
+    return mask
+
+
+def classify_many(inputs):
+    '''
+    Yields the result of classify() for every string in an iterable.
+    '''
+    for input in inputs:
+        yield classify(input)
@@ -0,0 +1,147 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Corpus statistics for kana strings.
+
+The KanaStats class runs the same state machine as KanaConv, but instead
+of collecting the rōmaji output it only keeps a number of counters. This
+makes it possible to gather statistics over a large corpus without
+building (and re-parsing) the output strings: the rōmaji of every
+character is made by the converter's own rules, but only its length is
+kept. Slugs (SLUG_STYLE) are the exception, since their separators are
+only known once the whole output is put together.
+
+The following counters are kept for every string:
+
+   * morae: the number of morae, e.g. 3 for がっこ and 4 for とうきょう
+   * long_vowels: the number of long vowels, e.g. 2 for とうきょう
+   * geminates: the number of geminate consonants, e.g. 1 for がっこう
+   * n_apostrophes: the number of apostrophes after an 'n', e.g. 1 for かんい
+     (always 0 in systems and styles without apostrophes, e.g. PASSPORT)
+   * unknown: the number of characters the machine can't deal with
+   * length: the length of the rōmaji output
+'''
+from .converter import KanaConv
+from .constants import CV, SLUG_STYLE
+
+# The names of the counters kept for every string.
+STAT_KEYS = (
+    'morae', 'long_vowels', 'geminates', 'n_apostrophes', 'unknown', 'length'
+)
+
+# The counters at the start of every string; copied for each one.
+zero_counts = dict.fromkeys(STAT_KEYS, 0)
+
+
+class KanaStats(KanaConv):
+    '''
+    Variant of the converter that counts the properties of the output
+    rather than producing it. After initialization, use stats()
+    to retrieve the counters of a kana string.
+    '''
+    def __init__(self):
+        '''
+        Initializes the counters, in addition to the state machine.
+        '''
+        self.counts = zero_counts.copy()
+
+        super(KanaStats, self).__init__()
+
+    def _flush_char(self):
+        '''
+        Updates the counters for the current state of the machine, then
+        clears the character. The rōmaji of the character comes from the
+        same helper as in the regular _flush_char(), but only its length
+        is counted.
+        '''
+        if self.active_char is None:
+            if self.unknown_char is not None:
+                self._append_unknown_char()
+
+            return
+
+        gem = self.geminate_count
+        lvm = self.lvmarker_count
+        counts = self.counts
+        char_romaji = self._char_romaji()
+
+        counts['morae'] += 1 + gem + lvm
+
+        if lvm > 0:
+            counts['long_vowels'] += 1
+
+        # Geminate markers and apostrophes only affect consonant-vowel pairs.
+        # Some systems and styles don't use apostrophes (e.g. PASSPORT).
+        if self.active_char_type == CV:
+            if gem > 0:
+                counts['geminates'] += 1
+            if self.active_char_info[0] == 'n' and self.apostrophe_char and \
+               self._needs_apostrophe():
+                counts['n_apostrophes'] += 1
+
+        self._append_to_stack(char_romaji)
+        self._append_unknown_char()
+        self._clear_char()
+
+    def _append_to_stack(self, string):
+        '''
+        Counts the length of the output instead of storing it. Slugs are
+        stored anyway, since their length is only known once the whole
+        output has been processed.
+        '''
+        if self.vowel_style == SLUG_STYLE:
+            self.stack.append(string)
+        else:
+            self.counts['length'] += len(string)
+
+    def _handle_unknown_char(self, char):
+        '''
+        Counts the unknown character before dealing with it.
+        '''
+        self.counts['unknown'] += 1
+
+        super(KanaStats, self)._handle_unknown_char(char)
+
+    def stats(self, input):
+        '''
+        Returns a dict with the counters for a kana string.
+        '''
+        self.counts = zero_counts.copy()
+        self._process_input(input)
+        self._clear_char()
+
+        if self.stack:
+            self.counts['length'] = len(
+                self._postprocess_output(u''.join(self.stack))
+            )
+            self._empty_stack()
+
+        return self.counts
+
+    def stats_many(self, inputs):
+        '''
+        Yields the counters for every string in an iterable.
+        '''
+        for input in inputs:
+            yield self.stats(input)
+
+
+# Shared instance for the module level functions.
+_kana_stats = KanaStats()
+
+
+def stats(input):
+    '''
+    Returns a dict with the counters for a kana string.
+    See KanaStats for more information.
+    '''
+    return _kana_stats.stats(input)
+
+
+def stats_many(inputs):
+    '''
+    Yields the counters for every string in an iterable.
+    '''
+    return _kana_stats.stats_many(inputs)
@@ -35,6 +35,82 @@ tests_circumflex_uppercase = [
     (u'セーラー', u'SÊRÂ')
 ]
 
+# Tests the use of the ASCII-only long vowel styles.
+tests_doubled = [
+    (u'オールＡ', u'ooruA'),
+    (u'とうきょう', u'tookyoo'),
+    (u'おねえさん', u'oneesan'),
+    (u'パーティー', u'paatii'),
+    (u'シャー', u'shaa')
+]
+tests_oh = [
+    (u'オールＡ', u'ohruA'),
+    (u'とうきょう', u'tohkyoh'),
+    (u'おねえさん', u'onesan'),
+    (u'パーティー', u'pati')
+]
+tests_plain = [
+    (u'オールＡ', u'oruA'),
+    (u'とうきょう', u'tokyo'),
+    (u'おねえさん', u'onesan'),
+    (u'きんようび', u'kin\'yobi')
+]
+tests_slug = [
+    (u'オールＡ', u'orua'),
+    (u'とうきょう・タワー', u'tokyo-tawa'),
+    (u'きんようび', u'kinyobi'),
+    (u'「しんぶん」です。', u'shinbun-desu'),
+    (u'ぬれ|えん', u'nureen')
+]
+tests_kunrei = [
+    (u'しんばし', u'sinbasi'),
+    (u'ちゃのゆ', u'tyanoyu'),
+    (u'ふじさん', u'huzisan'),
+    (u'まっちゃ', u'mattya'),
+    (u'つづみ', u'tuzumi'),
+    (u'ぢゃ', u'zya'),
+    (u'をかし', u'okasi'),
+    (u'とうきょう', u'tôkyô'),
+    (u'きんよう', u'kin\'yô')
+]
+tests_nihon = [
+    (u'しんばし', u'sinbasi'),
+    (u'つづみ', u'tudumi'),
+    (u'はなぢ', u'hanadi'),
+    (u'ぢゃ', u'dya'),
+    (u'をかし', u'wokasi'),
+    (u'ゐど', u'wido'),
+    (u'ゑがお', u'wegao'),
+    (u'じゅう', u'zyû')
+]
+tests_passport = [
+    (u'しんばし', u'shimbashi'),
+    (u'さんぽ', u'sampo'),
+    (u'なんま', u'namma'),
+    (u'きんよう', u'kinyoh'),
+    (u'おおの', u'ohno'),
+    (u'とうきょう', u'tohkyoh'),
+    (u'じゅう', u'ju'),
+    (u'ゆうこ', u'yuko')
+]
+tests_wapuro = [
+    (u'オールＡ', u'ouruA'),
+    (u'とうきょう', u'toukyou'),
+    (u'おねえさん', u'oneesan'),
+    (u'パーティー', u'paatii'),
+    (u'せんせい', u'sensei'),
+    # The long o follows the kana: おお is 'oo', おう is 'ou'.
+    (u'おおきい', u'ookii'),
+    (u'とおる', u'tooru'),
+    (u'こおり', u'koori'),
+    (u'こうり', u'kouri'),
+    (u'きょお', u'kyoo'),
+    # Every long vowel follows its own kana.
+    (u'こうお', u'kouoo'),
+    (u'おおう', u'ooou'),
+    (u'ほうおう', u'houooou')
+]
+
 # Tests whether we're correctly running pre-processing transformations.
 # These take place before we run the regular transliteration algorithm.
 tests_preprocessing = [
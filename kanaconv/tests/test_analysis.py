@@ -0,0 +1,53 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import unittest
+from kanaconv.analysis import RomajiFilter
+from kanaconv.converter import KanaConv
+
+from .assets import tests_freq1000
+
+
+class TestAnalysis(unittest.TestCase):
+    '''
+    Test case for the search analyzer token filter.
+
+    Run this using ./setup.py test
+    '''
+    def test_filter(self):
+        tokens = [
+            (u'とうきょう', 0, 5, 0), (u'tower', 6, 11, 1),
+            (u'とうきょう', 12, 17, 2), (u'東京', 18, 20, 3)
+        ]
+        self.assertEqual(RomajiFilter().filter(tokens), [
+            (u'tōkyō', 0, 5, 0), (u'tower', 6, 11, 1),
+            (u'tōkyō', 12, 17, 2), (u'東京', 18, 20, 3)
+        ])
+        self.assertEqual(RomajiFilter(keep_kana=True)(tokens[:2]), [
+            (u'とうきょう', 0, 5, 0), (u'tōkyō', 0, 5, 0),
+            (u'tower', 6, 11, 1)
+        ])
+
+        # Additional token items are kept.
+        self.assertEqual(RomajiFilter()([(u'か', 0, 1, 0, u'noun')]), [
+            (u'ka', 0, 1, 0, u'noun')
+        ])
+        self.assertEqual(RomajiFilter()([]), [])
+
+    def test_filter_freq1000(self):
+        '''
+        The batch conversion must give the same result as converting
+        every token separately.
+        '''
+        conv = KanaConv()
+        tokens = [
+            (test[0], n, n + len(test[0]), n)
+            for n, test in enumerate(tests_freq1000)
+        ]
+        for token, ro_token in zip(tokens, RomajiFilter()(tokens)):
+            self.assertEqual(ro_token[0], conv.to_romaji(token[0]))
+            self.assertEqual(ro_token[1:], token[1:])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import os
+import shutil
+import tempfile
+import unittest
+from itertools import product
+from kanaconv.borders import BorderDictionary
+from kanaconv.converter import KanaConv
+
+from .assets import tests_word_border, tests_freq1000
+
+
+def _leftmost_longest(entries, input):
+    '''
+    Reference implementation of the word borders of a list of readings.
+    '''
+    readings = {entry.replace(u'|', u''): entry for entry in entries}
+    offsets = []
+    n = 0
+    while n < len(input):
+        matches = [
+            reading for reading in readings if input.startswith(reading, n)
+        ]
+        if not matches:
+            n += 1
+            continue
+        entry = readings[max(matches, key=len)]
+        parts = entry.split(u'|')
+        for part in parts[:-1]:
+            n += len(part)
+            offsets.append(n)
+        n += len(parts[-1])
+
+    return offsets
+
+
+class TestBorders(unittest.TestCase):
+    '''
+    Test case for the word border dictionary.
+
+    Run this using ./setup.py test
+    '''
+    def setUp(self):
+        self.dictionary = BorderDictionary([
+            u'こ|うま', u'ぬれ|えん', u'こうまん', u'ぐん|うま', u'しお|おし'
+        ])
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_boundaries(self):
+        dictionary = self.dictionary
+        self.assertEqual(dictionary.boundaries(u'こうま'), [1])
+        self.assertEqual(dictionary.boundaries(u'コウマ'), [1])
+        self.assertEqual(dictionary.boundaries(u'ぐんうまこうま'), [2, 5])
+        self.assertEqual(dictionary.boundaries(u''), [])
+
+        # Overlapping readings: the leftmost one wins, then the longest.
+        self.assertEqual(dictionary.boundaries(u'こうまん'), [])
+        self.assertEqual(dictionary.boundaries(u'しおおしお'), [2])
+        self.assertEqual(BorderDictionary().boundaries(u'こうま'), [])
+
+        # Readings that overlap in every possible way.
+        entries = [u'あい|う', u'い|うあ', u'う|あ', u'あ|いうあい', u'いう']
+        dictionary = BorderDictionary(entries)
+        for length in range(1, 7):
+            for chars in product(u'あいう', repeat=length):
+                input = u''.join(chars)
+                self.assertEqual(
+                    dictionary.boundaries(input),
+                    _leftmost_longest(entries, input)
+                )
+
+    def test_converter(self):
+        conv = KanaConv()
+        conv.set_border_dictionary(self.dictionary)
+        self.assertEqual(conv.to_romaji(u'こうま'), u'kouma')
+        self.assertEqual(conv.to_romaji(u'こうまん'), u'kōman')
+        self.assertEqual(conv.to_romaji(u'はっこうま'), u'hakkouma')
+        self.assertEqual(
+            conv.to_romaji(u'ぬれえん|とうきょう'), u'nureentōkyō'
+        )
+
+        # The borders are added to the boundaries given by the caller.
+        self.assertEqual(conv.to_romaji(u'こうまです', [3]), u'koumadesu')
+        self.assertEqual(conv.to_romaji(u'こうまん', [4]), u'kōman')
+
+        # Without any borders, the output is the same as without
+        # a dictionary.
+        plain = KanaConv()
+        conv.set_border_dictionary(BorderDictionary())
+        for test in tests_freq1000:
+            self.assertEqual(conv.to_romaji(test[0]), plain.to_romaji(test[0]))
+
+        # A dictionary made from the word border tests must give the same
+        # result as the inputs with their '|' characters.
+        tests = [test for test in tests_word_border if u'|' in test[0]]
+        conv.set_border_dictionary(BorderDictionary(
+            test[0] for test in tests
+        ))
+        for test in tests:
+            self.assertEqual(
+                conv.to_romaji(test[0].replace(u'|', u'')), test[1]
+            )
+
+    def test_save(self):
+        path = os.path.join(self.dir, 'borders.kcb')
+        self.dictionary.save(path)
+        dictionary = BorderDictionary.load(path)
+        for input in (u'こうま', u'ぐんうまこうま', u'こうまん', u'しおおしお'):
+            self.assertEqual(
+                dictionary.boundaries(input),
+                self.dictionary.boundaries(input)
+            )
+
+if __name__ == '__main__':
+    unittest.main()
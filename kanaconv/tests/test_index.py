@@ -0,0 +1,103 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import os
+import shutil
+import tempfile
+import unittest
+from kanaconv.converter import KanaConv
+from kanaconv.index import NgramIndex
+
+from .assets import tests_freq1000
+
+
+class TestIndex(unittest.TestCase):
+    '''
+    Test case for the rōmaji n-gram index.
+
+    Run this using ./setup.py test
+    '''
+    def setUp(self):
+        self.index = NgramIndex()
+        self.index.add_many(test[0] for test in tests_freq1000)
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_search(self):
+        self.assertEqual(len(self.index), len(tests_freq1000))
+        for query in (u'tokyo', u'toukyou', u'tōkyō', u'TOKYO'):
+            self.assertEqual(
+                self.index.search(query, 1), [(u'とう|きょう', 1.0)]
+            )
+
+        entries = [entry for entry, score in self.index.search(u'gakkou')]
+        self.assertIn(u'がっこう', entries)
+        self.assertIn(u'しょう|がっこう', entries)
+        self.assertEqual(len(self.index.search(u'kyo', 3)), 3)
+        self.assertEqual(self.index.search(u''), [])
+
+        # Queries that are shorter than n match as a prefix of an n-gram.
+        for entry, score in self.index.search(u'ky', 50):
+            self.assertIn(u'ky', KanaConv().to_romaji(entry))
+
+    def test_add(self):
+        entry_id = self.index.add(u'とうきょうと')
+        self.assertEqual(entry_id, len(tests_freq1000))
+        self.assertEqual(self.index.get(entry_id), u'とうきょうと')
+        self.assertEqual(self.index.search(u'tokyoto', 1)[0][0], u'とうきょうと')
+
+    def test_save_load(self):
+        path = os.path.join(self.dir, 'index.bin')
+        self.index.save(path)
+        loaded = NgramIndex.load(path)
+        try:
+            self.assertEqual(len(loaded), len(self.index))
+            for query in (u'tokyo', u'shinbun', u'ky', u'kaisha'):
+                self.assertEqual(
+                    loaded.search(query), self.index.search(query)
+                )
+
+            # Entries can still be added to a loaded index.
+            loaded.add(u'とうきょうと')
+            self.assertEqual(loaded.search(u'tokyoto', 1)[0][0], u'とうきょうと')
+
+            resaved = os.path.join(self.dir, 'resaved.bin')
+            loaded.save(resaved)
+        finally:
+            loaded.close()
+
+        loaded = NgramIndex.load(resaved)
+        try:
+            self.assertEqual(len(loaded), len(tests_freq1000) + 1)
+            self.assertEqual(loaded.search(u'tokyoto', 1)[0][0], u'とうきょうと')
+            self.assertEqual(loaded.search(u'ky', 50)[-1], (u'とうきょうと', 1.0))
+
+            # Saving over the loaded file would overwrite the mapped data.
+            self.assertRaises(ValueError, loaded.save, resaved)
+        finally:
+            loaded.close()
+
+    def test_load_invalid(self):
+        path = os.path.join(self.dir, 'invalid.bin')
+        with open(path, 'wb') as file:
+            file.write(b'\x00' * 64)
+        self.assertRaises(ValueError, NgramIndex.load, path)
+
+        with open(path, 'wb'):
+            pass
+        self.assertRaises(ValueError, NgramIndex.load, path)
+
+        # A truncated file is invalid as well.
+        self.index.save(path)
+        with open(path, 'rb') as file:
+            data = file.read()
+        for size in (10, len(data) // 2, len(data) - 1):
+            with open(path, 'wb') as file:
+                file.write(data[:size])
+            self.assertRaises(ValueError, NgramIndex.load, path)
+
+if __name__ == '__main__':
+    unittest.main()
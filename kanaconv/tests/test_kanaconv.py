@@ -2,15 +2,26 @@
 #
 # (C) 2015-2016, MIT License
 
+import io
+import json
+import os
+import shutil
 import sys
+import tempfile
 import unittest
-from kanaconv.converter import KanaConv
-from kanaconv.constants import MACRON_STYLE, CIRCUMFLEX_STYLE
+from kanaconv.converter import KanaConv, load_system
+from kanaconv.constants import (
+    MACRON_STYLE, CIRCUMFLEX_STYLE, DOUBLED_STYLE, WAPURO_STYLE, OH_STYLE,
+    PLAIN_STYLE, SLUG_STYLE, HEPBURN, KUNREI, NIHON, PASSPORT, UNKNOWN_RAISE
+)
+from kanaconv.exceptions import UnexpectedCharacterError
 
 from .assets import (
     tests_apostrophe, tests_preprocessing, tests_rare_exc, tests_word_border,
     tests_long_vowels, tests_xvowels, tests_xtsu_chi, tests_freq1000,
-    tests_circumflex, tests_circumflex_uppercase, tests_long_vowels_uppercase
+    tests_circumflex, tests_circumflex_uppercase, tests_long_vowels_uppercase,
+    tests_doubled, tests_wapuro, tests_oh, tests_plain, tests_slug,
+    tests_kunrei, tests_nihon, tests_passport
 )
 
 # Disables the subtest functionality if we're on Python 2.
@@ -34,10 +45,12 @@ class TestConverter(unittest.TestCase):
         '''
         self.conv = KanaConv()
 
-    def _run_tests(self, tests, vowel_style=MACRON_STYLE, uppercase=False):
+    def _run_tests(self, tests, vowel_style=MACRON_STYLE, uppercase=False,
+                   system=HEPBURN):
         '''
         Runs a series of assertEqual() tests.
         '''
+        self.conv.set_system(system)
         self.conv.set_vowel_style(vowel_style)
         self.conv.set_uppercase(uppercase)
 
@@ -86,5 +99,183 @@ class TestConverter(unittest.TestCase):
             uppercase=True
         )
 
+    def test_ascii_styles(self):
+        self._run_tests(tests_doubled, vowel_style=DOUBLED_STYLE)
+        self._run_tests(tests_wapuro, vowel_style=WAPURO_STYLE)
+        self._run_tests(tests_oh, vowel_style=OH_STYLE)
+        self._run_tests(tests_plain, vowel_style=PLAIN_STYLE)
+        self._run_tests(tests_slug, vowel_style=SLUG_STYLE)
+        self._run_tests(tests_slug, vowel_style=SLUG_STYLE, uppercase=True)
+
+    def test_boundaries(self):
+        '''
+        Word borders can be passed as offsets instead of '|' characters.
+        '''
+        conv = self.conv
+        self.assertEqual(conv.to_romaji(u'こうま', [1]), u'kouma')
+        self.assertEqual(conv.to_romaji(u'こうま', []), u'kōma')
+        self.assertEqual(conv.to_romaji(u'はっこう', [2]), u'hakkō')
+        self.assertEqual(conv.to_romaji(u'ぬれえん', [0, 2, 4, 10]), u'nureen')
+
+        # A literal '|' is not a border when offsets are passed.
+        self.assertEqual(conv.to_romaji(u'こ|うま', []), u'ko|uma')
+
+        # Every '|' in the border tests can be replaced by an offset.
+        for test in tests_word_border:
+            parts = test[0].split(u'|')
+            offsets = []
+            for part in parts[:-1]:
+                offsets.append((offsets[-1] if offsets else 0) + len(part))
+            self.assertEqual(
+                conv.to_romaji(u''.join(parts), offsets), test[1]
+            )
+
+    def test_systems(self):
+        self._run_tests(tests_kunrei, CIRCUMFLEX_STYLE, system=KUNREI)
+        self._run_tests(tests_nihon, CIRCUMFLEX_STYLE, system=NIHON)
+        self._run_tests(tests_passport, OH_STYLE, system=PASSPORT)
+
+        # Setting the system also sets its long vowel style.
+        self.conv.set_system(KUNREI)
+        self.assertEqual(self.conv.to_romaji(u'とうきょう'), u'tôkyô')
+        self.conv.set_system(HEPBURN)
+        self.assertEqual(self.conv.to_romaji(u'とうきょう'), u'tōkyō')
+
+    def test_load_system(self):
+        '''
+        Rule-set files extend one of the built-in systems.
+        '''
+        tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(tmp_dir, 'rules.json')
+        try:
+            with io.open(path, 'w', encoding='utf-8') as file:
+                file.write(u'{}'.format(json.dumps({
+                    'base': 'kunrei',
+                    'vowel_style': 'macron',
+                    'set_cvs': {u'フ': [u'fu', u'f', u'f', u'u', u'ū']}
+                })))
+            self.conv.set_system(load_system(path))
+            self.assertEqual(self.conv.to_romaji(u'ふじさん'), u'fuzisan')
+            self.assertEqual(self.conv.to_romaji(u'とうきょう'), u'tōkyō')
+
+            # The system's tables are compiled once for every style.
+            tables = self.conv.tables
+            self.assertEqual(
+                self.conv.to_romaji_variants(u'ふうふ', [WAPURO_STYLE]),
+                [u'fuufu']
+            )
+            self.conv.set_vowel_style(CIRCUMFLEX_STYLE)
+            self.conv.set_vowel_style(MACRON_STYLE)
+            self.assertIs(self.conv.tables, tables)
+
+            # Unknown systems, keys and kana are rejected. The sets are
+            # indexed by katakana.
+            for rules in (
+                {'base': 'unknown'},
+                {'vowel_styles': 'macron'},
+                {'set_cvs': {u'ふ': [u'fu', u'f', u'f', u'u', u'ū']}},
+                {'set_cvs': {u'ア': [u'a', u'', u'', u'a', u'ā']}},
+                {'set_digraphs_b': {u'ヵ': [u'ka', u'ā']}}
+            ):
+                with io.open(path, 'w', encoding='utf-8') as file:
+                    file.write(u'{}'.format(json.dumps(rules)))
+                self.assertRaises(ValueError, load_system, path)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_replacements(self):
+        conv = self.conv
+        conv.set_replacements({
+            u'㈱': u'(kabu)', u'①': u'1', u'〓': u'', u'〒': u'ゆうびん'
+        })
+        self.assertEqual(conv.to_romaji(u'㈱カナ①'), u'(kabu)kana1')
+        self.assertEqual(conv.to_romaji(u'〒〓'), u'yūbin')
+
+        # The built-in replacements are still performed, and can be
+        # overridden.
+        self.assertEqual(conv.to_romaji(u'ＡＢＣ'), u'ABC')
+        conv.set_replacements({u'Ａ': u'えい'})
+        self.assertEqual(conv.to_romaji(u'ＡＢＣ'), u'eiBC')
+        self.assertEqual(conv.to_romaji(u'㈱'), u'㈱')
+
+        conv.set_replacements({})
+        self.assertEqual(conv.to_romaji(u'ＡＢＣ'), u'ABC')
+        self.assertRaises(ValueError, conv.set_replacements, {u'㈱㈱': u''})
+
+    def test_many(self):
+        self.assertEqual(
+            list(self.conv.to_romaji_many(test[0] for test in tests_freq1000)),
+            [test[1] for test in tests_freq1000]
+        )
+
+    def test_variants(self):
+        self.assertEqual(self.conv.to_romaji_variants(u'とうきょう'), [
+            u'tōkyō', u'tôkyô', u'tookyoo', u'toukyou', u'tohkyoh', u'tokyo'
+        ])
+        self.assertEqual(
+            self.conv.to_romaji_variants(
+                u'おねえさん', [MACRON_STYLE, DOUBLED_STYLE, WAPURO_STYLE]
+            ),
+            [u'onēsan', u'oneesan']
+        )
+        self.assertEqual(self.conv.to_romaji_variants(u'かみ'), [u'kami'])
+
+        # The variants must be identical to the regular output.
+        for test in tests_freq1000:
+            variants = self.conv.to_romaji_variants(
+                test[0], [MACRON_STYLE, CIRCUMFLEX_STYLE]
+            )
+            self.conv.set_vowel_style(CIRCUMFLEX_STYLE)
+            circumflex = self.conv.to_romaji(test[0])
+            self.conv.set_vowel_style(MACRON_STYLE)
+            self.assertEqual(variants[0], test[1])
+            self.assertEqual(variants[-1], circumflex)
+
+        # A long o that's written with an お is 'oo' in wāpuro style.
+        self.assertEqual(self.conv.to_romaji_variants(u'おおきい'), [
+            u'ōkii', u'ôkii', u'ookii', u'ohkii', u'okii'
+        ])
+        for test in tests_wapuro:
+            variants = self.conv.to_romaji_variants(
+                test[0], [WAPURO_STYLE, MACRON_STYLE]
+            )
+            self.assertEqual(variants[0], test[1])
+        self.assertEqual(self.conv.vowel_style, MACRON_STYLE)
+
+        # Slug variants must be identical to the regular slug output.
+        self.assertEqual(
+            self.conv.to_romaji_variants(
+                u'きんようび', [MACRON_STYLE, SLUG_STYLE]
+            ),
+            [u'kin\'yōbi', u'kinyobi']
+        )
+        for test in tests_slug + tests_apostrophe:
+            variants = self.conv.to_romaji_variants(
+                test[0], [SLUG_STYLE, MACRON_STYLE]
+            )
+            self.conv.set_vowel_style(SLUG_STYLE)
+            slug = self.conv.to_romaji(test[0])
+            self.conv.set_vowel_style(MACRON_STYLE)
+            self.assertEqual(variants[0], slug)
+
+        # The converter's style and state are restored after an error.
+        conv = KanaConv()
+        conv.set_vowel_style(CIRCUMFLEX_STYLE)
+        conv.set_unknown_strategy(UNKNOWN_RAISE)
+        for input in (u'おおきいx', u'おおきいx\ue000'):
+            self.assertRaises(
+                UnexpectedCharacterError, conv.to_romaji_variants, input
+            )
+            self.assertEqual(conv.vowel_style, CIRCUMFLEX_STYLE)
+            self.assertEqual(
+                conv.to_romaji(u'おおさかとうきょう'), u'ôsakatôkyô'
+            )
+
+        # Private use characters in the input are kept as they are.
+        self.assertEqual(
+            self.conv.to_romaji_variants(u'とおる\ue000', [WAPURO_STYLE]),
+            [u'tooru\ue000']
+        )
+
 if __name__ == '__main__':
     unittest.main()
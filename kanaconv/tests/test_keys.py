@@ -0,0 +1,179 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import unittest
+from kanaconv.converter import KanaConv
+from kanaconv.constants import (
+    CIRCUMFLEX_STYLE, FOLD_V, FOLD_DZ, FOLD_WI, FOLD_LONG_VOWELS,
+    FOLD_GEMINATES
+)
+from kanaconv.keys import (
+    canonical_romaji, canonical_romaji_many, phonetic_key, phonetic_key_many,
+    sort_key, sort_key_many, same_romaji
+)
+from kanaconv.transform import to_katakana
+
+from .assets import tests_freq1000
+
+
+class TestKeys(unittest.TestCase):
+    '''
+    Test case for the search and deduplication keys.
+
+    Run this using ./setup.py test
+    '''
+    def test_canonical_romaji(self):
+        variants = [
+            u'toukyou', u'tokyo', u'tōkyō', u'tôkyô', u'tohkyoh', u'TŌKYŌ',
+            u'tookyoo'
+        ]
+        for variant in variants:
+            self.assertEqual(canonical_romaji(variant), u'tokyo')
+
+        self.assertEqual(canonical_romaji(u'shin\'yō'), u'shinyo')
+        self.assertEqual(canonical_romaji(u'ohashi'), u'ohashi')
+        self.assertEqual(canonical_romaji(u'onēsan'), u'onesan')
+        self.assertEqual(canonical_romaji(u'nī'), canonical_romaji(u'nii'))
+        self.assertEqual(list(canonical_romaji_many([u'ō', u'oo'])), [
+            u'o', u'o'
+        ])
+
+    def test_canonical_romaji_styles(self):
+        '''
+        Both long vowel styles of the converter must result in the same key.
+        '''
+        macron = KanaConv()
+        circumflex = KanaConv()
+        circumflex.set_vowel_style(CIRCUMFLEX_STYLE)
+
+        for test in tests_freq1000:
+            self.assertEqual(
+                canonical_romaji(macron.to_romaji(test[0])),
+                canonical_romaji(circumflex.to_romaji(test[0]))
+            )
+
+    def test_phonetic_key(self):
+        same = [
+            [u'ヴァイオリン', u'バイオリン', u'ばいおりん'],
+            [u'ゆうこ', u'ユーコ', u'ゆこ', u'ユウコ'],
+            [u'きって', u'きて', u'キッテ'],
+            [u'ぢゃ', u'じゃ'],
+            [u'ゐる', u'いる'],
+            [u'をんな', u'おんな'],
+            [u'シャーロット', u'しゃろと']
+        ]
+        for spellings in same:
+            keys = set(phonetic_key(spelling) for spelling in spellings)
+            self.assertEqual(len(keys), 1)
+
+        self.assertEqual(phonetic_key(u'ヴァイオリン'), u'baioriN')
+        self.assertEqual(phonetic_key(u'とうきょう'), u'tokyo')
+        self.assertEqual(phonetic_key(u'ティー'), u'ti')
+        self.assertNotEqual(phonetic_key(u'きんえん'), phonetic_key(u'きねん'))
+        self.assertNotEqual(phonetic_key(u'きゃ'), phonetic_key(u'きや'))
+        self.assertEqual(phonetic_key(u'東京タワー'), u'東京tawa')
+
+        # Only the long vowels of the kana are shortened.
+        self.assertEqual(phonetic_key(u'book'), u'book')
+        self.assertEqual(phonetic_key(u'ユーコ book'), u'yuko book')
+        self.assertEqual(list(phonetic_key_many([u'ゆうこ', u'ユーコ'])), [
+            u'yuko', u'yuko'
+        ])
+
+    def test_phonetic_key_folds(self):
+        '''
+        Without a folding rule, the kana it folds must result in a different
+        key, even if they're transliterated the same.
+        '''
+        different = [
+            (FOLD_V, u'ヴァイオリン', u'バイオリン'),
+            (FOLD_DZ, u'ぢゃ', u'じゃ'),
+            (FOLD_DZ, u'つづく', u'つずく'),
+            (FOLD_WI, u'ゐる', u'いる'),
+            (FOLD_WI, u'をんな', u'おんな'),
+            (FOLD_LONG_VOWELS, u'ゆうこ', u'ゆこ'),
+            (FOLD_GEMINATES, u'きって', u'きて')
+        ]
+        all_folds = FOLD_V | FOLD_DZ | FOLD_WI | FOLD_LONG_VOWELS | \
+            FOLD_GEMINATES
+        for flag, a, b in different:
+            self.assertEqual(phonetic_key(a), phonetic_key(b))
+            self.assertNotEqual(
+                phonetic_key(a, all_folds & ~flag),
+                phonetic_key(b, all_folds & ~flag)
+            )
+
+        self.assertEqual(phonetic_key(u'シャーロット', 0), u'sha-roQto')
+        self.assertEqual(phonetic_key(u'ぢゃ', 0), u'Dja')
+
+        # The kana that are kept apart must not get the key of another mora.
+        for a, b in ((u'ゐ', u'ウィ'), (u'ヲ', u'ウォ'), (u'ヱ', u'ウェ')):
+            self.assertNotEqual(phonetic_key(a, 0), phonetic_key(b, 0))
+
+    def test_phonetic_key_scripts(self):
+        '''
+        Hiragana and katakana must always result in the same key.
+        '''
+        for test in tests_freq1000:
+            self.assertEqual(
+                phonetic_key(test[0], 0),
+                phonetic_key(to_katakana(test[0]), 0)
+            )
+
+    def test_same_romaji(self):
+        '''
+        same_romaji() must agree with comparing the output of to_romaji().
+        '''
+        self.assertTrue(same_romaji(u'ヂ', u'ジ'))
+        self.assertTrue(same_romaji(u'おう', u'オー'))
+        self.assertTrue(same_romaji(u'', u''))
+        self.assertFalse(same_romaji(u'こうま', u'こ|うま'))
+        self.assertFalse(same_romaji(u'か', u''))
+        self.assertFalse(same_romaji(u'かな', u'かなかな'))
+
+        conv = KanaConv()
+        inputs = [test[0] for test in tests_freq1000]
+        outputs = [conv.to_romaji(input) for input in inputs]
+        for n in range(len(inputs) - 1):
+            a, b = inputs[n], inputs[n + 1]
+            self.assertEqual(
+                same_romaji(a, b), outputs[n] == outputs[n + 1]
+            )
+            self.assertTrue(same_romaji(a, to_katakana(a)))
+            self.assertEqual(
+                same_romaji(a + b, b + a),
+                conv.to_romaji(a + b) == conv.to_romaji(b + a)
+            )
+
+    def test_sort_key(self):
+        ordered = [
+            u'あ', u'いーす', u'ゔぁ', u'かあど', u'カード', u'かつと',
+            u'かっと', u'かと', u'かど', u'がど', u'きやく', u'きゃく',
+            u'はあと', u'はーと', u'はと', u'はん', u'ばん', u'ぱん',
+            u'わ', u'ヷ', u'をば', u'ん'
+        ]
+        for n in range(len(ordered) - 1):
+            self.assertLess(sort_key(ordered[n]), sort_key(ordered[n + 1]))
+        self.assertEqual(sorted(reversed(ordered), key=sort_key), ordered)
+
+        self.assertIsInstance(sort_key(u'かな'), bytes)
+        self.assertEqual(sort_key(u'かな'), sort_key(u'カナ'))
+        self.assertEqual(sort_key(u'が'), sort_key(u'か\u3099'))
+        self.assertLess(sort_key(u'abc'), sort_key(u'あ'))
+        self.assertLess(sort_key(u'ん'), sort_key(u'東京'))
+        self.assertEqual(list(sort_key_many([u'か', u'カ'])), [
+            sort_key(u'か'), sort_key(u'か')
+        ])
+
+    def test_sort_key_freq1000(self):
+        '''
+        Strings that only differ in their script must result in the same key.
+        '''
+        for test in tests_freq1000:
+            self.assertEqual(
+                sort_key(test[0]), sort_key(to_katakana(test[0]))
+            )
+
+if __name__ == '__main__':
+    unittest.main()
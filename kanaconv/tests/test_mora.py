@@ -0,0 +1,135 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import unittest
+from array import array
+from kanaconv.converter import KanaConv
+from kanaconv.constants import KATAKANA, CIRCUMFLEX_STYLE, SLUG_STYLE
+from kanaconv.mora import (
+    mora_distance, morae, encode_mora, decode_mora, render_romaji,
+    _mora_string
+)
+from kanaconv.transform import normalize, to_hiragana, to_katakana
+
+from . import assets
+from .assets import tests_freq1000
+
+
+def _levenshtein(a, b):
+    '''
+    Reference implementation of the Levenshtein distance.
+    '''
+    row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        previous = row[:]
+        row[0] = i
+        for j, char_b in enumerate(b, 1):
+            row[j] = min(
+                previous[j] + 1, row[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+    return row[-1]
+
+
+class TestMora(unittest.TestCase):
+    '''
+    Test case for the mora tools.
+
+    Run this using ./setup.py test
+    '''
+    def test_inventory(self):
+        self.assertEqual(len(morae), len(set(morae)))
+        for unit in (u'きゃ', u'てぃ', u'ゔぁ', u'うぃ', u'っ', u'ー', u'ん'):
+            self.assertIn(unit, morae)
+        for unit in (u'かぁ', u'あぁ', u'きぃ'):
+            self.assertNotIn(unit, morae)
+
+        self.assertEqual(len(_mora_string(u'きゃくティー')), 4)
+        self.assertEqual(_mora_string(u'ヷ'), _mora_string(u'ゔぁ'))
+        self.assertEqual(_mora_string(u'東京'), u'東京')
+
+    def test_mora_distance(self):
+        self.assertEqual(mora_distance(u'きゃく', u'きょく'), 1)
+        self.assertEqual(mora_distance(u'きゃく', u'キャク'), 0)
+        self.assertEqual(mora_distance(u'ティー', u'チー'), 1)
+        self.assertEqual(mora_distance(u'とうきょう', u'きょうと'), 3)
+        self.assertEqual(mora_distance(u'', u'かな'), 2)
+        self.assertEqual(mora_distance(u'あいうえお', u'かきくけこ', 2), 3)
+        self.assertEqual(mora_distance(u'あ', u'あいうえお', 2), 3)
+
+    def test_max_distance(self):
+        '''
+        The banded calculation must agree with the full calculation.
+        '''
+        words = [_mora_string(test[0]) for test in tests_freq1000[:60]]
+        for a in words:
+            for b in words:
+                distance = _levenshtein(a, b)
+                for max_distance in (0, 1, 3):
+                    self.assertEqual(
+                        mora_distance(a, b, max_distance),
+                        min(distance, max_distance + 1)
+                    )
+
+    def test_encode_mora(self):
+        codes = encode_mora(u'きゃくティー')
+        self.assertIsInstance(codes, array)
+        self.assertEqual(codes.typecode, 'H')
+        self.assertEqual(len(codes), 4)
+        self.assertEqual(encode_mora(u'キャク'), encode_mora(u'きゃく'))
+        self.assertEqual(encode_mora(u'東京'), array('H', [0x6771, 0x4eac]))
+        self.assertEqual(len(encode_mora(u'𠮷')), 2)
+
+        self.assertEqual(decode_mora(encode_mora(u'ティー')), u'てぃー')
+        self.assertEqual(
+            decode_mora(encode_mora(u'サヾエ'), KATAKANA), u'サザエ'
+        )
+        self.assertEqual(decode_mora(list(encode_mora(u'𠮷か'))), u'𠮷か')
+        self.assertEqual(
+            mora_distance(encode_mora(u'きゃく'), encode_mora(u'きょく')), 1
+        )
+
+    def test_render_romaji(self):
+        '''
+        Rendering the mora codes must give the same result as the converter.
+        '''
+        conv = KanaConv()
+        circumflex = KanaConv()
+        circumflex.set_vowel_style(CIRCUMFLEX_STYLE)
+        for name in dir(assets):
+            if not name.startswith('tests_'):
+                continue
+            for test in getattr(assets, name):
+                codes = encode_mora(test[0])
+                self.assertEqual(render_romaji(codes), conv.to_romaji(test[0]))
+                self.assertEqual(
+                    decode_mora(codes), to_hiragana(normalize(test[0]))
+                )
+
+        for test in tests_freq1000:
+            self.assertEqual(
+                render_romaji(encode_mora(test[0]), CIRCUMFLEX_STYLE),
+                circumflex.to_romaji(test[0])
+            )
+            self.assertEqual(
+                render_romaji(encode_mora(to_katakana(test[0]))), test[1]
+            )
+
+        # Small vowels after a vowel are converted like the converter does.
+        for kana in (u'ハロウィン', u'ドウェイン', u'ソウェト'):
+            self.assertEqual(
+                render_romaji(encode_mora(kana)), conv.to_romaji(kana)
+            )
+
+        # The converter's settings are used, and the style is restored.
+        circumflex.set_uppercase(True)
+        codes = encode_mora(u'きんようび')
+        self.assertEqual(render_romaji(codes, conv=circumflex), u'KIN\'YÔBI')
+        self.assertEqual(
+            render_romaji(codes, SLUG_STYLE, circumflex), u'kinyobi'
+        )
+        self.assertEqual(circumflex.vowel_style, CIRCUMFLEX_STYLE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import os
+import shutil
+import tempfile
+import unittest
+from kanaconv.converter import KanaConv
+from kanaconv.overrides import build_overrides, OverrideDict
+
+from .assets import tests_freq1000
+
+
+class TestOverrides(unittest.TestCase):
+    '''
+    Test case for the override dictionary.
+
+    Run this using ./setup.py test
+    '''
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'overrides.kco')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_lookup(self):
+        entries = [
+            (test[0], test[1].upper()) for test in tests_freq1000
+        ]
+        self.assertEqual(
+            build_overrides(entries, self.path), len(dict(entries))
+        )
+
+        overrides = OverrideDict(self.path)
+        try:
+            self.assertEqual(len(overrides), len(dict(entries)))
+            for key, value in dict(entries).items():
+                self.assertEqual(overrides.get(key), value)
+                self.assertEqual(overrides[key], value)
+            self.assertIsNone(overrides.get(u'ないもの'))
+            self.assertNotIn(u'ないもの', overrides)
+            self.assertRaises(KeyError, lambda: overrides[u'ないもの'])
+        finally:
+            overrides.close()
+
+        build_overrides([], self.path)
+        overrides = OverrideDict(self.path)
+        self.assertIsNone(overrides.get(u'かな'))
+        overrides.close()
+
+        with open(self.path, 'wb') as file:
+            file.write(b'\0' * 64)
+        self.assertRaises(ValueError, OverrideDict, self.path)
+
+        # Empty and truncated files aren't override dictionaries either.
+        build_overrides(entries, self.path)
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        for size in (0, 8, 64):
+            with open(self.path, 'wb') as file:
+                file.write(data[:size])
+            self.assertRaises(ValueError, OverrideDict, self.path)
+
+    def test_converter(self):
+        build_overrides([
+            (u'パーティー', u'party'), (u'とうきょう', u'Tokyo')
+        ], self.path)
+        overrides = OverrideDict(self.path)
+        conv = KanaConv()
+        conv.set_overrides(overrides)
+        try:
+            self.assertEqual(conv.to_romaji(u'パーティー'), u'party')
+            self.assertEqual(
+                conv.to_romaji(u'とうきょう|たわー'), u'Tokyotawā'
+            )
+            self.assertEqual(
+                conv.to_romaji(u'とうきょうたわー', [5]), u'Tokyotawā'
+            )
+            self.assertEqual(
+                conv.to_romaji(u'とうきょうたわー'), u'tōkyōtawā'
+            )
+            self.assertEqual(conv.to_romaji(u'ぬれ|えん'), u'nureen')
+            self.assertEqual(list(conv.to_romaji_many([
+                u'パーティー', u'かな'
+            ])), [u'party', u'kana'])
+        finally:
+            overrides.close()
+
+        # Plain dicts can be used as well.
+        conv.set_overrides({u'かな': u'kana!'})
+        self.assertEqual(conv.to_romaji(u'かな|かな'), u'kana!kana!')
+        conv.set_overrides(None)
+        self.assertEqual(conv.to_romaji(u'かな'), u'kana')
+
+if __name__ == '__main__':
+    unittest.main()
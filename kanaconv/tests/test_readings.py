@@ -0,0 +1,91 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from kanaconv.converter import KanaConv
+from kanaconv.readings import ReadingDictionary
+
+
+class TestReadings(unittest.TestCase):
+    '''
+    Test case for the kanji reading dictionary.
+
+    Run this using ./setup.py test
+    '''
+    def setUp(self):
+        self.dictionary = ReadingDictionary([
+            (u'東京', u'とうきょう'), (u'東京駅', u'とうきょうえき'),
+            (u'食', u'く'), (u'子馬', u'こ|うま'), (u'駅', u'えき')
+        ])
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_replace(self):
+        dictionary = self.dictionary
+        self.assertEqual(len(dictionary), 5)
+        self.assertEqual(dictionary.get(u'東京'), u'とうきょう')
+        self.assertEqual(dictionary.get(u'東'), None)
+
+        # The longest surface wins, and readings start and end a word.
+        self.assertEqual(
+            dictionary.replace(u'東京駅と東京'),
+            (u'とうきょうえきととうきょう', [0, 7, 8, 13])
+        )
+        self.assertEqual(dictionary.replace(u'あ子馬'), (u'あこうま', [1, 2, 4]))
+        self.assertEqual(dictionary.replace(u'ねこ'), (u'ねこ', []))
+        self.assertEqual(ReadingDictionary().replace(u'東京'), (u'東京', []))
+
+        # Given boundaries move along with the text, and surfaces don't
+        # match across them.
+        self.assertEqual(
+            dictionary.replace(u'ねこ東京です', [2, 4]),
+            (u'ねことうきょうです', [2, 7])
+        )
+        self.assertEqual(
+            dictionary.replace(u'東京駅です', [1, 3]),
+            (u'東京えきです', [1, 2, 4])
+        )
+        self.assertEqual(
+            dictionary.replace(u'東京駅', [2]),
+            (u'とうきょうえき', [0, 5, 7])
+        )
+
+    def test_converter(self):
+        conv = KanaConv()
+        conv.set_reading_dictionary(self.dictionary)
+        self.assertEqual(conv.to_romaji(u'東京駅'), u'tōkyōeki')
+        self.assertEqual(conv.to_romaji(u'食う'), u'kuu')
+        self.assertEqual(conv.to_romaji(u'子馬'), u'kouma')
+        self.assertEqual(conv.to_romaji(u'東京|駅'), u'tōkyōeki')
+        self.assertEqual(conv.to_romaji(u'ねこと東京'), u'nekototōkyō')
+
+        # Unknown kanji are handled like any other unknown character.
+        self.assertEqual(conv.to_romaji(u'猫と東京'), u'猫totōkyō')
+
+        conv.set_reading_dictionary(None)
+        self.assertEqual(conv.to_romaji(u'東京'), u'東京')
+
+    def test_save(self):
+        source = os.path.join(self.dir, 'readings.tsv')
+        with io.open(source, 'w', encoding='utf-8') as file:
+            file.write(u'# surface\treading\n東京\tとうきょう\n食\tく\n')
+        dictionary = ReadingDictionary.from_tsv(source)
+        self.assertEqual(dictionary.replace(u'食う'), (u'くう', [0, 1]))
+
+        path = os.path.join(self.dir, 'readings.kcr')
+        dictionary.save(path)
+        dictionary = ReadingDictionary.load(path)
+        self.assertEqual(len(dictionary), 2)
+        self.assertEqual(
+            dictionary.replace(u'東京で食う'), (u'とうきょうでくう', [0, 5, 6, 7])
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import unittest
+from kanaconv.converter import KanaConv
+from kanaconv.constants import HIRAGANA, KATAKANA
+from kanaconv.reverse import to_kana, kana_candidates
+
+from .assets import (
+    tests_freq1000, tests_rare_exc, tests_long_vowels, tests_xtsu_chi
+)
+
+
+class TestReverse(unittest.TestCase):
+    '''
+    Test case for the rōmaji to kana conversion.
+
+    Run this using ./setup.py test
+    '''
+    def test_to_kana(self):
+        self.assertEqual(to_kana(u'tōkyō'), u'とうきょう')
+        self.assertEqual(to_kana(u'Tôkyô', KATAKANA), u'トーキョー')
+        self.assertEqual(to_kana(u'pātī', KATAKANA), u'パーティー')
+        self.assertEqual(to_kana(u'matcha'), u'まっちゃ')
+        self.assertEqual(to_kana(u'gakkō'), u'がっこう')
+        self.assertEqual(to_kana(u'shin\'yō'), u'しんよう')
+        self.assertEqual(to_kana(u'kan\'i'), u'かんい')
+        self.assertEqual(to_kana(u'kani'), u'かに')
+        self.assertEqual(to_kana(u'gunma'), u'ぐんま')
+        self.assertEqual(to_kana(u'varentinusu', KATAKANA), u'ヴァレンティヌス')
+        self.assertEqual(to_kana(u'windō 7'), u'うぃんどう 7')
+        self.assertEqual(to_kana(u'ye'), u'いぇ')
+        self.assertEqual(to_kana(u'yesu', KATAKANA), u'イェス')
+        # イェ is preferred for 'ye', but the converter still turns it
+        # into 'ie'.
+        self.assertEqual(KanaConv().to_romaji(u'イェス'), u'iesu')
+
+        # A hyphen after a vowel is a long vowel marker.
+        self.assertEqual(to_kana(u'ko-ri'), u'こーり')
+        self.assertEqual(to_kana(u'ko-hi-', KATAKANA), u'コーヒー')
+        self.assertEqual(to_kana(u'n-'), u'ん-')
+        self.assertEqual(to_kana(u'7-11'), u'7-11')
+
+    def test_round_trip(self):
+        '''
+        Converting the kana back to rōmaji must result in the same rōmaji.
+        '''
+        conv = KanaConv()
+        tests = tests_freq1000 + tests_rare_exc + tests_long_vowels + \
+            tests_xtsu_chi
+
+        for test in tests:
+            if test[1] != test[1].lower():
+                continue
+            for script in (KATAKANA, None):
+                if script is None:
+                    kana = to_kana(test[1])
+                else:
+                    kana = to_kana(test[1], script)
+                self.assertEqual(conv.to_romaji(kana), test[1])
+
+    def test_kana_candidates(self):
+        candidates = list(kana_candidates(u'kori'))
+        for kana in (u'こり', u'こおり', u'こうり', u'コーリ'):
+            self.assertIn(kana, candidates)
+        self.assertEqual(candidates[:2], [u'こり', u'コリ'])
+
+        # A long vowel in the input must be long in every candidate.
+        candidates = list(kana_candidates(u'ko-ri', HIRAGANA))
+        self.assertEqual(candidates[0], u'こうり')
+        self.assertNotIn(u'こり', candidates)
+        self.assertEqual(list(kana_candidates(u'pātī', KATAKANA)), [
+            u'パーティー'
+        ])
+
+        # Kana with the same rōmaji are included.
+        self.assertIn(u'ぢ', list(kana_candidates(u'ji')))
+        self.assertEqual(len(list(kana_candidates(u'tōkyō', limit=3))), 3)
+
+    def test_kana_candidates_round_trip(self):
+        '''
+        Every candidate for a long vowel spelling must convert to
+        the same canonical rōmaji.
+        '''
+        conv = KanaConv()
+        for kana in kana_candidates(u'tōkyō', limit=None):
+            self.assertEqual(conv.to_romaji(kana), u'tōkyō')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import unittest
+from kanaconv.scripts import segments, classify, classify_many
+from kanaconv.constants import (
+    KANA, KANJI, ROMAJI, PUNCTUATION, OTHER, SCRIPT_HIRAGANA, SCRIPT_KATAKANA,
+    SCRIPT_KANA, SCRIPT_KANJI, SCRIPT_ROMAJI
+)
+
+
+class TestScripts(unittest.TestCase):
+    '''
+    Test case for the mixed script tools.
+
+    Run this using ./setup.py test
+    '''
+    def test_segments(self):
+        text = u'東京タワーはＴＶ塔です。OK!'
+        self.assertEqual(list(segments(text)), [
+            (KANJI, 0, 2),
+            (KANA, 2, 6),
+            (ROMAJI, 6, 8),
+            (KANJI, 8, 9),
+            (KANA, 9, 11),
+            (PUNCTUATION, 11, 12),
+            (ROMAJI, 12, 14),
+            (OTHER, 14, 15)
+        ])
+
+    def test_segments_romaji(self):
+        text = u'今日はとうきょう'
+        self.assertEqual(list(segments(text, with_romaji=True)), [
+            (KANJI, 0, 2, None),
+            (KANA, 2, 8, u'hatōkyō')
+        ])
+
+    def test_classify(self):
+        self.assertEqual(classify(u'ひらがな'), SCRIPT_HIRAGANA)
+        self.assertEqual(classify(u'カタカナー'), SCRIPT_KATAKANA)
+        self.assertEqual(classify(u'ゝー'), SCRIPT_HIRAGANA)
+        self.assertEqual(classify(u'カタかな'), SCRIPT_KANA)
+        self.assertEqual(classify(u'東京タワー'), SCRIPT_KATAKANA | SCRIPT_KANJI)
+        self.assertEqual(classify(u'ＴＶ、OK'), SCRIPT_ROMAJI)
+        self.assertEqual(classify(u'ー。'), 0)
+        self.assertEqual(list(classify_many([u'あ', u'漢字'])), [
+            SCRIPT_HIRAGANA, SCRIPT_KANJI
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
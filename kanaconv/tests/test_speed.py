@@ -7,10 +7,12 @@ import unittest
 import timeit
 from math import trunc
 from kanaconv.converter import KanaConv
+from kanaconv.stats import KanaStats
 from .assets import tests_freq1000
 
 LOOPS_FEEDBACK = '{loops} loops, best of {attempts}: {time:.5f} secs'
 CONV_FEEDBACK = '{conv} conversions, average of {avg:d} usec per conversion'
+STATS_FEEDBACK = 'stats(): {stats:.5f} secs, to_romaji(): {conv:.5f} secs'
 
 
 class TestSpeed(unittest.TestCase):
@@ -45,5 +47,30 @@ class TestSpeed(unittest.TestCase):
             avg=trunc((time_result / conversions) * 1000000)
         ))
 
+    def test_stats(self):
+        '''
+        Compares the speed of KanaStats.stats() to a regular conversion,
+        which it should beat, since it doesn't put the rōmaji together.
+        '''
+        conv = KanaConv()
+        kana_stats = KanaStats()
+        inputs = [test[0] for test in tests_freq1000]
+
+        def perform_conv():
+            for input in inputs:
+                conv.to_romaji(input)
+
+        def perform_stats():
+            for input in inputs:
+                kana_stats.stats(input)
+
+        attempts = 5
+        loops = 15
+        conv_result = min(timeit.Timer(perform_conv).repeat(attempts, loops))
+        stats_result = min(
+            timeit.Timer(perform_stats).repeat(attempts, loops)
+        )
+        print(STATS_FEEDBACK.format(stats=stats_result, conv=conv_result))
+
 if __name__ == '__main__':
     unittest.main()
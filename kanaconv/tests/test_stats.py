@@ -0,0 +1,85 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import unittest
+from kanaconv.converter import KanaConv, VOWEL_STYLES
+from kanaconv.constants import HEPBURN, KUNREI, PASSPORT, SLUG_STYLE
+from kanaconv.stats import KanaStats, stats, stats_many
+
+from .assets import (
+    tests_freq1000, tests_rare_exc, tests_xvowels, tests_long_vowels,
+    tests_apostrophe, tests_passport, tests_xtsu_chi
+)
+
+
+class TestStats(unittest.TestCase):
+    '''
+    Test case for the KanaStats class, which counts the properties
+    of the rōmaji output without producing it.
+
+    Run this using ./setup.py test
+    '''
+    def test_counters(self):
+        counts = stats(u'とうきょう')
+        self.assertEqual(counts['morae'], 4)
+        self.assertEqual(counts['long_vowels'], 2)
+        self.assertEqual(counts['geminates'], 0)
+        self.assertEqual(counts['length'], len(u'tōkyō'))
+
+        counts = stats(u'がっこう')
+        self.assertEqual(counts['morae'], 4)
+        self.assertEqual(counts['geminates'], 1)
+        self.assertEqual(counts['long_vowels'], 1)
+
+        counts = stats(u'しんよう')
+        self.assertEqual(counts['n_apostrophes'], 1)
+        self.assertEqual(counts['length'], len(u'shin\'yō'))
+
+        # Only the apostrophes that are in the output are counted.
+        kana_stats = KanaStats()
+        kana_stats.set_system(PASSPORT)
+        self.assertEqual(kana_stats.stats(u'しんよう')['n_apostrophes'], 0)
+
+        # Slugs are counted after their separators are merged.
+        kana_stats = KanaStats()
+        kana_stats.set_vowel_style(SLUG_STYLE)
+        counts = kana_stats.stats(u'「しんぶん」です。')
+        self.assertEqual(counts['length'], len(u'shinbun-desu'))
+        self.assertEqual(counts['n_apostrophes'], 0)
+
+        counts = stats(u'ウィンドウズＸＰ')
+        self.assertEqual(counts['unknown'], 2)
+
+    def test_length(self):
+        '''
+        The output length must match the length of the actual output,
+        in every system and long vowel style.
+        '''
+        tests = (
+            tests_freq1000 + tests_rare_exc + tests_xvowels +
+            tests_long_vowels + tests_apostrophe + tests_passport +
+            tests_xtsu_chi
+        )
+        for system in (HEPBURN, KUNREI, PASSPORT):
+            for vowel_style in VOWEL_STYLES:
+                conv = KanaConv()
+                conv.set_system(system)
+                conv.set_vowel_style(vowel_style)
+                kana_stats = KanaStats()
+                kana_stats.set_system(system)
+                kana_stats.set_vowel_style(vowel_style)
+                counts = kana_stats.stats_many(test[0] for test in tests)
+                for test, count in zip(tests, counts):
+                    self.assertEqual(
+                        count['length'], len(conv.to_romaji(test[0]))
+                    )
+
+    def test_stats_many(self):
+        counts = list(stats_many([u'かんい', u'ぐんま']))
+        self.assertEqual(len(counts), 2)
+        self.assertEqual(counts[0]['n_apostrophes'], 1)
+        self.assertEqual(counts[1]['n_apostrophes'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
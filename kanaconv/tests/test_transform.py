@@ -0,0 +1,69 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import unittest
+from kanaconv.converter import KanaConv
+from kanaconv.transform import (
+    to_katakana, to_katakana_many, to_hiragana, to_hiragana_many, normalize,
+    normalize_many
+)
+
+from .assets import tests_freq1000, tests_rare_exc
+
+
+class TestTransform(unittest.TestCase):
+    '''
+    Test case for the kana to kana transformations.
+
+    Run this using ./setup.py test
+    '''
+    def test_to_katakana(self):
+        self.assertEqual(to_katakana(u'とうきょう'), u'トウキョウ')
+        self.assertEqual(to_katakana(u'ゔぁゕゖ'), u'ヴァヵヶ')
+        self.assertEqual(to_katakana(u'さゝきゞゟ'), u'サヽキヾヨリ')
+        self.assertEqual(to_katakana(u'東京ーabc'), u'東京ーabc')
+        self.assertEqual(list(to_katakana_many([u'あ', u'い'])), [
+            u'ア', u'イ'
+        ])
+
+    def test_to_hiragana(self):
+        self.assertEqual(to_hiragana(u'パーティー'), u'ぱーてぃー')
+        self.assertEqual(to_hiragana(u'ヷヸヹヺヴ'), u'ゔぁゔぃゔぇゔぉゔ')
+        self.assertEqual(to_hiragana(u'サヽキヾヿ'), u'さゝきゞこと')
+        self.assertEqual(list(to_hiragana_many([u'ア', u'イ'])), [
+            u'あ', u'い'
+        ])
+
+    def test_same_romaji(self):
+        '''
+        Switching scripts must not affect the transliteration.
+        '''
+        conv = KanaConv()
+        for test in tests_freq1000 + tests_rare_exc:
+            self.assertEqual(conv.to_romaji(to_hiragana(test[0])), test[1])
+            self.assertEqual(conv.to_romaji(to_katakana(test[0])), test[1])
+
+    def test_normalize(self):
+        self.assertEqual(normalize(u'か\u3099か'), u'がか')
+        self.assertEqual(normalize(u'は゜は'), u'ぱは')
+        self.assertEqual(normalize(u'わ゛か'), u'わか')
+        self.assertEqual(normalize(u'サヾエ'), u'サザエ')
+        self.assertEqual(normalize(u'さゝき'), u'ささき')
+        self.assertEqual(normalize(u'まゞエ'), u'ままエ')
+        self.assertEqual(normalize(u'えきゟゝ'), u'えきよりより')
+        self.assertEqual(normalize(u'ヿー'), u'コトー')
+        self.assertEqual(normalize(u'ゝあ'), u'あ')
+        self.assertEqual(list(normalize_many([u'サヽ', u'ア'])), [
+            u'ササ', u'ア'
+        ])
+
+    def test_normalize_unchanged(self):
+        '''
+        Strings without any characters to normalize are returned as-is.
+        '''
+        text = u'とうきょう'
+        self.assertIs(normalize(text), text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import os
+import shutil
+import tempfile
+import unittest
+from kanaconv.converter import KanaConv
+from kanaconv.keys import canonical_romaji
+from kanaconv.trie import ArrayTrie, PrefixTrie
+
+from .assets import tests_freq1000
+
+
+class TestTrie(unittest.TestCase):
+    '''
+    Test case for the array-backed tries.
+
+    Run this using ./setup.py test
+    '''
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_array_trie(self):
+        trie = ArrayTrie([(u'abc', 1), (u'ab', 2), (u'b', 3), (u'とう', 4)])
+        self.assertEqual(trie.get(u'abc'), 1)
+        self.assertEqual(trie.get(u'ab'), 2)
+        self.assertEqual(trie.get(u'a'), None)
+        self.assertEqual(trie.get(u'abcd', -1), -1)
+        self.assertEqual(trie.get(u'とう'), 4)
+        self.assertEqual(trie.longest_match(u'abcd'), (3, 1))
+        self.assertEqual(trie.longest_match(u'xabd', 1), (3, 2))
+        self.assertEqual(trie.longest_match(u'xyz'), None)
+        self.assertEqual(trie.longest_match(u'abcd', 0, 2), (2, 2))
+        self.assertEqual(trie.longest_match(u'abcd', 0, 1), None)
+        self.assertEqual(trie.value(trie.find(u'ab')), 2)
+        self.assertEqual(trie.find(u'x'), -1)
+        self.assertEqual(trie.first_chars(), u'abと')
+        self.assertEqual(trie.first_char_search()(u'xyとb').start(), 2)
+        self.assertIsNone(ArrayTrie([]).first_char_search())
+
+        path = os.path.join(self.dir, 'trie.bin')
+        trie.save(path)
+        loaded = ArrayTrie.load(path)
+        self.assertEqual(list(loaded.labels), list(trie.labels))
+        self.assertEqual(loaded.get(u'abc'), 1)
+        self.assertEqual(loaded.longest_match(u'とうきょう'), (2, 4))
+
+    def test_complete(self):
+        entries = [test[0] for test in tests_freq1000]
+        trie = PrefixTrie(entries, k=5)
+        conv = KanaConv()
+
+        for prefix in (u'to', u'gakk', u'shin', u'ky'):
+            completions = trie.complete(prefix)
+            self.assertTrue(0 < len(completions) <= 5)
+            for entry in completions:
+                key = canonical_romaji(conv.to_romaji(entry))
+                self.assertTrue(key.startswith(canonical_romaji(prefix)))
+
+        # Long vowels can be written in any way.
+        self.assertEqual(trie.complete(u'gakkou'), trie.complete(u'gakkō'))
+        self.assertEqual(len(trie.complete(u'to', 2)), 2)
+        self.assertEqual(trie.complete(u'xyz'), [])
+
+    def test_weights(self):
+        trie = PrefixTrie(
+            [u'かき', u'かく', u'かけ', u'か'], weights=[1, 5, 3, 0]
+        )
+        self.assertEqual(trie.complete(u'ka'), [u'かく', u'かけ', u'かき', u'か'])
+
+        # Without weights, shorter entries come first.
+        trie = PrefixTrie([u'かき', u'かく', u'か'])
+        self.assertEqual(trie.complete(u'ka'), [u'か', u'かき', u'かく'])
+
+    def test_save_load(self):
+        entries = [test[0] for test in tests_freq1000]
+        trie = PrefixTrie(entries, k=3)
+        path = os.path.join(self.dir, 'prefix.bin')
+        trie.save(path)
+        loaded = PrefixTrie.load(path)
+        self.assertEqual(loaded.k, 3)
+        for prefix in (u'to', u'gakk', u'shin', u'a', u''):
+            self.assertEqual(loaded.complete(prefix), trie.complete(prefix))
+
+        with open(path, 'wb') as file:
+            file.write(b'\x00' * 64)
+        self.assertRaises(ValueError, PrefixTrie.load, path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+import unittest
+from kanaconv.converter import KanaConv
+from kanaconv.constants import UNKNOWN_RAISE
+from kanaconv.exceptions import UnexpectedCharacterError
+from kanaconv.validate import (
+    validate, validate_many, is_convertible, is_convertible_many
+)
+
+from .assets import tests_preprocessing, tests_freq1000
+
+
+class TestValidate(unittest.TestCase):
+    '''
+    Test case for the validation functions.
+
+    Run this using ./setup.py test
+    '''
+    def test_validate(self):
+        self.assertEqual(validate(u'とうきょう'), [])
+        self.assertEqual(validate(u'こ|うま'), [])
+        self.assertEqual(validate(u'サヾエゟ'), [])
+        self.assertEqual(validate(u'東京タワーＴＶ'), [
+            (0, u'東'), (1, u'京'), (5, u'Ｔ'), (6, u'Ｖ')
+        ])
+        self.assertEqual(list(validate_many([u'あ', u'あx'])), [
+            [], [(1, u'x')]
+        ])
+
+    def test_matches_converter(self):
+        '''
+        A string must be convertible if and only if the converter
+        does not raise with the UNKNOWN_RAISE strategy.
+        '''
+        conv = KanaConv()
+        conv.set_unknown_strategy(UNKNOWN_RAISE)
+        tests = [test[0] for test in tests_preprocessing + tests_freq1000]
+
+        for test, convertible in zip(tests, is_convertible_many(tests)):
+            try:
+                conv.to_romaji(test)
+                raised = False
+            except UnexpectedCharacterError:
+                conv = KanaConv()
+                conv.set_unknown_strategy(UNKNOWN_RAISE)
+                raised = True
+
+            self.assertEqual(convertible, not raised, test)
+            self.assertEqual(is_convertible(test), not raised, test)
+
+if __name__ == '__main__':
+    unittest.main()
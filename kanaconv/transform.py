@@ -0,0 +1,155 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Kana to kana transformations.
+
+These functions don't produce rōmaji; they're meant for folding kana
+strings into a canonical form, e.g. for indexing. Switching scripts is
+done with precomputed translation tables, so each transformation is
+a single translate() call.
+
+normalize() is also the first preprocessing step of the converter.
+'''
+import re
+from .charsets import katakana, hiragana
+from .constants import KATAKANA, HIRAGANA
+from .utils import switch_charset_table, merge_dicts
+
+
+# Repeater characters (with and without dakuten).
+rpts = {katakana['repeater'], hiragana['repeater']}
+drpts = {katakana['repeater_dakuten'], hiragana['repeater_dakuten']}
+
+# The lookup tables of characters that can have a (han)dakuten, and their sets.
+dkt_lt = merge_dicts(katakana['dakutenize'], hiragana['dakutenize'])
+dkt_cvs = set(dkt_lt)
+hdkt_lt = merge_dicts(katakana['handakutenize'], hiragana['handakutenize'])
+hdkt_cvs = set(hdkt_lt)
+
+# The singular dakuten characters.
+dkt = {hiragana['dakuten'], hiragana['spacing_dakuten']}
+hdkt = {hiragana['handakuten'], hiragana['spacing_handakuten']}
+
+# Ligatures and their expanded versions.
+ligatures = merge_dicts(katakana['ligatures'], hiragana['ligatures'])
+
+# Regex to check for characters that are changed by normalize().
+normalize_chars = re.compile(u'[{}]'.format(u''.join(
+    re.escape(char)
+    for char in sorted(rpts | drpts | dkt | hdkt | set(ligatures))
+)))
+
+
+def _translation(characters):
+    '''
+    Turns a dict of characters and their replacements
+    into a translation table.
+    '''
+    return {ord(char): characters[char] for char in characters}
+
+
+# Translation tables for switching between hiragana and katakana.
+# Aside from the regular kana, the repeaters are switched too, and the
+# ligatures are expanded since they have no counterpart in the other script.
+# The characters without a hiragana equivalent (ヷヸヹヺ) are replaced
+# with ゔ plus a small vowel, which is transliterated the same way.
+to_katakana_table = merge_dicts(
+    switch_charset_table(KATAKANA),
+    _translation({
+        hiragana['repeater']: katakana['repeater'],
+        hiragana['repeater_dakuten']: katakana['repeater_dakuten'],
+        u'ゟ': u'ヨリ'
+    })
+)
+to_hiragana_table = merge_dicts(
+    switch_charset_table(HIRAGANA),
+    _translation(katakana['hiragana_substitutes']),
+    _translation({
+        katakana['repeater']: hiragana['repeater'],
+        katakana['repeater_dakuten']: hiragana['repeater_dakuten'],
+        u'ヿ': u'こと'
+    })
+)
+
+
+def to_katakana(input):
+    '''
+    Converts all hiragana in a string to katakana.
+    '''
+    return input.translate(to_katakana_table)
+
+
+def to_katakana_many(inputs):
+    '''
+    Yields the result of to_katakana() for every string in an iterable.
+    '''
+    for input in inputs:
+        yield input.translate(to_katakana_table)
+
+
+def to_hiragana(input):
+    '''
+    Converts all katakana in a string to hiragana.
+    '''
+    return input.translate(to_hiragana_table)
+
+
+def to_hiragana_many(inputs):
+    '''
+    Yields the result of to_hiragana() for every string in an iterable.
+    '''
+    for input in inputs:
+        yield input.translate(to_hiragana_table)
+
+
+def normalize(input):
+    '''
+    Brings kana into its canonical form. The (han)dakuten modifier
+    characters are combined with the preceding character, e.g. か\u3099 and
+    か゛ become が, the repeaters are replaced by the character they repeat,
+    e.g. サヾエ becomes サザエ, and the ligatures ゟ and ヿ are expanded.
+
+    A (han)dakuten that can't be combined with the preceding character,
+    and a repeater that has nothing to repeat, are removed.
+    '''
+    if normalize_chars.search(input) is None:
+        # Nothing to normalize, so return the input as-is.
+        return input
+
+    output = []
+    for char in input:
+        if char in dkt:
+            if output and output[-1] in dkt_cvs:
+                output[-1] = dkt_lt[output[-1]]
+            continue
+
+        if char in hdkt:
+            if output and output[-1] in hdkt_cvs:
+                output[-1] = hdkt_lt[output[-1]]
+            continue
+
+        if char in rpts:
+            if output:
+                output.append(output[-1])
+            continue
+
+        if char in drpts:
+            # If the previous character can have a dakuten, add that;
+            # if not, just repeat whatever we had previously.
+            if output:
+                output.append(dkt_lt.get(output[-1], output[-1]))
+            continue
+
+        output.append(ligatures.get(char, char))
+
+    return u''.join(output)
+
+
+def normalize_many(inputs):
+    '''
+    Yields the result of normalize() for every string in an iterable.
+    '''
+    for input in inputs:
+        yield normalize(input)
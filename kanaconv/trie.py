@@ -0,0 +1,369 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Compact tries for looking up kana and rōmaji strings.
+
+ArrayTrie stores a character trie in three flat arrays instead of a dict
+per node. The nodes are numbered in breadth-first order, so the children
+of every node are contiguous and sorted by character; a child is found
+with a binary search over the edge labels. This keeps large tries small
+in memory, and makes it possible to save and load them as plain arrays.
+
+PrefixTrie builds on ArrayTrie to autocomplete rōmaji over a kana
+vocabulary: every node stores the best k entries below it, so a prefix
+lookup only has to walk the prefix.
+'''
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from .converter import KanaConv
+from .keys import canonical_romaji
+from .utils import UINT32, array_to_bytes, array_from_bytes, encode_strings
+
+# Set the correct code point function based on whether we're on Python 2 or 3.
+if sys.version_info < (3, 0):
+    chr = unichr
+
+# The value that marks a node without a value, or an empty top-k slot.
+NO_VALUE = 0xFFFFFFFF
+
+# The file header: magic, version and the number of sections that follow.
+# Every section is an array of unsigned 32-bit integers or a byte string,
+# preceded by its length.
+TRIE_HEADER = struct.Struct('<4sBxxxI')
+SECTION_LENGTH = struct.Struct('<I')
+TRIE_VERSION = 1
+
+
+def write_sections(file, magic, sections):
+    '''
+    Writes a file header followed by a number of sections (arrays of
+    unsigned 32-bit integers, or byte strings) to an open file.
+    '''
+    file.write(TRIE_HEADER.pack(magic, TRIE_VERSION, len(sections)))
+    for section in sections:
+        data = section if isinstance(section, bytes) else \
+            array_to_bytes(section)
+        file.write(SECTION_LENGTH.pack(len(data)))
+        file.write(data)
+
+
+def read_sections(data, magic):
+    '''
+    Returns the sections of a file made by write_sections(), as byte
+    strings. A ValueError is raised if the file has a different magic
+    or version.
+    '''
+    file_magic, version, count = TRIE_HEADER.unpack(data[:TRIE_HEADER.size])
+    if file_magic != magic or version != TRIE_VERSION:
+        raise ValueError('Unexpected file format: {!r}'.format(file_magic))
+
+    sections = []
+    position = TRIE_HEADER.size
+    for n in range(count):
+        length, = SECTION_LENGTH.unpack(
+            data[position:position + SECTION_LENGTH.size]
+        )
+        position += SECTION_LENGTH.size
+        sections.append(data[position:position + length])
+        position += length
+
+    return sections
+
+
+class ArrayTrie(object):
+    '''
+    Character trie stored in flat arrays. Every key has an integer value.
+
+    Node 0 is the root. For every node n, labels[n] is the code point of
+    the character that leads to it, values[n] is its value (or NO_VALUE),
+    and its children are the nodes from children[n] up to children[n + 1].
+    '''
+    def __init__(self, items=()):
+        '''
+        Builds the trie from an iterable of (key, value) tuples. The values
+        must be integers from 0 up to (but not including) NO_VALUE.
+        '''
+        self.labels = array(UINT32)
+        self.values = array(UINT32)
+        self.children = array(UINT32)
+        self._build(items)
+
+    def _build(self, items):
+        '''
+        Lays out the trie in breadth-first order.
+        '''
+        # Build a temporary trie out of [children, value] lists first.
+        root = [{}, NO_VALUE]
+        for key, value in items:
+            node = root
+            for char in key:
+                child = node[0].get(char)
+                if child is None:
+                    child = node[0][char] = [{}, NO_VALUE]
+                node = child
+            node[1] = value
+
+        queue = [(0, root)]
+        for label, node in queue:
+            self.labels.append(label)
+            self.values.append(node[1])
+            self.children.append(len(queue))
+            for char in sorted(node[0]):
+                queue.append((ord(char), node[0][char]))
+        self.children.append(len(queue))
+
+    def __len__(self):
+        '''
+        Returns the number of nodes in the trie.
+        '''
+        return len(self.labels)
+
+    def child(self, node, char):
+        '''
+        Returns the child of a node for a character, or -1 if there is none.
+        '''
+        start = self.children[node]
+        end = self.children[node + 1]
+        code = ord(char)
+        n = bisect_left(self.labels, code, start, end)
+        if n < end and self.labels[n] == code:
+            return n
+
+        return -1
+
+    def first_chars(self):
+        '''
+        Returns a string of the characters that the keys start with.
+        '''
+        return u''.join(
+            chr(self.labels[node])
+            for node in range(self.children[0], self.children[1])
+        )
+
+    def first_char_search(self):
+        '''
+        Returns the search() method of a regex that finds the characters
+        that the keys start with, so the rest of a string can be skipped
+        quickly. Returns None if the trie is empty.
+        '''
+        first_chars = self.first_chars()
+        if not first_chars:
+            return None
+
+        return re.compile(u'[{}]'.format(u''.join(
+            re.escape(char) for char in first_chars
+        ))).search
+
+    def find(self, key, node=0):
+        '''
+        Returns the node that a key leads to, or -1 if it's not in the trie.
+        '''
+        for char in key:
+            node = self.child(node, char)
+            if node == -1:
+                return -1
+
+        return node
+
+    def value(self, node):
+        '''
+        Returns the value of a node, or None if it has none.
+        '''
+        value = self.values[node]
+        return None if value == NO_VALUE else value
+
+    def get(self, key, default=None):
+        '''
+        Returns the value of a key, or the default if it's not in the trie.
+        '''
+        node = self.find(key)
+        if node == -1 or self.values[node] == NO_VALUE:
+            return default
+
+        return self.values[node]
+
+    def longest_match(self, text, start=0, end=None):
+        '''
+        Returns the end offset and value of the longest key that occurs in
+        a string at the start offset, or None if there is no such key.
+        If an end offset is given, the key must end before it.
+        '''
+        node = 0
+        match = None
+        for n in range(start, len(text) if end is None else end):
+            node = self.child(node, text[n])
+            if node == -1:
+                break
+            if self.values[node] != NO_VALUE:
+                match = (n + 1, self.values[node])
+
+        return match
+
+    def sections(self):
+        '''
+        Returns the arrays that make up the trie, for storing in a file.
+        '''
+        return [self.labels, self.values, self.children]
+
+    @classmethod
+    def from_sections(cls, sections):
+        '''
+        Returns a trie made from the sections returned by sections(),
+        without rebuilding it.
+        '''
+        trie = cls()
+        trie.labels, trie.values, trie.children = [
+            array_from_bytes(section) for section in sections
+        ]
+        return trie
+
+    def save(self, path):
+        '''
+        Saves the trie to a file, which can be loaded with load().
+        '''
+        with open(path, 'wb') as file:
+            write_sections(file, b'KCAT', self.sections())
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Loads a trie from a file made by save().
+        '''
+        with open(path, 'rb') as file:
+            return cls.from_sections(read_sections(file.read(), b'KCAT'))
+
+
+class PrefixTrie(object):
+    '''
+    Autocompletion of rōmaji over a kana vocabulary. The entries are
+    converted to rōmaji and reduced to search keys with canonical_romaji(),
+    so e.g. both 'tou' and 'tō' complete to とうきょう. After initialization,
+    use complete() to retrieve the best entries for a prefix.
+
+    The entries are ordered by their weight (highest first), then by the
+    length of their key, then by their order in the vocabulary. Every
+    node stores the best k entries below it.
+    '''
+    def __init__(self, entries=(), weights=None, k=10, conv=None):
+        '''
+        Builds the trie from a list of kana entries, and optionally a list
+        of weights for each entry. A converter can be passed to use its
+        settings for the conversion.
+        '''
+        self.k = k
+        self.entries = []
+        self.trie = ArrayTrie()
+        self.groups = array(UINT32, [0])
+        self.group_entries = array(UINT32)
+        self.top = array(UINT32, [NO_VALUE] * k)
+
+        entries = list(entries)
+        if entries:
+            self._build(entries, weights, conv if conv else KanaConv())
+
+    def _build(self, entries, weights, conv):
+        '''
+        Builds the trie and the top k entries of every node.
+        '''
+        keys = [canonical_romaji(ro) for ro in conv.to_romaji_many(entries)]
+        if weights is None:
+            weights = [0] * len(entries)
+
+        # Renumber the entries by their rank, so that the best entries
+        # are simply the ones with the lowest ids.
+        order = sorted(
+            range(len(entries)),
+            key=lambda n: (-weights[n], len(keys[n]), n)
+        )
+        self.entries = [entries[n] for n in order]
+
+        groups = {}
+        for rank, n in enumerate(order):
+            groups.setdefault(keys[n], []).append(rank)
+
+        group_keys = sorted(groups)
+        for group_key in group_keys:
+            self.group_entries.extend(groups[group_key])
+            self.groups.append(len(self.group_entries))
+
+        self.trie = ArrayTrie(
+            (group_key, n) for n, group_key in enumerate(group_keys)
+        )
+
+        # Collect the top k entries from the bottom up. In breadth-first
+        # order, children always come after their parents.
+        k = self.k
+        trie = self.trie
+        top = self.top = array(UINT32, [NO_VALUE] * (len(trie) * k))
+        for node in range(len(trie) - 1, -1, -1):
+            candidates = []
+            group = trie.values[node]
+            if group != NO_VALUE:
+                candidates.extend(self.group_entries[
+                    self.groups[group]:self.groups[group + 1]
+                ])
+            for child in range(trie.children[node], trie.children[node + 1]):
+                candidates.extend(
+                    entry_id for entry_id in top[child * k:child * k + k]
+                    if entry_id != NO_VALUE
+                )
+            best = sorted(candidates)[:k]
+            top[node * k:node * k + len(best)] = array(UINT32, best)
+
+    def complete(self, prefix, limit=None):
+        '''
+        Returns the best entries whose rōmaji starts with a prefix, at most
+        'limit' of them (and at most k).
+        '''
+        node = self.trie.find(canonical_romaji(prefix))
+        if node == -1:
+            return []
+
+        limit = self.k if limit is None else min(limit, self.k)
+        start = node * self.k
+        best = []
+        for entry_id in self.top[start:start + limit]:
+            if entry_id == NO_VALUE:
+                break
+            best.append(self.entries[entry_id])
+
+        return best
+
+    def save(self, path):
+        '''
+        Saves the trie to a file, which can be loaded with load().
+        '''
+        entry_offsets, entry_data = encode_strings(self.entries)
+        with open(path, 'wb') as file:
+            write_sections(file, b'KCPT', self.trie.sections() + [
+                array(UINT32, [self.k]), self.groups, self.group_entries,
+                self.top, entry_offsets, entry_data
+            ])
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Loads a trie from a file made by save(), without rebuilding it.
+        '''
+        with open(path, 'rb') as file:
+            sections = read_sections(file.read(), b'KCPT')
+
+        k = array_from_bytes(sections[3])[0]
+        prefix_trie = cls(k=k)
+        prefix_trie.trie = ArrayTrie.from_sections(sections[:3])
+        prefix_trie.groups, prefix_trie.group_entries, prefix_trie.top, \
+            entry_offsets = [
+                array_from_bytes(section) for section in sections[4:8]
+            ]
+        entry_data = sections[8]
+        prefix_trie.entries = [
+            entry_data[entry_offsets[n]:entry_offsets[n + 1]].decode('utf-8')
+            for n in range(len(entry_offsets) - 1)
+        ]
+
+        return prefix_trie
@@ -5,13 +5,18 @@
 '''
 Helper utilities to make processing easier.
 '''
+import io
 import sys
+from array import array
 from .constants import KATAKANA, HIRAGANA
 
 # Set the correct code point function based on whether we're on Python 2 or 3.
 if sys.version_info < (3, 0):
     chr = unichr
 
+# The array type code for unsigned 32-bit integers.
+UINT32 = 'I' if array('I').itemsize == 4 else 'L'
+
 # The start and end offsets of the hiragana and katakana Unicode blocks.
 # The ranges are inclusive and include only printable kana characters,
 # e.g. あ, ぃ, ヸ, etc.
@@ -95,6 +100,25 @@ def _switch_charset_list(characters, target=''):
     return characters
 
 
+def switch_charset_table(target=''):
+    '''
+    Returns a translation table for use with translate() that transforms
+    all printable kana to the target script. Characters that don't have
+    an equivalent in the target script (e.g. ヹ when converting to
+    hiragana) are not included.
+    '''
+    source = KATAKANA if target == HIRAGANA else HIRAGANA
+    offset = block_offset * offsets[target]['direction']
+    source_range = offsets[source]['range']
+
+    table = {}
+    for char_offset in range(source_range[0], source_range[1] + 1):
+        if in_range(char_offset + offset, target):
+            table[char_offset] = chr(char_offset + offset)
+
+    return table
+
+
 def merge_dicts(*dicts):
     '''
     Given any number of dicts, shallow copy and merge into a new dict,
@@ -144,3 +168,69 @@ def fw_romaji_lt(full, regular):
         lt[fw] = reg
 
     return lt
+
+
+def array_to_bytes(items):
+    '''
+    Returns the little-endian bytes of an array of unsigned 32-bit integers,
+    for storing in a file.
+    '''
+    if sys.byteorder == 'big':
+        items = array(UINT32, items)
+        items.byteswap()
+
+    if sys.version_info < (3, 0):
+        return items.tostring()
+
+    return items.tobytes()
+
+
+def encode_strings(strings):
+    '''
+    Returns an array of offsets and a byte string containing the UTF-8
+    encoded strings, for storing a list of strings in a file.
+    '''
+    data = [string.encode('utf-8') for string in strings]
+    offsets = array(UINT32, [0])
+    for item in data:
+        offsets.append(offsets[-1] + len(item))
+
+    return offsets, b''.join(data)
+
+
+def array_from_bytes(data):
+    '''
+    Returns an array of unsigned 32-bit integers from little-endian bytes,
+    e.g. a slice of a memory-mapped file.
+    '''
+    items = array(UINT32)
+    if sys.version_info < (3, 0):
+        items.fromstring(data)
+    else:
+        items.frombytes(data)
+
+    if sys.byteorder == 'big':
+        items.byteswap()
+
+    return items
+
+
+def read_tsv(path):
+    '''
+    Yields a tuple of two strings for every line of a tab-separated file,
+    e.g. a kana string and its rōmaji. Empty lines and lines starting
+    with '#' are skipped.
+    '''
+    with io.open(path, encoding='utf-8') as file:
+        for n, line in enumerate(file):
+            line = line.rstrip(u'\r\n')
+            if not line or line.startswith(u'#'):
+                continue
+            fields = line.split(u'\t')
+            if len(fields) != 2:
+                raise ValueError(
+                    '{}:{}: expected two tab-separated fields'.format(
+                        path, n + 1
+                    )
+                )
+            yield fields[0], fields[1]
@@ -0,0 +1,71 @@
+# coding=utf8
+#
+# (C) 2015-2016, MIT License
+
+'''
+Fast validation of kana input.
+
+A string is considered convertible if it can be transliterated without
+encountering any characters the machine can't deal with, i.e. if
+to_romaji() would not raise an exception with the UNKNOWN_RAISE strategy.
+The check uses a precomputed character class, so it runs in a single
+scan without going through the state machine.
+'''
+import re
+from .charsets import lvmarker
+from .converter import kana_lt, di_b, geminates, repl, WORD_BORDER
+from .transform import rpts, drpts, dkt, hdkt, ligatures
+
+# All characters that are processed by the state machine itself.
+machine_chars = set(kana_lt) | di_b | geminates | {lvmarker, WORD_BORDER}
+
+# Characters that are removed or replaced during preprocessing. Replacements
+# only count if they result in characters the machine can deal with,
+# e.g. the double hyphen ゠ and fullwidth rōmaji are not convertible.
+preprocessed_chars = rpts | drpts | dkt | hdkt | set(ligatures) | {
+    char for char, value in repl.items()
+    if all(repl_char in machine_chars for repl_char in value)
+}
+
+# Matches any character that can't be converted.
+unconvertible = re.compile(u'[^{}]'.format(u''.join(
+    re.escape(char) for char in sorted(machine_chars | preprocessed_chars)
+)))
+
+
+def validate(input):
+    '''
+    Returns a list of (offset, character) tuples for every character
+    in the input that can't be converted. The list is empty if the
+    input is fully convertible.
+    '''
+    return [
+        (match.start(), match.group())
+        for match in unconvertible.finditer(input)
+    ]
+
+
+def validate_many(inputs):
+    '''
+    Yields the result of validate() for every string in an iterable.
+    '''
+    finditer = unconvertible.finditer
+    for input in inputs:
+        yield [(match.start(), match.group()) for match in finditer(input)]
+
+
+def is_convertible(input):
+    '''
+    Returns whether the input can be converted without
+    encountering any unknown characters.
+    '''
+    return unconvertible.search(input) is None
+
+
+def is_convertible_many(inputs):
+    '''
+    Yields the result of is_convertible() for every string in an iterable.
+    '''
+    search = unconvertible.search
+    for input in inputs:
+        yield search(input) is None
@@ -19,8 +19,8 @@ setup(
     author='Michiel Sikma',
     author_email='michiel@sikma.org',
     license='MIT',
-    test_suite='kanaconv.tests.test_kanaconv',
-    packages=['kanaconv'],
+    test_suite='kanaconv.tests',
+    packages=['kanaconv', 'kanaconv.cli'],
     classifiers=[
         'Intended Audience :: Developers',
         'Intended Audience :: Education',
@@ -33,7 +33,9 @@ setup(
     ],
     entry_points={
         'console_scripts': [
-            'kanaconv=kanaconv.cli.kanaconv:main'
+            'kanaconv=kanaconv.cli.kanaconv:main',
+            'kanaconv-overrides=kanaconv.cli.overrides:main',
+            'kanaconv-readings=kanaconv.cli.readings:main'
         ]
     },
     zip_safe=True